@@ -0,0 +1,56 @@
+import asyncio
+import datetime
+from page_object.async_driver import AsyncWebDriver
+from page_object.async_pages import AsyncLoginPage, AsyncSelectSchedulePage, AsyncTimeTablePage
+from page_object.pages import SRT_LOGIN_PAGE_URL, SRT_SELECT_SCHEDULE_PAGE_URL, SRT_TICKETING_PAGE_URL, rebase_url
+from page_object.custom_types import (PriorityOptions, SeatOptions, PassengerOptions, Region)
+from page_object.tracing import RESERVE_SPAN, tracer
+
+
+class AsyncAutoReserver:
+    def __init__(self,
+                 driver: AsyncWebDriver,
+                 base_url: str | None = None,
+                 ):
+        self._login_page = AsyncLoginPage(driver, rebase_url(SRT_LOGIN_PAGE_URL, base_url))
+        self._select_schedule_page = AsyncSelectSchedulePage(driver, rebase_url(SRT_SELECT_SCHEDULE_PAGE_URL, base_url))
+        self._time_table_page = AsyncTimeTablePage(driver, rebase_url(SRT_TICKETING_PAGE_URL, base_url))
+        self._logged_in = False
+
+    async def run(self,
+                  _id_: str,
+                  pw: str,
+                  departure: Region,
+                  destination: Region,
+                  min_datetime: datetime.datetime,
+                  max_datetime: datetime.datetime,
+                  passenger_options: PassengerOptions,
+                  seat_options: SeatOptions,
+                  priority_options: PriorityOptions,
+                  best_datetime: datetime.datetime | None = None,
+                  stop_event: asyncio.Event | None = None,
+                  ) -> bool:
+        with tracer.span(RESERVE_SPAN, departure=departure, destination=destination) as span:
+            if not self._logged_in:
+                await self._login_page.login(_id_, pw)
+                self._logged_in = True
+
+            async def search() -> float:
+                await self._select_schedule_page.enter_region(departure, destination)
+                await self._select_schedule_page.select_date_time(min_datetime)
+                await self._select_schedule_page.select_passenger(passenger_options)
+                await self._select_schedule_page.select_seat_type(seat_options.seat_location,
+                                                                  seat_options.seat_attribute)
+                return await self._select_schedule_page.search()
+
+            await search()
+            self._time_table_page.research = search
+            try:
+                is_success = await self._time_table_page.run(
+                    class_priority_options=priority_options.class_priority_option,
+                    time_priority_options=priority_options.time_priority_option,
+                    stop_event=stop_event)
+            finally:
+                self._time_table_page.research = None
+            span.set(success=is_success)
+        return is_success
@@ -1,19 +1,50 @@
 from selenium.webdriver import Chrome
 import datetime
-from ..page_object import pages
-from ..page_object.pages import LoginPage, SelectSchedulePage, TimeTablePage, TicketingPage
-from ..page_object.custom_types import (PriorityOptions, SeatOptions, PassengerOptions, Region)
+import threading
+import uuid
+from contextlib import ExitStack, contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator
+from page_object import pages
+from page_object.pages import LoginPage, SelectSchedulePage, TimeTablePage, TicketingPage
+from page_object.custom_types import (PriorityOptions, SeatOptions, PassengerOptions, Region, RouteOption, Ticket)
+from page_object.observation_cache import ObservationCache, ObservationKey
+from page_object.polling import PollingPolicy, PollingScheduler
+from page_object.route_search import RoutePoller, unique_routes
+from page_object.scoring import CandidateScorer
+from page_object.search_plan import FanOutPoller, plan_searches
+from page_object.tracing import RESERVE_SPAN, instrument_driver, tracer
+
+if TYPE_CHECKING:
+    from app.driver_pool import DriverPool
+    from page_object.history import HistoryRecorder
+
+# 작업 저장소에 남기는 진행 단계
+LOGIN_STAGE = "login"
+SEARCH_STAGE = "search"
+POLLING_STAGE = "polling"
 
 
 class AutoReserver:
     def __init__(self,
                  driver: Chrome,
+                 base_url: str | None = None,
                  ):
+        self._driver = instrument_driver(driver)
+        self._login_page = LoginPage(driver, pages.rebase_url(pages.SRT_LOGIN_PAGE_URL, base_url))
+        self._select_schedule_page = SelectSchedulePage(driver,
+                                                        pages.rebase_url(pages.SRT_SELECT_SCHEDULE_PAGE_URL, base_url))
+        self._time_table_page = TimeTablePage(driver, pages.rebase_url(pages.SRT_TICKETING_PAGE_URL, base_url))
+        self._ticketing_page = TicketingPage(driver, pages.rebase_url(pages.SRT_TICKETING_PAGE_URL, base_url))
+        self._logged_in = False
 
-        self._login_page = LoginPage(driver, pages.SRT_LOGIN_PAGE_URL)
-        self._select_schedule_page = SelectSchedulePage(driver, pages.SRT_SELECT_SCHEDULE_PAGE_URL)
-        self._time_table_page = TimeTablePage(driver)
-        self._ticketing_page = TicketingPage(driver, pages.SRT_TICKETING_PAGE_URL)
+    @classmethod
+    @contextmanager
+    def from_pool(cls, pool: "DriverPool", timeout: float | None = None) -> Iterator["AutoReserver"]:
+        # 풀에서 빌린 드라이버는 이미 로그인되어 있으므로 로그인 단계를 건너뛴다
+        with pool.lease(timeout) as driver:
+            auto_reserver = cls(driver)
+            auto_reserver._logged_in = True
+            yield auto_reserver
 
     def run(self,
             _id_: str,
@@ -25,14 +56,74 @@ class AutoReserver:
             passenger_options: PassengerOptions,
             seat_options: SeatOptions,
             priority_options: PriorityOptions,
-            best_datetime: datetime.datetime | None = None
-            ):
-        self._login_page.login(_id_, pw)
-        self._select_schedule_page.enter_region(departure, destination)
-        self._select_schedule_page.select_date_time(min_datetime)
-        self._select_schedule_page.select_passenger(passenger_options)
-        self._select_schedule_page.select_seat_type(seat_options.seat_location, seat_options.seat_attribute)
-        self._select_schedule_page.search()
-        self._time_table_page.run(class_priority_options=priority_options.class_priority_option,
-                                  time_priority_options=priority_options.time_priority_option)
-        is_success = self._ticketing_page.validate()
+            best_datetime: datetime.datetime | None = None,
+            stop_event: threading.Event | None = None,
+            polling_scheduler: PollingScheduler | None = None,
+            polling_policy: PollingPolicy | None = None,
+            observation_cache: ObservationCache | None = None,
+            routes: list[RouteOption] | None = None,
+            checkpoint: Callable[[str], None] | None = None,
+            progress: Callable[[int | None, int | None], None] | None = None,
+            history: "HistoryRecorder | None" = None,
+            scorer: CandidateScorer | None = None,
+            ) -> bool:
+        # checkpoint(stage): 진행 단계를 알린다. 작업 저장소에 남겨 이어 돌릴 때 보여 준다
+        # progress(polls, available): 조회 횟수와 마지막 시간표의 예약 가능한 칸 수. 바뀌지 않은 값은 None
+        # scorer: 작업이 끝나도 예약 성공/실패 기록을 이어 쓰려면 넘긴다. 없으면 이번 작업에서만 쓴다
+        scorer = scorer or CandidateScorer.for_options(passenger_options, seat_options)
+        checkpoint = checkpoint or (lambda stage: None)
+        progress = progress or (lambda polls, available: None)
+        with tracer.span(RESERVE_SPAN, departure=departure, destination=destination) as span, ExitStack() as stack:
+            if not self._logged_in:
+                checkpoint(LOGIN_STAGE)
+                self._login_page.login(_id_, pw)
+                self._logged_in = True
+            checkpoint(SEARCH_STAGE)
+
+            def search() -> float:
+                self._select_schedule_page.enter_region(departure, destination)
+                self._select_schedule_page.select_date_time(min_datetime)
+                self._select_schedule_page.select_passenger(passenger_options)
+                self._select_schedule_page.select_seat_type(seat_options.seat_location, seat_options.seat_attribute)
+                return self._select_schedule_page.search()
+            search()
+            # 예약 확인 페이지에서 예약이 안 된 것을 확인하면 조회 폼을 다시 보내 시간표로 돌아온다
+            self._time_table_page.research = search
+            stack.callback(setattr, self._time_table_page, "research", None)
+            observation = None
+            if observation_cache is not None:
+                key = ObservationKey.of(departure, destination, min_datetime, passenger_options, seat_options)
+                observation = stack.enter_context(observation_cache.subscribe(key, owner=uuid.uuid4().hex))
+            http_poller = None
+            search_blocks = plan_searches(priority_options.time_priority_option)
+            if routes is not None and len(unique_routes(routes)) > 1:
+                # 대체 출발/도착역까지 노선마다 동시에 조회하고 한 점수로 줄 세운다
+                http_poller = RoutePoller.from_driver(self._driver, routes, search_blocks)
+                stack.callback(http_poller.close)
+            elif len(search_blocks) > 1:
+                # 창이 한 번의 조회(2시간 블록)를 넘으면 블록별로 나눠 동시에 조회한다
+                http_poller = FanOutPoller.from_driver(self._driver, search_blocks)
+                stack.callback(http_poller.close)
+            if http_poller is not None:
+                http_poller.attach_history(history)
+            checkpoint(POLLING_STAGE)
+
+            def on_tickets(tickets: Ticket):
+                progress(None, tickets.bookable_count())
+            self._time_table_page.on_tickets = on_tickets
+            stack.callback(setattr, self._time_table_page, "on_tickets", None)
+            self._time_table_page.history = history
+            stack.callback(setattr, self._time_table_page, "history", None)
+            if polling_scheduler is None:
+                polling_scheduler = PollingScheduler(polling_policy, priority_options.time_priority_option)
+            polling_scheduler.on_wait = lambda polls: progress(polls, None)
+            stack.callback(setattr, polling_scheduler, "on_wait", None)
+            is_success = self._time_table_page.run(class_priority_options=priority_options.class_priority_option,
+                                                   time_priority_options=priority_options.time_priority_option,
+                                                   http_poller=http_poller,
+                                                   stop_event=stop_event,
+                                                   polling_scheduler=polling_scheduler,
+                                                   observation=observation,
+                                                   scorer=scorer)
+            span.set(success=is_success)
+        return is_success
@@ -0,0 +1,217 @@
+import glob
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Iterator
+
+from selenium.webdriver import Chrome
+
+from app.jobs import LEAN_PROFILE, create_driver
+from page_object.pages import LoginPage
+
+MB = 1024 * 1024
+
+
+def process_tree_rss(root_pid: int) -> int | None:
+    # root_pid 와 그 아래 모든 프로세스(브라우저, 렌더러, GPU 등)의 RSS 합(byte). /proc 이 없으면 None
+    parents: dict[int, int] = {}
+    for stat_path in glob.glob("/proc/[0-9]*/stat"):
+        try:
+            with open(stat_path) as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])  # 프로세스 이름에 공백/괄호가 있을 수 있다
+        except (OSError, IndexError, ValueError):
+            continue  # 읽는 사이에 끝난 프로세스
+        parents[int(stat_path.split("/")[2])] = ppid
+    if root_pid not in parents:
+        return None
+    tree, frontier = {root_pid}, [root_pid]
+    while frontier:
+        parent = frontier.pop()
+        children = [pid for pid, ppid in parents.items() if ppid == parent and pid not in tree]
+        tree.update(children)
+        frontier.extend(children)
+    rss_pages = 0
+    for pid in tree:
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                rss_pages += int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return rss_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class PooledDriver:
+    def __init__(self, driver: Chrome):
+        self.driver = driver
+        self.uses = 0
+        self.baseline_rss = 0
+        self.last_used = 0.0  # 마지막으로 로그인했거나 돌려받은 시각. 세션은 쓰지 않는 동안 만료된다
+
+
+class DriverPool:
+    def __init__(self,
+                 account_id: str,
+                 password: str,
+                 size: int = 2,
+                 max_uses: int = 20,
+                 max_memory_growth_mb: int = 200,
+                 max_idle_sec: float = 600,
+                 health_check_interval_sec: float = 30,
+                 driver_factory: Callable[[], Chrome] = partial(create_driver, LEAN_PROFILE),
+                 ):
+        self._account_id = account_id
+        self._password = password
+        self._size = size
+        self._max_uses = max_uses
+        self._max_memory_growth = max_memory_growth_mb * MB
+        self._max_idle_sec = max_idle_sec
+        self._health_check_interval_sec = health_check_interval_sec
+        self._driver_factory = driver_factory
+        # 오른쪽이 가장 최근에 돌려받은 드라이버. 빌릴 때는 오른쪽에서, 점검은 한 대씩 꺼냈다가 바로 돌려놓는다
+        self._idle: deque[PooledDriver] = deque()
+        self._idle_changed = threading.Condition()
+        self._missing = 0  # 만들다 실패해서 모자란 드라이버 수. 점검 스레드가 다시 채운다
+        self._closed = threading.Event()
+        self._checker: threading.Thread | None = None
+
+    def start(self) -> "DriverPool":
+        for _ in range(self._size):
+            self._put(self._create())
+        self._checker = threading.Thread(target=self._check_idle_drivers, daemon=True)
+        self._checker.start()
+        return self
+
+    def close(self):
+        self._closed.set()
+        with self._idle_changed:
+            idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def _put(self, pooled: PooledDriver):
+        with self._idle_changed:
+            self._idle.append(pooled)
+            self._idle_changed.notify()
+
+    def _take(self, timeout: float | None) -> PooledDriver:
+        with self._idle_changed:
+            if not self._idle_changed.wait_for(lambda: self._idle, timeout):
+                raise queue.Empty
+            return self._idle.pop()
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[Chrome]:
+        pooled = self._take(timeout)
+        try:
+            if not self._is_healthy(pooled):
+                self._quit(pooled)
+                pooled = self._create()
+            elif time.monotonic() - pooled.last_used > self._max_idle_sec:
+                self._login(pooled)
+            yield pooled.driver
+        except BaseException:
+            # 실패한 세션은 상태를 알 수 없으므로 버린다. 새로 만들거나 다시 로그인하다 실패해도 한 대를 채워 둔다
+            self._quit(pooled)
+            self._replace()
+            raise
+        else:
+            pooled.uses += 1
+            pooled.last_used = time.monotonic()
+            self._give_back(pooled)
+
+    def _give_back(self, pooled: PooledDriver):
+        if self._closed.is_set():
+            self._quit(pooled)
+            return
+        if pooled.uses >= self._max_uses or self._memory_growth(pooled) > self._max_memory_growth:
+            self._quit(pooled)
+            self._replace()
+            return
+        self._put(pooled)
+
+    def _replace(self):
+        if self._closed.is_set():
+            return
+        try:
+            self._put(self._create())
+        except Exception as e:
+            print(f"드라이버 생성 실패: {e}")
+            with self._idle_changed:
+                self._missing += 1
+
+    def _create(self) -> PooledDriver:
+        pooled = PooledDriver(self._driver_factory())
+        try:
+            self._login(pooled)
+            pooled.baseline_rss = self._browser_rss(pooled) or 0
+        except BaseException:
+            self._quit(pooled)
+            raise
+        return pooled
+
+    def _login(self, pooled: PooledDriver):
+        LoginPage(pooled.driver).login(self._account_id, self._password)
+        pooled.last_used = time.monotonic()
+
+    @staticmethod
+    def _browser_rss(pooled: PooledDriver) -> int | None:
+        # JS 힙은 페이지를 옮길 때마다 새로 잡히므로 브라우저 프로세스들(chromedriver 아래)의 RSS 로 잰다
+        service = getattr(pooled.driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is None:
+            return None  # 원격 드라이버
+        return process_tree_rss(process.pid)
+
+    def _memory_growth(self, pooled: PooledDriver) -> int:
+        rss = self._browser_rss(pooled)
+        return 0 if rss is None else rss - pooled.baseline_rss  # 잴 수 없으면 max_uses 로만 교체한다
+
+    @staticmethod
+    def _is_healthy(pooled: PooledDriver) -> bool:
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def _check_idle_drivers(self):
+        while not self._closed.wait(self._health_check_interval_sec):
+            with self._idle_changed:
+                candidates = list(self._idle)
+                missing, self._missing = self._missing, 0
+            for _ in range(missing):
+                self._replace()
+            for pooled in candidates:
+                # 한 대만 꺼내 점검하고 바로 돌려놓아, 그동안에도 나머지는 빌려 갈 수 있게 한다
+                with self._idle_changed:
+                    if pooled not in self._idle:
+                        continue  # 그 사이에 빌려 갔다
+                    self._idle.remove(pooled)
+                try:
+                    if not self._is_healthy(pooled):
+                        self._quit(pooled)
+                        self._replace()
+                        continue
+                    if time.monotonic() - pooled.last_used > self._max_idle_sec:
+                        self._login(pooled)  # 세션 만료 전에 미리 다시 로그인
+                except Exception as e:
+                    print(f"대기 중인 드라이버 점검 실패: {e}")
+                    self._quit(pooled)
+                    self._replace()
+                    continue
+                if self._closed.is_set():
+                    self._quit(pooled)  # 점검하는 동안 풀이 닫혔다
+                    return
+                with self._idle_changed:
+                    self._idle.appendleft(pooled)
+                    self._idle_changed.notify()
@@ -0,0 +1,107 @@
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import asyncio
+
+DEFAULT_BUFFER_SIZE = 32
+
+
+@dataclass(frozen=True)
+class JobEvent:
+    kind: str
+    data: dict[str, Any]
+    text: str  # SSE 로 보낼 문자열. 구독자가 몇이든 한 번만 만든다
+
+    @classmethod
+    def of(cls, kind: str, data: dict[str, Any]) -> "JobEvent":
+        return cls(kind, data, f"event: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n")
+
+
+class Subscription:
+    def __init__(self, events: "JobEvents", job_id: str, loop: "asyncio.AbstractEventLoop", buffer_size: int):
+        self.job_id = job_id
+        self.loop = loop
+        self.dropped = 0
+        self._events = events
+        self._buffer: deque[JobEvent] = deque(maxlen=buffer_size)
+        import asyncio  # 워커 프로세스는 app.jobs 를 통해 이 모듈을 읽지만 asyncio 는 쓰지 않는다
+        self._ready = asyncio.Event()
+
+    def _put(self, event: JobEvent):  # 구독한 이벤트 루프에서만 불린다
+        # 버퍼가 차면 가장 오래된 이벤트가 밀려난다. 이벤트마다 작업 전체 상태가 있으므로 마지막 상태는 잃지 않는다
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(event)
+
+    async def get(self) -> JobEvent:
+        while not self._buffer:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._buffer.popleft()
+
+    def close(self):
+        self._events.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _deliver(event: JobEvent, subscriptions: tuple[Subscription, ...]):
+    for subscription in subscriptions:
+        subscription._put(event)
+        subscription._ready.set()
+
+
+class JobEvents:
+    # 작업 진행 상황을 구독자(SSE 연결)마다 크기가 정해진 버퍼로 나눠 준다.
+    # publish 는 스케줄러의 결과 수집 스레드에서(락을 잡은 채) 불리므로 이벤트 루프마다 콜백 하나만 넘기고,
+    # 구독자 버퍼에 나눠 넣는 일은 그 루프에서 한다
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, dict["asyncio.AbstractEventLoop", set[Subscription]]] = {}
+
+    def subscribe(self, job_id: str) -> Subscription:
+        # 이벤트 루프 안에서 부른다
+        import asyncio
+        subscription = Subscription(self, job_id, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._subscriptions.setdefault(job_id, {}).setdefault(subscription.loop, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            by_loop = self._subscriptions.get(subscription.job_id, {})
+            subscriptions = by_loop.get(subscription.loop)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del by_loop[subscription.loop]
+                if not by_loop:
+                    del self._subscriptions[subscription.job_id]
+
+    def subscriber_count(self, job_id: str | None = None) -> int:
+        with self._lock:
+            by_loops = [self._subscriptions.get(job_id, {})] if job_id is not None else self._subscriptions.values()
+            return sum(len(subscriptions) for by_loop in by_loops for subscriptions in by_loop.values())
+
+    def publish(self, job_id: str, kind: str, data: dict[str, Any]):
+        with self._lock:
+            by_loop = [(loop, tuple(subscriptions))
+                       for loop, subscriptions in self._subscriptions.get(job_id, {}).items()]
+        if not by_loop:
+            return
+        event = JobEvent.of(kind, data)
+        for loop, subscriptions in by_loop:
+            try:
+                loop.call_soon_threadsafe(_deliver, event, subscriptions)
+            except RuntimeError:
+                pass  # 루프가 이미 닫힘(서버 종료 중)
@@ -0,0 +1,165 @@
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from typing import Any
+
+from app.options import ReserverOptions
+
+JOB_STORE_ENV = "SRT_JOB_STORE"
+JOB_STORE_KEY_ENV = "SRT_JOB_STORE_KEY"  # 비밀번호를 암호화할 Fernet 키. 없으면 비밀번호를 저장하지 않는다
+DEFAULT_JOB_STORE = "jobs.sqlite3"
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    account_id TEXT,
+    password TEXT,
+    options TEXT,
+    status TEXT,
+    stage TEXT,
+    error TEXT,
+    worker INTEGER,
+    resumes INTEGER DEFAULT 0,
+    created_at TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    updated_at TEXT
+)
+"""
+COLUMNS = ("account_id", "password", "options", "status", "stage", "error", "worker", "resumes", "created_at",
+           "started_at", "finished_at")
+
+
+def job_store_path() -> str:
+    return os.environ.get(JOB_STORE_ENV, DEFAULT_JOB_STORE)
+
+
+def job_store_key() -> str | None:
+    return os.environ.get(JOB_STORE_KEY_ENV) or None
+
+
+class PasswordCipher:
+    def __init__(self, key: str):
+        from cryptography.fernet import Fernet  # 비밀번호를 저장할 때만 필요하다
+        self._fernet = Fernet(key)
+
+    def encrypt(self, password: str) -> str:
+        return self._fernet.encrypt(password.encode()).decode()
+
+    def decrypt(self, token: str) -> str | None:
+        from cryptography.fernet import InvalidToken
+        try:
+            return self._fernet.decrypt(token.encode()).decode()
+        except InvalidToken:
+            return None  # 키가 바뀌었다
+
+
+class JobStore:
+    # 작업 상태를 SQLite 에 남겨 서비스가 다시 떠도 끝나지 않은 작업을 이어서 돌린다.
+    # 조회 루프를 막지 않도록 save 는 메모리에 모아 두고, 쓰기 스레드가 flush_interval_sec 마다 한 트랜잭션으로 쓴다.
+    # 같은 작업의 변경은 마지막 값으로 합쳐진다.
+    # 비밀번호는 password_key 가 있을 때만 암호화해서 끝나지 않은 동안만 남기고, 없으면 저장하지 않는다
+    def __init__(self, path: str = DEFAULT_JOB_STORE, flush_interval_sec: float = 0.5, password_key: str | None = None):
+        self.path = path
+        self.flush_interval_sec = flush_interval_sec
+        self._cipher = PasswordCipher(password_key) if password_key is not None else None
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.flushes = 0
+        with closing(self._connect()) as conn:
+            conn.execute(SCHEMA)
+        os.chmod(path, 0o600)  # 계정 아이디와 (암호화한) 비밀번호가 들어 있다
+        self._writer = threading.Thread(target=self._write_loop, name="job-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _encode(self, name: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if name == "options":
+            return json.dumps(value.to_dict(), ensure_ascii=False)
+        if name == "password":
+            return self._cipher.encrypt(value) if value and self._cipher is not None else None
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        return value
+
+    def save(self, job_id: str, **fields: Any):
+        with self._lock:
+            self._pending.setdefault(job_id, {}).update(fields)
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            while not self._closed:
+                self._wake.wait(self.flush_interval_sec)
+                self._wake.clear()
+                self._flush(conn)
+            self._flush(conn)
+        finally:
+            conn.close()
+
+    def _flush(self, conn: sqlite3.Connection):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        now = datetime.datetime.now().isoformat()
+        by_columns: dict[tuple[str, ...], list[tuple]] = {}
+        for job_id, fields in pending.items():
+            columns = tuple(name for name in COLUMNS if name in fields)
+            by_columns.setdefault(columns, []).append(
+                (job_id, *(self._encode(name, fields[name]) for name in columns), now))
+        try:
+            with conn:
+                for columns, rows in by_columns.items():
+                    names = ", ".join(("id", *columns, "updated_at"))
+                    updates = ", ".join(f"{name} = excluded.{name}" for name in (*columns, "updated_at"))
+                    conn.executemany(f"INSERT INTO jobs ({names}) VALUES ({', '.join('?' * (len(columns) + 2))}) "
+                                     f"ON CONFLICT(id) DO UPDATE SET {updates}", rows)
+        except sqlite3.Error:
+            # 다음 flush 에서 다시 쓴다. 그 사이에 들어온 변경이 더 새로우므로 그것을 남긴다
+            logger.exception("failed to write %d jobs to %s, retrying", len(pending), self.path)
+            with self._lock:
+                for job_id, fields in pending.items():
+                    self._pending[job_id] = {**fields, **self._pending.get(job_id, {})}
+            return
+        self.flushes += 1
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+
+    def unfinished(self, statuses: tuple[str, ...]) -> list[dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"SELECT * FROM jobs WHERE status IN ({', '.join('?' * len(statuses))}) "
+                                "ORDER BY created_at", statuses).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            try:
+                job["options"] = ReserverOptions.from_dict(json.loads(job["options"]))
+            except (TypeError, ValueError, KeyError):
+                logger.exception("skipping stored job %s with unreadable options", job["id"])
+                continue
+            if job["password"] is not None:
+                job["password"] = self._cipher.decrypt(job["password"]) if self._cipher is not None else None
+            for name in ("created_at", "started_at", "finished_at"):
+                job[name] = datetime.datetime.fromisoformat(job[name]) if job[name] else None
+            jobs.append(job)
+        return jobs
@@ -0,0 +1,467 @@
+import datetime
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.job_events import JobEvents
+from app.job_store import JobStore
+from app.options import ReserverOptions
+from page_object.observation_cache import ObservationCache
+
+BROWSER_MEMORY_MB = 400
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+CHECKPOINT = "checkpoint"  # 워커가 보내는 진행 단계. 작업 상태는 바꾸지 않는다
+PROGRESS = "progress"  # 워커가 보내는 조회 횟수/예약 가능한 칸 수
+PROGRESS_INTERVAL_SEC = 1.0
+MAINTENANCE_INTERVAL_SEC = 1.0  # 죽은 워커/만료된 시간표 정리 주기
+MAX_RESUMES = 3  # 워커가 죽거나 서비스가 다시 떴을 때 작업을 다시 돌리는 횟수
+
+
+@dataclass
+class ReservationJob:
+    id: str
+    account_id: str
+    password: str
+    options: ReserverOptions
+    status: str = QUEUED
+    error: str | None = None
+    worker: int | None = None
+    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+    started_at: datetime.datetime | None = None
+    finished_at: datetime.datetime | None = None
+    stage: str | None = None
+    resumes: int = 0
+    polls: int = 0
+    available: int | None = None
+    cancel_requested: bool = False  # 사용자가 취소했는지(서비스 종료로 멈춘 것과 구분)
+
+    @property
+    def route_key(self) -> tuple:
+        region = self.options.region_options
+        return (region.departure, region.destination,
+                self.options.priority_options.time_priority_option.min_datetime.date())
+
+    def to_dict(self) -> dict[str, Any]:
+        departure, destination, date = self.route_key
+        return {
+            "id": self.id,
+            "status": self.status,
+            "route": f"{departure}-{destination} {date}",
+            "error": self.error,
+            "worker": self.worker,
+            "stage": self.stage,
+            "resumes": self.resumes,
+            "polls": self.polls,
+            "available": self.available,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+def _available_memory_mb() -> int | None:
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def default_worker_count(browser_memory_mb: int = BROWSER_MEMORY_MB, memory_budget_mb: int | None = None) -> int:
+    cores = os.cpu_count() or 1
+    if memory_budget_mb is None:
+        memory_budget_mb = _available_memory_mb()
+    if memory_budget_mb is None:
+        return cores
+    return max(1, min(cores, memory_budget_mb // browser_memory_mb))
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    headless: bool = True
+    block_images: bool = False
+    blocked_urls: tuple[str, ...] = ()  # CDP Network.setBlockedURLs 패턴(* 와일드카드)
+    low_memory: bool = False
+
+
+# 조회 세션은 시간표 HTML 만 있으면 되므로 이미지, 웹폰트, 분석/광고 스크립트는 받지 않는다.
+# CSS/JS 는 NetFunnel 팝업과 예약 링크가 동작하는 데 필요하므로 받되 HTTP 캐시에서 다시 쓴다
+LEAN_BLOCKED_URLS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm",
+    "*googletagmanager.com*", "*google-analytics.com*", "*gtag/js*", "*doubleclick.net*",
+    "*facebook.net*", "*wcs.naver.net*", "*kakao.com/v1/analytics*",
+)
+LOW_MEMORY_ARGS = (
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--renderer-process-limit=1",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+    "--js-flags=--max-old-space-size=256",
+)
+DEFAULT_PROFILE = BrowserProfile()
+LEAN_PROFILE = BrowserProfile(block_images=True, blocked_urls=LEAN_BLOCKED_URLS, low_memory=True)
+
+
+def create_driver(profile: BrowserProfile = DEFAULT_PROFILE):
+    from selenium.webdriver import Chrome
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    if profile.headless:
+        options.add_argument("--headless=new")
+    if profile.block_images:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if profile.low_memory:
+        for arg in LOW_MEMORY_ARGS:
+            options.add_argument(arg)
+    driver = Chrome(options=options)
+    if profile.blocked_urls:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(profile.blocked_urls)})
+    return driver
+
+
+class _ProgressThrottle:
+    # 조회 횟수는 PROGRESS_INTERVAL_SEC 마다 모아 보내고, 예약 가능한 칸 수가 바뀌면 바로 보낸다
+    def __init__(self, job_id: str, result_queue):
+        self._job_id = job_id
+        self._result_queue = result_queue
+        self._polls = 0
+        self._available: int | None = None
+        self._sent_at = 0.0
+
+    def __call__(self, polls: int | None, available: int | None):
+        changed = available is not None and available != self._available
+        self._polls = polls if polls is not None else self._polls
+        self._available = available if available is not None else self._available
+        now = time.monotonic()
+        if changed or now - self._sent_at >= PROGRESS_INTERVAL_SEC:
+            self._sent_at = now
+            self._result_queue.put((self._job_id, PROGRESS, (self._polls, self._available)))
+
+
+def _worker_main(worker_idx: int, task_queue, result_queue, cancel_event,
+                 observation_cache: ObservationCache | None = None, browser_profile: BrowserProfile = LEAN_PROFILE):
+    from app.auto_reserver import AutoReserver
+    from page_object.history import HistoryRecorder, history_path
+    from page_object.scoring import CandidateScorer
+
+    driver = None
+    scorers: dict[tuple[int, bool], CandidateScorer] = {}  # 작업이 바뀌어도 열차/객실별 예약 성공/실패 기록을 이어 쓴다
+    path = history_path()  # 켜져 있으면 이 워커가 본 시간표를 모두 기록한다
+    history = HistoryRecorder(path) if path is not None else None
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        job_id, account_id, password, run_kwargs = task
+        result_queue.put((job_id, RUNNING, None))
+
+        def checkpoint(stage: str, job_id: str = job_id):
+            result_queue.put((job_id, CHECKPOINT, stage))
+        scorer = CandidateScorer.for_options(run_kwargs["passenger_options"], run_kwargs["seat_options"])
+        scorer = scorers.setdefault(scorer.profile, scorer)
+        scorer.forget_before(datetime.datetime.now())
+        try:
+            if driver is None:
+                driver = create_driver(browser_profile)
+            else:
+                driver.delete_all_cookies()  # 이전 작업 계정 세션 제거
+            is_success = AutoReserver(driver).run(account_id, password, **run_kwargs, stop_event=cancel_event,
+                                                  observation_cache=observation_cache, checkpoint=checkpoint,
+                                                  progress=_ProgressThrottle(job_id, result_queue), history=history,
+                                                  scorer=scorer)
+            if cancel_event.is_set():
+                result_queue.put((job_id, CANCELLED, None))
+            else:
+                result_queue.put((job_id, SUCCEEDED if is_success else FAILED, None))
+        except Exception:
+            result_queue.put((job_id, FAILED, traceback.format_exc(limit=3)))
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                driver = None
+    if driver is not None:
+        driver.quit()
+    if history is not None:
+        history.close()
+
+
+class _Worker:
+    def __init__(self, ctx, idx: int, result_queue, observation_cache: ObservationCache | None = None,
+                 browser_profile: BrowserProfile = LEAN_PROFILE):
+        self.idx = idx
+        self.task_queue = ctx.Queue()
+        self.cancel_event = ctx.Event()
+        self.job: ReservationJob | None = None
+        self.process = ctx.Process(target=_worker_main,
+                                   args=(idx, self.task_queue, result_queue, self.cancel_event, observation_cache,
+                                         browser_profile),
+                                   daemon=True)
+        self.process.start()
+
+
+class JobScheduler:
+    def __init__(self, max_workers: int | None = None, browser_memory_mb: int = BROWSER_MEMORY_MB,
+                 memory_budget_mb: int | None = None, share_observations: bool = True,
+                 browser_profile: BrowserProfile = LEAN_PROFILE, job_store_path: str | None = None,
+                 job_store_key: str | None = None):
+        self.max_workers = max_workers or default_worker_count(browser_memory_mb, memory_budget_mb)
+        self._ctx = mp.get_context("spawn")
+        self._result_queue = self._ctx.Queue()
+        self._workers: list[_Worker] = []
+        self._jobs: dict[str, ReservationJob] = {}
+        self._route_queues: OrderedDict[tuple, deque[ReservationJob]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._collector: threading.Thread | None = None
+        self._closed = False
+        self._share_observations = share_observations
+        self._manager = None
+        self.observation_cache: ObservationCache | None = None
+        self.browser_profile = browser_profile
+        self._job_store_path = job_store_path
+        self._job_store_key = job_store_key
+        self._job_store: JobStore | None = None
+        self.events = JobEvents()
+
+    def start(self):
+        if self._share_observations:
+            # 같은 노선을 보는 워커들이 시간표를 나눠 쓰도록 프로세스 사이에 공유되는 캐시
+            self._manager = self._ctx.Manager()
+            self.observation_cache = ObservationCache.shared(self._manager)
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+        if self._job_store_path is not None:
+            self._job_store = JobStore(self._job_store_path, password_key=self._job_store_key)
+            self._resume_stored_jobs()
+
+    def _resume_stored_jobs(self):
+        # 지난번에 끝나지 않은 작업을 다시 큐에 넣는다. 새 브라우저이므로 로그인/조회부터 다시 하고,
+        # 노선별 큐와 _next_job 이 워커들에 고르게 나눈다
+        with self._lock:
+            for stored in self._job_store.unfinished((QUEUED, RUNNING)):
+                job = ReservationJob(stored["id"], stored["account_id"], stored["password"] or "", stored["options"],
+                                     created_at=stored["created_at"], stage=stored["stage"],
+                                     resumes=stored["resumes"] or 0)
+                self._jobs[job.id] = job
+                if stored["password"] is None:
+                    # 키 없이 저장했거나 키가 바뀌었다. 로그인할 수 없으므로 다시 접수해야 한다
+                    self._finish(job, FAILED, "password was not stored; submit the reservation again")
+                elif stored["status"] == RUNNING:
+                    self._requeue(job, "interrupted by restart")
+                else:
+                    self._route_queues.setdefault(job.route_key, deque()).append(job)
+            self._dispatch()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            for worker in self._workers:
+                worker.cancel_event.set()
+                worker.task_queue.put(None)
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self._result_queue.put(None)
+        if self._collector is not None:
+            self._collector.join(timeout=5)  # 워커가 남긴 끝 상태를 저장소를 닫기 전에 반영한다
+        if self._manager is not None:
+            self._manager.shutdown()
+        if self._job_store is not None:
+            self._job_store.close()
+
+    def submit(self, account_id: str, password: str, options: ReserverOptions) -> ReservationJob:
+        job = ReservationJob(uuid.uuid4().hex, account_id, password, options)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("scheduler is shut down")
+            self._jobs[job.id] = job
+            self._save(job, account_id=account_id, password=password, options=options, status=QUEUED,
+                       created_at=job.created_at)
+            self._route_queues.setdefault(job.route_key, deque()).append(job)
+            self._publish(job, "status")
+            self._dispatch()
+        return job
+
+    def _save(self, job: ReservationJob, **fields):
+        if self._job_store is not None:
+            self._job_store.save(job.id, **fields)
+
+    def _publish(self, job: ReservationJob, kind: str):
+        self.events.publish(job.id, kind, job.to_dict())
+
+    def _requeue(self, job: ReservationJob, reason: str):
+        # 중단된 작업은 새로 들어온 작업보다 먼저 다시 돌린다
+        if job.resumes >= MAX_RESUMES:
+            self._finish(job, FAILED, f"{reason} (gave up after {job.resumes} resumes)")
+            return
+        job.resumes += 1
+        job.status = QUEUED
+        job.worker = None
+        self._save(job, status=QUEUED, worker=None, resumes=job.resumes)
+        self._route_queues.setdefault(job.route_key, deque()).appendleft(job)
+        self._publish(job, "status")
+
+    def get(self, job_id: str) -> ReservationJob | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> ReservationJob | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return job
+            # 워커에 넘긴 작업은 RUNNING 응답 전이라도(상태가 아직 QUEUED) 워커가 멈춰야 끝난다
+            job.cancel_requested = True
+            for worker in self._workers:
+                if worker.job is job:
+                    worker.cancel_event.set()
+                    return job
+            route_queue = self._route_queues.get(job.route_key)
+            if route_queue is not None and job in route_queue:
+                route_queue.remove(job)
+            self._finish(job, CANCELLED)
+        return job
+
+    def _next_job(self) -> ReservationJob | None:
+        # 실행 중인 작업이 가장 적은 노선부터, 같으면 라운드로빈 순서로 꺼낸다
+        running = {}
+        for worker in self._workers:
+            if worker.job is not None:
+                running[worker.job.route_key] = running.get(worker.job.route_key, 0) + 1
+        candidates = [key for key, route_queue in self._route_queues.items() if route_queue]
+        if not candidates:
+            return None
+        route_key = min(candidates, key=lambda key: running.get(key, 0))
+        job = self._route_queues[route_key].popleft()
+        if self._route_queues[route_key]:
+            self._route_queues.move_to_end(route_key)
+        else:
+            del self._route_queues[route_key]
+        return job
+
+    def _idle_worker(self) -> _Worker | None:
+        for worker in self._workers:
+            if worker.job is None and worker.process.is_alive():
+                return worker
+        if len(self._workers) < self.max_workers:
+            worker = _Worker(self._ctx, len(self._workers), self._result_queue, self.observation_cache,
+                             self.browser_profile)
+            self._workers.append(worker)
+            return worker
+        return None
+
+    def _dispatch(self):
+        while not self._closed and any(self._route_queues.values()):
+            worker = self._idle_worker()
+            if worker is None:
+                return
+            job = self._next_job()
+            if job is None:
+                return
+            # 취소 신호는 작업을 넘기기 전에 지운다. 워커가 지우면 그 사이에 온 취소를 잃는다
+            worker.cancel_event.clear()
+            worker.job = job
+            job.worker = worker.idx
+            self._save(job, worker=worker.idx)
+            worker.task_queue.put((job.id, job.account_id, job.password, job.options.run_kwargs()))
+
+    def _finish(self, job: ReservationJob, status: str, error: str | None = None):
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.datetime.now()
+        self._publish(job, "status")
+        if status == CANCELLED and self._closed and not job.cancel_requested:
+            # 서비스 종료로 멈춘 작업. 저장소에는 RUNNING 과 (암호화한) 비밀번호를 그대로 두어 다시 뜰 때 이어서 돌린다
+            return
+        job.password = ""
+        self._save(job, status=status, error=error, finished_at=job.finished_at, password="")
+
+    def _reap_dead_workers(self):
+        with self._lock:
+            if self._closed:
+                return
+            for idx, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                if worker.job is not None:
+                    self._requeue(worker.job, f"worker exited with code {worker.process.exitcode}")
+                    worker.job = None
+                self._workers[idx] = _Worker(self._ctx, idx, self._result_queue, self.observation_cache,
+                                             self.browser_profile)
+            self._dispatch()
+
+    def _collect_results(self):
+        # 실행 중인 작업은 매초 진행 상황을 보내 큐가 비지 않으므로, 죽은 워커 정리와 캐시 정리는 시각으로 돌린다
+        next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL_SEC
+        while True:
+            if time.monotonic() >= next_maintenance:
+                self._reap_dead_workers()
+                if self.observation_cache is not None:
+                    self.observation_cache.evict_expired()
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL_SEC
+            try:
+                message = self._result_queue.get(timeout=max(next_maintenance - time.monotonic(), 0))
+            except queue.Empty:
+                continue
+            if message is None:
+                break
+            job_id, status, payload = message
+            with self._lock:
+                job = self._jobs[job_id]
+                if job.status in FINISHED_STATUSES:
+                    # 이미 끝낸 작업에서 늦게 온 메시지. 끝 상태를 되돌리지 않고 워커만 풀어 준다
+                    if status in FINISHED_STATUSES:
+                        self._release_worker(job)
+                    continue
+                if status == CHECKPOINT:
+                    if job.stage != payload:
+                        job.stage = payload
+                        self._publish(job, "stage")
+                        self._save(job, stage=payload)
+                    continue
+                if status == PROGRESS:
+                    job.polls, job.available = payload
+                    self._publish(job, "progress")
+                    continue
+                if status == RUNNING:
+                    job.status = RUNNING
+                    job.started_at = datetime.datetime.now()
+                    self._save(job, status=RUNNING, started_at=job.started_at)
+                    self._publish(job, "status")
+                    continue
+                self._finish(job, status, payload)
+                self._release_worker(job)
+
+    def _release_worker(self, job: ReservationJob):
+        for worker in self._workers:
+            if worker.job is job:
+                worker.job = None
+        self._dispatch()
@@ -1,15 +1,14 @@
 import datetime
-from ..page_object.custom_types import PassengerOptions, PriorityOptions, Region, RegionOptions, SeatOptions
-from typing import TypedDict, cast
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
 
+from page_object.custom_types import (HIGH, LOW, ClassPriorityOptions, PassengerOptions, PriorityOptions,
+                                      RegionOptions, RouteOption, SeatAttribute, SeatLocation, SeatOptions,
+                                      TimePriorityOptions)
+from page_object.polling import BurstWindow, PollingPolicy, release_windows
 
-class Context(TypedDict):
-    departure: Region
-    destination: Region
-    min_time: datetime.datetime
-    max_time: datetime.datetime
-    best_time: datetime.datetime
-    adult_count: int
+if TYPE_CHECKING:
+    from app.schemas import ReservationRequest
 
 
 class ReserverOptions:
@@ -18,20 +17,126 @@ class ReserverOptions:
                  passenger_count: PassengerOptions,
                  seat_options: SeatOptions,
                  priority_options: PriorityOptions,
+                 routes: list[RouteOption] | None = None,
+                 polling_policy: PollingPolicy | None = None,
                  ):
         self._region_options = region_options
         self._passenger_count = passenger_count
         self._seat_options = seat_options
         self._priority_options = priority_options
+        # 대체 노선을 주지 않으면 region_options 하나만 조회한다
+        self._routes = routes or [RouteOption(region_options.departure, region_options.destination)]
+        self._polling_policy = polling_policy or PollingPolicy()
+
+    @property
+    def region_options(self) -> RegionOptions:
+        return self._region_options
+
+    @property
+    def priority_options(self) -> PriorityOptions:
+        return self._priority_options
+
+    @property
+    def routes(self) -> list[RouteOption]:
+        return self._routes
+
+    @property
+    def polling_policy(self) -> PollingPolicy:
+        return self._polling_policy
 
     @classmethod
-    def from_request(cls, **context):
-        region_options = RegionOptions(departure=context["departure"],
-                                       destination=context["destination"],
-                                       )
-        passenser_options = PassengerOptions(adult=context["adult_count"],
-                                             elder=context["elder_count"],
-                                             child=context["child_count"],
-                                             severe_disabled=context["severe_disabled_count"],
-                                             mild_disabled=context["mild_disabled_count"]
+    def from_request(cls, request: "ReservationRequest") -> "ReserverOptions":
+        region_options = RegionOptions(departure=request.departure, destination=request.destination)
+        passenger_options = PassengerOptions(adult=request.adult_count,
+                                             elder=request.elder_count,
+                                             child=request.child_count,
+                                             severe_disabled=request.severe_disabled_count,
+                                             mild_disabled=request.mild_disabled_count,
                                              )
+        seat_options = SeatOptions(SeatLocation.default, SeatAttribute.default)
+        if request.seat == "특실":
+            class_priority_options = ClassPriorityOptions(standard=LOW, first_class=HIGH)
+        else:
+            class_priority_options = ClassPriorityOptions()
+        time_priority_options = TimePriorityOptions(min_datetime=request.min_time,
+                                                    max_datetime=request.max_time,
+                                                    best_datetime=request.best_time,
+                                                    )
+        routes = None
+        if request.alternate_routes:
+            routes = [RouteOption(request.departure, request.destination)] + [
+                RouteOption(route.departure, route.destination, route.weight) for route in request.alternate_routes]
+        polling_policy = PollingPolicy(burst_windows=release_windows(request.release_times))
+        return cls(region_options, passenger_options, seat_options,
+                   PriorityOptions(class_priority_options, time_priority_options), routes, polling_policy)
+
+    def run_kwargs(self) -> dict[str, Any]:
+        time_priority_options = self._priority_options.time_priority_option
+        return {
+            "departure": self._region_options.departure,
+            "destination": self._region_options.destination,
+            "min_datetime": time_priority_options.min_datetime,
+            "max_datetime": time_priority_options.max_datetime,
+            "passenger_options": self._passenger_count,
+            "seat_options": self._seat_options,
+            "priority_options": self._priority_options,
+            "best_datetime": time_priority_options.best_datetime,
+            "routes": self._routes,
+            "polling_policy": self._polling_policy,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        # 작업 저장소에 JSON 으로 남길 값. from_dict 로 되돌린다
+        class_priority_options = self._priority_options.class_priority_option
+        time_priority_options = self._priority_options.time_priority_option
+        return {
+            "region": asdict(self._region_options),
+            "passengers": asdict(self._passenger_count),
+            "seat": {"location": int(self._seat_options.seat_location),
+                     "attribute": int(self._seat_options.seat_attribute)},
+            "class_priority": asdict(class_priority_options),
+            "time_priority": {
+                "min_datetime": time_priority_options.min_datetime.isoformat(),
+                "max_datetime": _isoformat(time_priority_options.max_datetime),
+                "best_datetime": _isoformat(time_priority_options.best_datetime),
+                "prefer_time": time_priority_options.prefer_time,
+                "ascendig": time_priority_options.ascendig,
+            },
+            "routes": [asdict(route) for route in self._routes],
+            "polling_policy": {
+                **{name: value for name, value in asdict(self._polling_policy).items() if name != "burst_windows"},
+                "burst_windows": [{"at": window.at.isoformat(), "before": window.before.total_seconds(),
+                                   "after": window.after.total_seconds(), "interval_sec": window.interval_sec}
+                                  for window in self._polling_policy.burst_windows],
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ReserverOptions":
+        time_priority = data["time_priority"]
+        time_priority_options = TimePriorityOptions(
+            min_datetime=datetime.datetime.fromisoformat(time_priority["min_datetime"]),
+            max_datetime=_fromisoformat(time_priority["max_datetime"]),
+            best_datetime=_fromisoformat(time_priority["best_datetime"]),
+            prefer_time=time_priority["prefer_time"],
+            ascendig=time_priority["ascendig"],
+        )
+        burst_windows = [BurstWindow(datetime.time.fromisoformat(window["at"]),
+                                     datetime.timedelta(seconds=window["before"]),
+                                     datetime.timedelta(seconds=window["after"]),
+                                     window["interval_sec"])
+                         for window in data["polling_policy"]["burst_windows"]]
+        return cls(RegionOptions(**data["region"]),
+                   PassengerOptions(**data["passengers"]),
+                   SeatOptions(SeatLocation(data["seat"]["location"]), SeatAttribute(data["seat"]["attribute"])),
+                   PriorityOptions(ClassPriorityOptions(**data["class_priority"]), time_priority_options),
+                   [RouteOption(**route) for route in data["routes"]],
+                   PollingPolicy(**{**data["polling_policy"], "burst_windows": burst_windows}))
+
+
+def _isoformat(value: datetime.datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _fromisoformat(value: str | None) -> datetime.datetime | None:
+    return datetime.datetime.fromisoformat(value) if value is not None else None
@@ -0,0 +1,113 @@
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable
+
+from selenium.webdriver import Chrome
+
+from app.auto_reserver import AutoReserver
+from app.jobs import LEAN_PROFILE, create_driver
+from page_object.polling import PollingPolicy, PollingScheduler
+
+# 계정마다 RaceCoordinator 가 따로 넘기는 AutoReserver.run 인자
+RACER_KWARGS = ("stop_event", "polling_scheduler")
+
+
+class RaceToken(threading.Event):
+    # 같은 여정을 잡는 계정들이 stop_event 로 함께 쓰는 취소 토큰.
+    # 먼저 예약을 확인한 계정이 claim 하면 나머지 계정은 다음 대기/예약 직전에 멈추고 브라우저를 닫는다
+    def __init__(self):
+        super().__init__()
+        self._claim_lock = threading.Lock()
+        self.winner: str | None = None
+
+    def claim(self, account_id: str) -> bool:
+        with self._claim_lock:
+            if self.winner is not None:
+                return False
+            self.winner = account_id
+        self.set()
+        return True
+
+
+@dataclass(frozen=True)
+class RaceAccount:
+    id: str
+    password: str
+    # 계정마다 조회 간격과 백오프를 따로 둔다. 계정 수만큼 요청이 늘어도 한 계정(세션)의 조회 빈도는 그대로다
+    polling_policy: PollingPolicy = field(default_factory=PollingPolicy)
+
+
+@dataclass
+class RaceResult:
+    winner: str | None
+    elapsed_sec: float
+    # 예약을 확인한 계정 -> 시작부터 걸린 시간. 거의 동시에 둘 이상이 잡으면 늦은 쪽은 결제하지 않으면 10분 뒤 풀린다
+    reserved_sec: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def duplicates(self) -> list[str]:
+        return [account_id for account_id in self.reserved_sec if account_id != self.winner]
+
+
+class RaceCoordinator:
+    # 여러 계정이 각자의 브라우저 세션으로 같은 여정을 동시에 잡는다. 먼저 예약을 확인한 계정이 이긴다
+    def __init__(self,
+                 accounts: list[RaceAccount],
+                 base_url: str | None = None,
+                 driver_factory: Callable[[], Chrome] = partial(create_driver, LEAN_PROFILE),
+                 ):
+        if not accounts:
+            raise ValueError("at least one account is required")
+        if len({account.id for account in accounts}) != len(accounts):
+            raise ValueError("accounts must be distinct")
+        self._accounts = accounts
+        self._base_url = base_url
+        self._driver_factory = driver_factory
+
+    def run(self, stop_event: threading.Event | None = None, **run_kwargs: Any) -> RaceResult:
+        # run_kwargs 는 AutoReserver.run 의 여정 인자(ReserverOptions.run_kwargs)
+        reserved = [key for key in RACER_KWARGS if key in run_kwargs]
+        if reserved:
+            raise ValueError(f"{', '.join(reserved)} is set per account by the race; use RaceAccount.polling_policy "
+                             f"or the stop_event argument of run()")
+        token = RaceToken()
+        started = time.perf_counter()
+        result = RaceResult(None, 0.0)
+        racers = [threading.Thread(target=self._race, args=(account, token, started, run_kwargs, result),
+                                   name=f"race-{account.id}", daemon=True)
+                  for account in self._accounts]
+        for racer in racers:
+            racer.start()
+        for racer in racers:
+            while racer.is_alive():
+                racer.join(timeout=0.1)
+                if stop_event is not None and stop_event.is_set():
+                    token.set()  # 사용자 취소. 이긴 계정 없이 모두 멈춘다
+        result.winner = token.winner
+        result.elapsed_sec = time.perf_counter() - started
+        return result
+
+    def _race(self, account: RaceAccount, token: RaceToken, started: float, run_kwargs: dict[str, Any],
+              result: RaceResult):
+        driver = None
+        try:
+            driver = self._driver_factory()
+            polling_scheduler = PollingScheduler(account.polling_policy,
+                                                 run_kwargs["priority_options"].time_priority_option)
+            is_success = AutoReserver(driver, self._base_url).run(account.id, account.password, **run_kwargs,
+                                                                  stop_event=token,
+                                                                  polling_scheduler=polling_scheduler)
+            if is_success:
+                # 이긴 계정과 중복 예약(RaceResult.duplicates)은 결과로 돌려준다
+                result.reserved_sec[account.id] = time.perf_counter() - started
+                token.claim(account.id)
+        except Exception:
+            if not token.is_set():
+                result.errors[account.id] = traceback.format_exc(limit=3)
+        finally:
+            if driver is not None:
+                driver.quit()
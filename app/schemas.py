@@ -0,0 +1,61 @@
+import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from page_object.custom_types import Region
+
+MAX_PASSENGERS = 9  # SRT 한 번에 예매할 수 있는 인원
+
+
+class AlternateRoute(BaseModel):
+    departure: Region
+    destination: Region
+    weight: float = Field(1.0, gt=0)
+
+
+class ReservationRequest(BaseModel):
+    id: str = Field(min_length=1)
+    password: str = Field(min_length=1)
+    departure: Region
+    destination: Region
+    min_time: datetime.datetime
+    max_time: datetime.datetime
+    best_time: datetime.datetime | None = None
+    route: Literal["직통", "환승", "왕복"] = "직통"
+    adult_count: int = Field(1, ge=0, le=MAX_PASSENGERS)
+    child_count: int = Field(0, ge=0, le=MAX_PASSENGERS)
+    elder_count: int = Field(0, ge=0, le=MAX_PASSENGERS)
+    severe_disabled_count: int = Field(0, ge=0, le=MAX_PASSENGERS)
+    mild_disabled_count: int = Field(0, ge=0, le=MAX_PASSENGERS)
+    seat: Literal["일반", "우등", "특실"] = "일반"
+    train_type: Literal["전체", "SRT", "SRT + KTX"] = "전체"
+    alternate_routes: list[AlternateRoute] = []
+    # 승차권이 열리는 시각(07:00) 말고도 짧은 간격으로 조회할 시각(미결제 예약이 풀리는 시각 등)
+    release_times: list[datetime.time] = []
+
+    @model_validator(mode="before")
+    @classmethod
+    def _empty_best_time(cls, data):
+        # 폼에서 best_time 을 비워 보내면 빈 문자열이 온다
+        if isinstance(data, dict) and data.get("best_time") == "":
+            data = {**data, "best_time": None}
+        return data
+
+    @model_validator(mode="after")
+    def _check(self) -> "ReservationRequest":
+        if self.departure == self.destination:
+            raise ValueError("departure and destination must differ")
+        passengers = (self.adult_count + self.child_count + self.elder_count + self.severe_disabled_count
+                      + self.mild_disabled_count)
+        if not 0 < passengers <= MAX_PASSENGERS:
+            raise ValueError(f"passenger count must be between 1 and {MAX_PASSENGERS}")
+        if self.min_time > self.max_time:
+            raise ValueError("min_time must not be after max_time")
+        if self.best_time is not None and not self.min_time <= self.best_time <= self.max_time:
+            raise ValueError("best_time must be between min_time and max_time")
+        return self
+
+    def context(self) -> dict:
+        # result.html 에 보여줄 값들(비밀번호 제외)
+        return self.model_dump(exclude={"id", "password", "alternate_routes", "release_times"})
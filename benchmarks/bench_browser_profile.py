@@ -0,0 +1,97 @@
+import argparse
+import os
+import statistics
+import time
+
+from app.jobs import DEFAULT_PROFILE, LEAN_PROFILE, BrowserProfile, create_driver
+from benchmarks.bench_reservation import ACCOUNT_ID, _run_kwargs
+from benchmarks.stand_in_server import SeatChurn, StandInServer, replay_rows
+from page_object import pages
+
+PROFILES = {"default": DEFAULT_PROFILE, "lean": LEAN_PROFILE}
+NAVIGATION_DURATION_SCRIPT = 'return performance.getEntriesByType("navigation")[0].duration;'
+
+
+def _children(pid: int) -> list[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+def browser_rss_mb(driver_pid: int) -> float:
+    # chromedriver 아래 Chrome 프로세스 트리 전체의 RSS 합
+    total_kb = 0
+    pending = _children(driver_pid)
+    while pending:
+        pid = pending.pop()
+        pending.extend(_children(pid))
+        try:
+            with open(f"/proc/{pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def measure(profile: BrowserProfile, polls: int, latency_sec: float) -> dict[str, float]:
+    rows = replay_rows()
+    server = StandInServer.replay(SeatChurn(rows), rows, latency_sec).start()
+    driver = create_driver(profile)
+    try:
+        kwargs = _run_kwargs()
+        pages.LoginPage(driver, pages.rebase_url(pages.SRT_LOGIN_PAGE_URL, server.url)).login(ACCOUNT_ID, "pw")
+        select_page = pages.SelectSchedulePage(driver,
+                                               pages.rebase_url(pages.SRT_SELECT_SCHEDULE_PAGE_URL, server.url))
+        select_page.enter_region(kwargs["departure"], kwargs["destination"])
+        select_page.select_date_time(kwargs["min_datetime"])
+        select_page.select_passenger(kwargs["passenger_options"])
+        select_page.search()
+        # 첫 화면에서 캐시가 찬 뒤의 조회(새로고침)만 잰다
+        html_before, asset_before = server.bytes_sent["html"], server.bytes_sent["asset"]
+        load_samples, navigation_samples = [], []
+        for _ in range(polls):
+            started = time.perf_counter()
+            driver.refresh()
+            load_samples.append((time.perf_counter() - started) * 1000)
+            navigation_samples.append(driver.execute_script(NAVIGATION_DURATION_SCRIPT))
+        return {
+            "html_kb": (server.bytes_sent["html"] - html_before) / polls / 1024,
+            "asset_kb": (server.bytes_sent["asset"] - asset_before) / polls / 1024,
+            "load_ms": statistics.median(load_samples),
+            "navigation_ms": statistics.median(navigation_samples),
+            "rss_mb": browser_rss_mb(driver.service.process.pid),
+        }
+    finally:
+        driver.quit()
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=[*PROFILES, "all"], default="all")
+    parser.add_argument("--polls", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    names = list(PROFILES) if args.profile == "all" else [args.profile]
+    for name in names:
+        result = measure(PROFILES[name], args.polls, args.latency)
+        print(f"{name:>8}: {result['html_kb'] + result['asset_kb']:7.1f} KB/poll "
+              f"(html {result['html_kb']:.1f}, assets {result['asset_kb']:.1f})  "
+              f"load p50 {result['load_ms']:6.1f} ms  navigation p50 {result['navigation_ms']:6.1f} ms  "
+              f"RSS {result['rss_mb']:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
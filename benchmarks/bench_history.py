@@ -0,0 +1,75 @@
+import argparse
+import datetime
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.fixtures import random_rows, to_ticket_cells
+from page_object.history import (AVAILABLE, HISTORY_DTYPE, LEAD_TIME, SOLD_OUT_CODE, HistoryRecorder,
+                                 seat_release_histograms)
+
+
+def synthesize(path: str, records: int, trains: int = 60, seed: int = 0):
+    # 하루에 한 번씩 모든 열차/객실을 조회한 것처럼, 대부분 매진이고 가끔 한 칸이 풀리는 기록을 만든다
+    rng = np.random.default_rng(seed)
+    per_snapshot = trains * 2
+    snapshots = records // per_snapshot
+    start = np.datetime64(datetime.datetime.now().replace(microsecond=0), "ms")
+    with open(path, "wb") as file:
+        for first in range(0, snapshots, 10_000):
+            count = min(10_000, snapshots - first)
+            chunk = np.empty((count, per_snapshot), HISTORY_DTYPE)
+            snapshot_idx = np.arange(first, first + count)[:, None]
+            chunk["observed_at"] = start + snapshot_idx * 500
+            chunk["departs_at"] = (start + np.timedelta64(2, "D")).astype("M8[m]") + \
+                np.repeat(np.arange(trains) * 20, 2)[None, :]
+            chunk["departure"] = 551
+            chunk["destination"] = 20
+            chunk["train_no"] = np.repeat(301 + 2 * np.arange(trains), 2)[None, :]
+            chunk["seat_class"] = np.tile([0, 1], trains)[None, :]
+            chunk["status"] = np.where(rng.random((count, per_snapshot)) < 0.01, AVAILABLE, SOLD_OUT_CODE)
+            file.write(chunk.tobytes())
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=5_000_000)
+    parser.add_argument("--chunk", type=int, default=1 << 20)
+    parser.add_argument("--snapshots", type=int, default=2000, help="record() 를 잴 시간표 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.rec")
+
+        cells = to_ticket_cells(random_rows(30))
+        recorder = HistoryRecorder(path)
+        search_date = datetime.date.today()
+        started = time.perf_counter()
+        for _ in range(args.snapshots):
+            recorder.record(cells, search_date)
+        record_us = (time.perf_counter() - started) / args.snapshots * 1e6
+        recorder.close()
+        print(f"record():  {record_us:.1f} us per 30-row snapshot (hot path)  "
+              f"-> {recorder.records} records, {os.path.getsize(path) / recorder.records:.0f} B/record")
+
+        synthesize(path, args.records)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        rss_before = _max_rss_mb()
+        started = time.perf_counter()
+        histograms = seat_release_histograms(path, bin_minutes=60, by=LEAD_TIME, chunk_records=args.chunk)
+        elapsed = time.perf_counter() - started
+        releases = sum(int(counts.sum()) for counts in histograms.values())
+        print(f"histogram: {args.records:,} records ({size_mb:.0f} MB) in {elapsed:.2f}s "
+              f"({args.records / elapsed / 1e6:.1f} M records/s), {len(histograms)} trains, {releases:,} releases, "
+              f"max RSS +{_max_rss_mb() - rss_before:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import datetime
+import time
+
+from benchmarks.fixtures import random_rows, render_time_table_page
+from benchmarks.stand_in_server import StandInServer
+from page_object.custom_types import ClassPriorityOptions, TimePriorityOptions
+from page_object.http_poller import HttpPoller
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--polls", type=int, default=200)
+    args = parser.parse_args()
+
+    pages = [render_time_table_page(random_rows(seed=seed)) for seed in range(5)]
+    server = StandInServer(pages).start()
+    try:
+        poller = HttpPoller(server.schedule_url, "dptRsStnCd=0551&arvRsStnCd=0020", {"JSESSIONID": "x"})
+        class_priority_options = ClassPriorityOptions()
+        time_priority_options = TimePriorityOptions(min_datetime=datetime.datetime.now().replace(hour=0, minute=0))
+        found = 0
+        started = time.perf_counter()
+        for _ in range(args.polls):
+            if not poller.poll(class_priority_options, time_priority_options).is_empty():
+                found += 1
+        elapsed = time.perf_counter() - started
+        print(f"polls: {poller.poll_count}  server requests: {server.time_table_requests}  with seats: {found}")
+        print(f"{elapsed / args.polls * 1000:.2f} ms/poll  {args.polls / elapsed:.0f} polls/s")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# 모듈별 import 예산(ms, 하위 import 포함)과 그 경로에서 읽으면 안 되는 무거운 패키지.
+# 웹 프로세스와 워커가 처음 읽는 경로(app.jobs -> app.options -> custom_types)는 selenium 없이 떠야 한다.
+# tests/test_import_time.py 가 이 예산을 검사한다
+BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    "page_object.custom_types": (80, ("selenium", "pandas", "urllib3")),
+    "page_object.observation_cache": (80, ("selenium", "pandas", "urllib3")),
+    "page_object.tracing": (40, ("selenium", "pandas")),
+    "app.options": (80, ("selenium", "pandas", "urllib3", "pydantic")),
+    "app.jobs": (100, ("selenium", "pandas", "urllib3", "jinja2", "asyncio")),
+    "page_object.pages": (800, ("pandas",)),
+    "app.auto_reserver": (900, ("pandas",)),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    # 새 인터프리터에서 -X importtime 으로 module 을 읽고, 누적 시간(ms)과 같이 읽힌 최상위 패키지를 돌려준다
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    cumulative_us = 0
+    loaded = set()
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        name = match.group(4)
+        loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(match.group(2))
+    return cumulative_us / 1000, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3, help="모듈마다 재서 가장 빠른 값을 쓴다")
+    args = parser.parse_args()
+
+    failures = []
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        samples = []
+        loaded: set[str] = set()
+        for _ in range(args.runs):
+            elapsed_ms, loaded = import_time(module)
+            samples.append(elapsed_ms)
+        elapsed_ms = min(samples)
+        heavy = sorted(loaded.intersection(forbidden))
+        ok = elapsed_ms <= budget_ms and not heavy
+        print(f"{module:>30}: {elapsed_ms:7.1f} ms (budget {budget_ms:.0f} ms)"
+              f"{'  loads ' + ', '.join(heavy) if heavy else ''}  {'ok' if ok else 'OVER'}")
+        if not ok:
+            failures.append(module)
+    if failures:
+        print(f"import budget exceeded: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+from app.job_events import JobEvents
+
+JOB_ID = "job"
+
+
+async def measure(watchers: int, events: int, interval_sec: float, buffer_size: int) -> dict[str, float]:
+    job_events = JobEvents(buffer_size)
+    subscriptions = [job_events.subscribe(JOB_ID) for _ in range(watchers)]
+    delivery_ms: list[float] = []
+
+    async def watch(subscription):
+        for _ in range(events):
+            event = await subscription.get()
+            delivery_ms.append((time.perf_counter() - event.data["sent_at"]) * 1000)
+
+    publish_ms: list[float] = []
+
+    def publish():
+        # 스케줄러의 결과 수집 스레드처럼 다른 스레드에서 보낸다
+        for idx in range(events):
+            started = time.perf_counter()
+            job_events.publish(JOB_ID, "progress", {"polls": idx, "sent_at": started})
+            publish_ms.append((time.perf_counter() - started) * 1000)
+            time.sleep(interval_sec)
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    await asyncio.wait_for(asyncio.gather(*(watch(subscription) for subscription in subscriptions)), 60)
+    publisher.join()
+    for subscription in subscriptions:
+        subscription.close()
+    delivery_ms.sort()
+    return {
+        "publish_ms": statistics.median(publish_ms),
+        "delivery_p50_ms": delivery_ms[len(delivery_ms) // 2],
+        "delivery_p99_ms": delivery_ms[int(len(delivery_ms) * 0.99)],
+        "dropped": sum(subscription.dropped for subscription in subscriptions),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--watchers", type=int, nargs="+", default=[1, 100, 1000, 5000])
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--buffer-size", type=int, default=32)
+    args = parser.parse_args()
+
+    for watchers in args.watchers:
+        result = asyncio.run(measure(watchers, args.events, args.interval, args.buffer_size))
+        print(f"{watchers:>6} watchers: publish p50 {result['publish_ms']:7.3f} ms  "
+              f"delivery p50 {result['delivery_p50_ms']:7.2f} ms  p99 {result['delivery_p99_ms']:7.2f} ms  "
+              f"dropped {result['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
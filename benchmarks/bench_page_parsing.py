@@ -0,0 +1,114 @@
+import argparse
+import pathlib
+import statistics
+import time
+from html.parser import HTMLParser
+
+from benchmarks.fixtures import random_rows, render_time_table_page
+from benchmarks.stand_in_server import load_pages
+from page_object.custom_types import Ticket, TicketCell
+from page_object.time_table_parser import TimeTableHtmlParser
+
+COMPARED = (Ticket.TRAIN_NO_IDX, Ticket.DEP_IDX, Ticket.ARR_IDX, Ticket.FIRST_CLS_IDX, Ticket.STANDARD_CLS_IDX)
+
+
+class LegacyTimeTableParser(HTMLParser):
+    # 이전 HttpPoller 의 html.parser 기반 파서(비교용)
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.rows: list[list[TicketCell]] = []
+        self._in_tbody = False
+        self._row: list[TicketCell] | None = None
+        self._cell_texts: list[str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tbody":
+            self._in_tbody = True
+        elif not self._in_tbody:
+            return
+        elif tag == "tr":
+            self._row = []
+        elif tag == "td" and self._row is not None:
+            self._cell_texts = []
+
+    def handle_endtag(self, tag):
+        if tag == "tbody":
+            self._in_tbody = False
+        elif tag == "td" and self._row is not None and self._cell_texts is not None:
+            self._row.append(TicketCell("\n".join(self._cell_texts)))
+            self._cell_texts = None
+        elif tag == "tr" and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell_texts is not None and data.strip():
+            self._cell_texts.append(data.strip())
+
+
+def legacy_parse(page: bytes) -> list[list[TicketCell]]:
+    parser = LegacyTimeTableParser()
+    parser.feed(page.decode("utf-8", errors="replace"))
+    parser.close()
+    return parser.rows
+
+
+def _measure(parse, pages: list[bytes]) -> list[float]:
+    samples = []
+    for page in pages:
+        started = time.perf_counter()
+        parse(page)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def _summary(samples: list[float]) -> str:
+    total = sum(samples) / 1e6
+    return (f"p50 {statistics.median(samples):7.1f} us  p99 {statistics.quantiles(samples, n=100)[98]:7.1f} us  "
+            f"{len(samples) / total:,.0f} pages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000, help="녹화 페이지가 없을 때 합성할 페이지 수")
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--record-dir", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+
+    if args.record_dir is not None:
+        pages = [page.encode("utf-8") for page in load_pages(args.record_dir)]
+    else:
+        pages = [render_time_table_page(random_rows(args.rows, seed)).encode("utf-8") for seed in range(args.pages)]
+    profile_parser = TimeTableHtmlParser()
+
+    # 두 파서가 Ticket 이 읽는 칸을 똑같이 읽는지
+    for page in pages:
+        expected = [[row[idx].text for idx in COMPARED] for row in legacy_parse(page)]
+        actual = [[row[idx].text for idx in COMPARED] for row in profile_parser.to_cells(profile_parser.parse(page))]
+        assert actual == expected, "parsers disagree"
+
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KB/page")
+    print(f"html.parser  : {_summary(_measure(legacy_parse, pages))}")
+    print(f"lxml rows    : {_summary(_measure(profile_parser.parse, pages))}")
+
+    def to_cells(page: bytes) -> list[list[TicketCell]]:
+        return profile_parser.to_cells(profile_parser.parse(page))
+
+    print(f"lxml + cells : {_summary(_measure(to_cells, pages))}")
+
+    document = profile_parser.document(pages[0])
+    headers = profile_parser.headers(document)
+    repeat = 10_000
+    started = time.perf_counter()
+    for _ in range(repeat):
+        profile_parser.profile.validate(headers)
+    compare_us = (time.perf_counter() - started) / repeat * 1e6
+    started = time.perf_counter()
+    for _ in range(repeat):
+        profile_parser.validate(document)
+    validate_us = (time.perf_counter() - started) / repeat * 1e6
+    print(f"profile check: {compare_us:.2f} us (header compare), {validate_us:.2f} us (XPath + compare per page)")
+
+
+if __name__ == "__main__":
+    main()
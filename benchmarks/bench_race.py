@@ -0,0 +1,73 @@
+import argparse
+import statistics
+import threading
+
+from app.race import RaceAccount, RaceCoordinator
+from benchmarks.bench_reservation import _run_kwargs
+from benchmarks.stand_in_server import SeatChurn, StandInServer, replay_rows
+from page_object.polling import PollingPolicy
+
+
+def _distribution(samples: list[float]) -> str:
+    if not samples:
+        return "-"
+    samples = sorted(samples)
+    p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+    return (f"p50 {statistics.median(samples) * 1000:6.0f} ms  p90 {p90 * 1000:6.0f} ms  "
+            f"max {samples[-1] * 1000:6.0f} ms  (n={len(samples)})")
+
+
+def measure(account_count: int, runs: int, interval_sec: float, release_interval_sec: float, hold_sec: float,
+            latency_sec: float, netfunnel_sec: float, timeout_sec: float) -> dict:
+    # 계정마다 조회 간격은 같고(계정당 한도), 계정 수만 늘린다
+    accounts = [RaceAccount(f"{idx:010d}", "pw", PollingPolicy(interval_sec=interval_sec))
+                for idx in range(account_count)]
+    reserve_latencies: list[float] = []
+    wall_times: list[float] = []
+    duplicates = 0
+    for run in range(runs):
+        rows = replay_rows(seed=run)
+        churn = SeatChurn(rows, release_interval_sec, hold_sec, seed=run)
+        server = StandInServer.replay(churn, rows, latency_sec, netfunnel_sec, seed=run).start()
+        stop_event = threading.Event()
+        timer = threading.Timer(timeout_sec, stop_event.set)
+        timer.start()
+        try:
+            result = RaceCoordinator(accounts, base_url=server.url).run(stop_event=stop_event, **_run_kwargs())
+        finally:
+            timer.cancel()
+            server.stop()
+        won = [release for release in server.reservations if release.account == result.winner]
+        if won:
+            reserve_latencies.append(won[0].reserved_at - won[0].released_at)
+            wall_times.append(result.elapsed_sec)
+        duplicates += len(result.duplicates)
+        print(f"  run {run}: winner={result.winner}  {result.elapsed_sec:.1f}s  polls {server.time_table_requests}"
+              f" ({server.polls_per_sec():.1f}/s)  failed clicks {server.failed_reservations}"
+              f"  errors {len(result.errors)}")
+    return {"reserve": reserve_latencies, "wall": wall_times, "duplicates": duplicates}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.0, help="계정당 조회 간격(초)")
+    parser.add_argument("--release-interval", type=float, default=5.0)
+    parser.add_argument("--hold", type=float, default=1.5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--netfunnel", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=90.0)
+    args = parser.parse_args()
+
+    for account_count in args.accounts:
+        print(f"{account_count} account(s)")
+        result = measure(account_count, args.runs, args.interval, args.release_interval, args.hold, args.latency,
+                         args.netfunnel, args.timeout)
+        print(f"  time-to-reserve: {_distribution(result['reserve'])}")
+        print(f"  wall time:       {_distribution(result['wall'])}")
+        print(f"  duplicate reservations: {result['duplicates']}")
+
+
+if __name__ == "__main__":
+    main()
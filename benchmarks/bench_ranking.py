@@ -0,0 +1,180 @@
+import argparse
+import datetime
+import statistics
+import time
+import warnings
+
+import pandas as pd
+
+from benchmarks.fixtures import random_rows, to_ticket_cells
+from page_object.custom_types import ClassPriorityOptions, Ticket, TicketCell, TimePriorityOptions
+
+
+class LegacyTicket(Ticket):
+    # 이전 pandas 파이프라인 (비교용)
+
+    def __init__(self, rows: list[list[TicketCell]], class_priority_options: ClassPriorityOptions,
+                 time_priority_options: TimePriorityOptions):
+        self._class_priority_options = class_priority_options
+        self._time_priority_options = time_priority_options
+        self.min_time = time_priority_options.min_datetime
+        self.max_time = time_priority_options.max_datetime
+        self.best_time = time_priority_options.best_datetime
+        _time_table_df = self._get_time_table_df(rows)
+        self._sorted_by_time_df = self._filter_by_time(_time_table_df)
+        self._standard, self._standard_standing, self._first_class, self._first_class_standing = \
+            self._split_by_class(self._sorted_by_time_df)
+
+    def is_empty(self):
+        return (
+            self.standard.empty and
+            self.standard_standing.empty and
+            self.first_class.empty and
+            self.first_class_standing.empty
+        )
+
+    def _get_time_table_df(self, rows: list[list[TicketCell]]) -> pd.DataFrame:
+        columns = {LegacyTicket.DEP_IDX: []}
+        if self._class_priority_options.standard:
+            columns[LegacyTicket.STANDARD_CLS_IDX] = []
+        if self._class_priority_options.first_class:
+            columns[LegacyTicket.FIRST_CLS_IDX] = []
+
+        for row in rows:
+            for idx in columns.keys():
+                if idx == LegacyTicket.DEP_IDX:
+                    time_text = row[idx].text.split("\n")[1]
+                    hour, minute = time_text.split(":")
+                    new_time = self._time_priority_options.min_datetime.replace(hour=int(hour), minute=int(minute))
+                    columns[idx].append(new_time)
+                else:
+                    columns[idx].append(row[idx])
+        time_table_df = pd.DataFrame(columns)
+        return time_table_df
+
+    def _filter_by_time(self, time_table_df: pd.DataFrame) -> pd.DataFrame:
+        time_series = time_table_df.iloc[:, 0]
+        time_filter = time_series >= self._time_priority_options.min_datetime
+        _20_minutes = (datetime.datetime.now() + datetime.timedelta(minutes=20))
+        _20_min_filter = time_series > _20_minutes
+        time_filter = time_filter & _20_min_filter
+        if self._time_priority_options.max_datetime is not None:
+            max_time_filterd = time_series <= self._time_priority_options.max_datetime
+            time_filter = time_filter & max_time_filterd
+        time_table_df = time_table_df[time_filter]
+        return time_table_df
+
+    def _split_by_class(self, time_table_df: pd.DataFrame) -> tuple[pd.DataFrame, ...]:
+        status = time_table_df.iloc[:, 1:].map(lambda cell: cell.text)
+        forbidon_statuses = ["좌석부족", "매진"]
+        if self._class_priority_options.allow_standing is False:
+            forbidon_statuses.append("입석+좌석")
+        for fs in forbidon_statuses:
+            status[status == fs] = False
+
+        if self._class_priority_options.standard:
+            standard = time_table_df[[LegacyTicket.DEP_IDX, LegacyTicket.STANDARD_CLS_IDX]
+                                     ][status[LegacyTicket.STANDARD_CLS_IDX].astype(bool)]
+            if self._class_priority_options.allow_standing and self._class_priority_options.standard_standing:
+                standard_standing = standard[status[LegacyTicket.STANDARD_CLS_IDX] == "입석+좌석"]
+                standard = standard[status[LegacyTicket.STANDARD_CLS_IDX] != "입석+좌석"]
+            else:
+                standard_standing = pd.DataFrame()
+        else:
+            standard = pd.DataFrame()
+            standard_standing = pd.DataFrame()
+
+        if self._class_priority_options.first_class:
+            first_class = time_table_df[[LegacyTicket.DEP_IDX, LegacyTicket.FIRST_CLS_IDX]
+                                        ][status[LegacyTicket.FIRST_CLS_IDX].astype(bool)]
+            if self._class_priority_options.allow_standing and self._class_priority_options.first_class_standing:
+                first_class_standing = first_class[status[LegacyTicket.FIRST_CLS_IDX] == "입석+좌석"]
+                first_class = first_class[status[LegacyTicket.FIRST_CLS_IDX] != "입석+좌석"]
+            else:
+                first_class_standing = pd.DataFrame()
+        else:
+            first_class = pd.DataFrame()
+            first_class_standing = pd.DataFrame()
+        if not standard.empty:
+            standard.columns = ['time', 'ticket']
+        if not standard_standing.empty:
+            standard_standing.columns = ['time', 'ticket']
+        if not first_class.empty:
+            first_class.columns = ['time', 'ticket']
+        if not first_class_standing.empty:
+            first_class_standing.columns = ['time', 'ticket']
+        return standard, standard_standing, first_class, first_class_standing
+
+    @property
+    def standard(self) -> pd.DataFrame:
+        return self._standard
+
+    @property
+    def standard_standing(self) -> pd.DataFrame:
+        return self._standard_standing
+
+    @property
+    def first_class(self) -> pd.DataFrame:
+        return self._first_class
+
+    @property
+    def first_class_standing(self) -> pd.DataFrame:
+        return self._first_class_standing
+
+    def sorted_by_priority(self) -> pd.DataFrame:
+        if self._time_priority_options.prefer_time:  # 오직 시간만을
+            all_df = pd.concat([self.standard, self.standard_standing, self.first_class, self.first_class_standing],
+                               axis=0)
+            if self._time_priority_options.best_datetime:  # 오직 베스트 타임과 가까울수록
+                return self._sort_by_best_time(all_df)
+            else:  # 객실 유형 무시하고 오름차순 or 내림차순으로만 정렬
+                return all_df.sort_values("time", ascending=self._time_priority_options.ascendig)
+        else:  # 객실 유형별로 시간정렬 한 후에 객실 유형 우선순위맞춰서 합쳐야함
+            tickets_list: list[pd.DataFrame] = [getattr(self, p) for p in self._class_priority_options]
+            if self._time_priority_options.best_datetime:
+                for ticket in tickets_list:
+                    ticket = self._sort_by_best_time(ticket)
+                return pd.concat(tickets_list, axis=0).drop(columns=["time_diff"])
+            else:
+                all_df = pd.concat(tickets_list, axis=0)
+                all_df.sort_values("time", ascending=self._time_priority_options.ascendig)
+                return all_df
+
+    def _sort_by_best_time(self, df: pd.DataFrame) -> pd.DataFrame:
+        if df.empty:
+            return df
+        df["time_diff"] = df["time"].apply(lambda t: t - self._time_priority_options.best_datetime)
+        df = df.iloc[(df['time_diff'].abs()).argsort()]
+        df = df.drop(columns=["time_diff"])
+        return df
+
+
+def measure(ticket_cls, rows, class_priority_options, time_priority_options, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ticket = ticket_cls(rows, class_priority_options, time_priority_options)
+        if not ticket.is_empty():
+            ticket.sorted_by_priority()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", UserWarning)  # 기존 구현의 boolean reindex 경고
+
+    rows = to_ticket_cells(random_rows(args.rows))
+    time_priority_options = TimePriorityOptions(min_datetime=datetime.datetime.now().replace(hour=0, minute=0))
+    class_priority_options = ClassPriorityOptions(allow_standing=True)
+    for name, ticket_cls in [("pandas", LegacyTicket), ("slots", Ticket)]:
+        samples = measure(ticket_cls, rows, class_priority_options, time_priority_options, args.repeat)
+        print(f"{name:>7}: p50 {statistics.median(samples):9.1f} us  "
+              f"p99 {statistics.quantiles(samples, n=100)[98]:9.1f} us per poll")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import datetime
+import statistics
+import threading
+import time
+
+from app.auto_reserver import AutoReserver
+from app.jobs import create_driver
+from benchmarks.stand_in_server import SeatChurn, StandInServer, replay_rows
+from page_object import pages
+from page_object.custom_types import (ClassPriorityOptions, PassengerOptions, PriorityOptions, SeatAttribute,
+                                      SeatLocation, SeatOptions, TimePriorityOptions)
+from page_object.http_poller import HttpPoller
+from page_object.polling import PollingPolicy, PollingScheduler
+from page_object.tracing import instrument_driver
+
+ACCOUNT_ID = "0000000000"
+
+
+def _run_kwargs() -> dict:
+    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+    min_datetime = datetime.datetime.combine(tomorrow, datetime.time(5, 0))
+    max_datetime = datetime.datetime.combine(tomorrow, datetime.time(15, 0))
+    return {
+        "departure": "수서",
+        "destination": "부산",
+        "min_datetime": min_datetime,
+        "max_datetime": max_datetime,
+        "passenger_options": PassengerOptions(adult=1, elder=0, child=0, severe_disabled=0, mild_disabled=0),
+        "seat_options": SeatOptions(SeatLocation.default, SeatAttribute.default),
+        "priority_options": PriorityOptions(ClassPriorityOptions(),
+                                            TimePriorityOptions(min_datetime=min_datetime, max_datetime=max_datetime)),
+    }
+
+
+def _run_time_table(driver, server: StandInServer, kwargs: dict, polling_scheduler: PollingScheduler,
+                    stop_event: threading.Event, use_http_poller: bool, fast_checkout: bool) -> tuple[bool, float]:
+    # 로그인/조회 단계는 시간에서 빼고 TimeTablePage.run 만 잰다
+    pages.LoginPage(driver, pages.rebase_url(pages.SRT_LOGIN_PAGE_URL, server.url)).login(ACCOUNT_ID, "pw")
+    select_page = pages.SelectSchedulePage(driver, pages.rebase_url(pages.SRT_SELECT_SCHEDULE_PAGE_URL, server.url))
+    select_page.enter_region(kwargs["departure"], kwargs["destination"])
+    select_page.select_date_time(kwargs["min_datetime"])
+    select_page.select_passenger(kwargs["passenger_options"])
+    select_page.search()
+    priority_options = kwargs["priority_options"]
+    http_poller = HttpPoller.from_driver(driver) if use_http_poller else None
+    time_table_page = pages.TimeTablePage(driver, pages.rebase_url(pages.SRT_TICKETING_PAGE_URL, server.url),
+                                          fast_checkout=fast_checkout)
+    started = time.perf_counter()
+    is_success = time_table_page.run(priority_options.class_priority_option, priority_options.time_priority_option,
+                                     http_poller=http_poller, stop_event=stop_event,
+                                     polling_scheduler=polling_scheduler)
+    return is_success, time.perf_counter() - started
+
+
+def _summary(samples: list[float]) -> str:
+    if not samples:
+        return "-"
+    return f"p50 {statistics.median(samples) * 1000:.0f} ms  max {max(samples) * 1000:.0f} ms  (n={len(samples)})"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", choices=["auto-reserver", "time-table"], default="auto-reserver")
+    parser.add_argument("--http-poller", action="store_true", help="time-table 대상에서 HttpPoller 로 조회")
+    parser.add_argument("--click-checkout", action="store_true",
+                        help="time-table 대상에서 예약 링크를 클릭하고 예약 확인 페이지로 확인(이전 방식)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=0.5, help="조회 간격(초)")
+    parser.add_argument("--release-interval", type=float, default=5.0)
+    parser.add_argument("--hold", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--netfunnel", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    driver = instrument_driver(create_driver())
+    detect_latencies: list[float] = []
+    reserve_latencies: list[float] = []
+    try:
+        for run in range(args.runs):
+            rows = replay_rows(seed=run)
+            churn = SeatChurn(rows, args.release_interval, args.hold, seed=run)
+            server = StandInServer.replay(churn, rows, args.latency, args.netfunnel, seed=run).start()
+            stop_event = threading.Event()
+            timer = threading.Timer(args.timeout, stop_event.set)
+            timer.start()
+            kwargs = _run_kwargs()
+            polling_scheduler = PollingScheduler(PollingPolicy(interval_sec=args.interval),
+                                                 kwargs["priority_options"].time_priority_option)
+            try:
+                driver.delete_all_cookies()
+                if args.target == "auto-reserver":
+                    started = time.perf_counter()
+                    is_success = AutoReserver(driver, base_url=server.url).run(
+                        ACCOUNT_ID, "pw", **kwargs, stop_event=stop_event, polling_scheduler=polling_scheduler)
+                    elapsed = time.perf_counter() - started
+                else:
+                    is_success, elapsed = _run_time_table(driver, server, kwargs, polling_scheduler, stop_event,
+                                                          args.http_poller, not args.click_checkout)
+            finally:
+                timer.cancel()
+                server.stop()
+            detect_latencies.extend(churn.detect_latencies())
+            reserved = server.reservations[0] if server.reservations else None
+            if reserved is not None:
+                reserve_latencies.append(reserved.reserved_at - reserved.released_at)
+            print(f"run {run}: success={is_success}  {elapsed:.1f}s  polls {server.time_table_requests}"
+                  f" ({server.polls_per_sec():.1f}/s)  released {len(churn.releases)}"
+                  f"  failed clicks {server.failed_reservations}")
+    finally:
+        driver.quit()
+    print(f"time-to-detect:  {_summary(detect_latencies)}")
+    print(f"time-to-reserve: {_summary(reserve_latencies)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import datetime
+import random
+import statistics
+import time
+
+from benchmarks.fixtures import STATUSES, random_rows, to_ticket_cells
+from page_object.custom_types import (ClassPriorityOptions, PassengerOptions, SeatAttribute, SeatLocation,
+                                      SeatOptions, Ticket, TimePriorityOptions)
+from page_object.scoring import CandidateScorer
+
+MAX_CANDIDATES = 3
+
+
+def _tickets(rows: int, seed: int) -> Ticket:
+    rnd = random.Random(seed)
+    fixture = random_rows(rows, seed)
+    for row in fixture:
+        row.first_class, row.standard = rnd.choice(STATUSES), rnd.choice(STATUSES)
+    tomorrow = datetime.datetime.combine(datetime.date.today() + datetime.timedelta(days=1), datetime.time())
+    time_priority_options = TimePriorityOptions(min_datetime=tomorrow)
+    return Ticket(to_ticket_cells(fixture), ClassPriorityOptions(allow_standing=True), time_priority_options)
+
+
+def measure_rank(rows: int, repeat: int) -> tuple[list[float], list[float]]:
+    scorer = CandidateScorer.for_options(PassengerOptions(adult=3), SeatOptions(SeatLocation.default,
+                                                                                SeatAttribute.wheelchair))
+    ticket = _tickets(rows, 0)
+    ranked = ticket.sorted_by_priority()
+    for row in ranked[::3]:
+        scorer.record(row, False)
+    base_samples, scored_samples = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ranked = ticket.sorted_by_priority()
+        base_samples.append((time.perf_counter() - started) * 1e6)
+        scorer.rank(ranked)
+        scored_samples.append((time.perf_counter() - started) * 1e6)
+    return base_samples, scored_samples
+
+
+def simulate(snapshots: int, rows: int, infeasible_ratio: float, use_scorer: bool, seed: int = 0) -> dict:
+    # 열차마다 실제로 예약될 확률이 다르다(일행 전체/휠체어석을 못 채우는 열차는 거의 항상 실패).
+    # 스냅샷마다 순위대로 최대 MAX_CANDIDATES 개를 눌러, 성공하기까지 버린 클릭 수를 센다
+    rnd = random.Random(seed)
+    scorer = CandidateScorer(passenger_count=3, special_seat=True) if use_scorer else None
+    success_rate: dict[tuple, float] = {}
+    wasted, reserved = [], 0
+    for snapshot in range(snapshots):
+        ranked = _tickets(rows, snapshot % 20).sorted_by_priority()
+        if scorer is not None:
+            ranked = scorer.rank(ranked)
+        failed = 0
+        for row in ranked[:MAX_CANDIDATES]:
+            key = (row.time, row.seat_class.removesuffix("_standing"))
+            if key not in success_rate:
+                success_rate[key] = 0.02 if rnd.random() < infeasible_ratio else 0.6
+            success = rnd.random() < success_rate[key]
+            if scorer is not None:
+                scorer.record(row, success)
+            if success:
+                reserved += 1
+                break
+            failed += 1
+        wasted.append(failed)
+    return {"wasted": statistics.mean(wasted), "reserved": reserved / snapshots}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--snapshots", type=int, default=2000)
+    parser.add_argument("--infeasible", type=float, default=0.5, help="조건상 거의 잡을 수 없는 열차/객실 비율")
+    args = parser.parse_args()
+
+    base_samples, scored_samples = measure_rank(args.rows, args.repeat)
+    print(f"rank: sorted_by_priority p50 {statistics.median(base_samples):.1f} us, "
+          f"+ scorer p50 {statistics.median(scored_samples):.1f} us ({args.rows} rows)")
+    for name, use_scorer in [("priority only", False), ("with scorer", True)]:
+        result = simulate(args.snapshots, args.rows, args.infeasible, use_scorer)
+        print(f"{name:>13}: {result['wasted']:.2f} failed clicks per snapshot, "
+              f"reserved in {result['reserved'] * 100:.0f}% of snapshots")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import datetime
+import statistics
+import time
+from dataclasses import fields
+
+from fastapi.testclient import TestClient
+
+import main as web
+from app.jobs import JobScheduler
+from app.options import ReserverOptions
+from app.schemas import ReservationRequest
+from page_object.custom_types import DISABLE, ClassPriorityOptions
+
+
+class QueueOnlyScheduler(JobScheduler):
+    # 브라우저 워커를 띄우지 않고 큐에 넣는 데까지만 잰다
+    def _dispatch(self):
+        pass
+
+
+def _payload() -> dict:
+    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+    return {
+        "id": "0000000000",
+        "password": "pw",
+        "departure": "수서",
+        "destination": "부산",
+        "min_time": f"{tomorrow}T05:00",
+        "max_time": f"{tomorrow}T15:00",
+        "best_time": f"{tomorrow}T09:00",
+        "adult_count": 2,
+        "seat": "특실",
+        "alternate_routes": [{"departure": "동탄", "destination": "부산", "weight": 0.8}],
+    }
+
+
+def _reflected_order(class_priority_options: ClassPriorityOptions) -> list[str]:
+    # 이전 __iter__: 조회마다 dataclasses.fields 로 다시 계산
+    priorities = {field.name: getattr(class_priority_options, field.name) for field in fields(class_priority_options)
+                  if field.name != "allow_standing"}
+    filtered_priorities = {name: value for name, value in priorities.items() if value != DISABLE}
+    return [name for name, _ in sorted(filtered_priorities.items(), key=lambda item: item[1], reverse=True)]
+
+
+def _measure(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def _report(name: str, samples: list[float]):
+    print(f"{name:>22}: p50 {statistics.median(samples):9.1f} us  "
+          f"p99 {statistics.quantiles(samples, n=100)[98]:9.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = _payload()
+    web.scheduler = QueueOnlyScheduler()
+    client = TestClient(web.app)
+    _report("POST /reservations", _measure(lambda: client.post("/reservations", json=payload), args.repeat))
+    _report("validate + options",
+            _measure(lambda: ReserverOptions.from_request(ReservationRequest.model_validate(payload)), args.repeat))
+
+    class_priority_options = ClassPriorityOptions(allow_standing=True)
+    _report("priority (reflection)", _measure(lambda: _reflected_order(class_priority_options), args.repeat))
+    _report("priority (cached)", _measure(lambda: list(class_priority_options), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import datetime
+import pathlib
+import tempfile
+import time
+
+from selenium.webdriver import Chrome
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from benchmarks.fixtures import random_rows, render_time_table_page
+from page_object.custom_types import (ClassPriorityOptions, Ticket, TicketCell, TimePriorityOptions,
+                                      extract_time_table)
+
+
+class CommandCounter:
+    def __init__(self, driver: Chrome):
+        self.count = 0
+        self._execute = driver.execute
+        driver.execute = self._counting_execute
+
+    def _counting_execute(self, *args, **kwargs):
+        self.count += 1
+        return self._execute(*args, **kwargs)
+
+
+def legacy_extract(table_elem: WebElement) -> list[list[TicketCell]]:
+    # 기존 방식: 행마다 find_elements, 셀마다 .text
+    rows = []
+    for row in table_elem.find_elements(By.TAG_NAME, "tr"):
+        cells = row.find_elements(By.TAG_NAME, "td")
+        row_cells = [TicketCell("") for _ in cells]
+        row_cells[Ticket.DEP_IDX] = TicketCell(cells[Ticket.DEP_IDX].text)
+        for idx in (Ticket.FIRST_CLS_IDX, Ticket.STANDARD_CLS_IDX):
+            # _split_by_class 에서 상태 텍스트를 다시 읽던 호출까지 포함
+            row_cells[idx] = TicketCell(cells[idx].text, cells[idx])
+            _ = cells[idx].text
+        rows.append(row_cells)
+    return rows
+
+
+def single_round_trip(table_elem: WebElement) -> list[list[TicketCell]]:
+    return extract_time_table(table_elem, [Ticket.FIRST_CLS_IDX, Ticket.STANDARD_CLS_IDX])
+
+
+def measure(driver: Chrome, counter: CommandCounter, extract, polls: int) -> tuple[float, float]:
+    class_priority_options = ClassPriorityOptions()
+    time_priority_options = TimePriorityOptions(min_datetime=datetime.datetime.now().replace(hour=0, minute=0))
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(polls):
+        table_elem = driver.find_element(By.XPATH, "//tbody")
+        Ticket(extract(table_elem), class_priority_options, time_priority_options)
+    elapsed = time.perf_counter() - started
+    return counter.count / polls, elapsed / polls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    options = Options()
+    options.add_argument("--headless=new")
+    driver = Chrome(options=options)
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            page = pathlib.Path(tmp_dir) / "time_table.html"
+            page.write_text(render_time_table_page(random_rows(args.rows)), encoding="utf-8")
+            driver.get(page.as_uri())
+            counter = CommandCounter(driver)
+
+            for name, extract in [("legacy", legacy_extract), ("execute_script", single_round_trip)]:
+                round_trips, ms = measure(driver, counter, extract, args.polls)
+                print(f"{name:>15}: {round_trips:7.1f} round trips/poll  {ms:8.2f} ms/poll")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
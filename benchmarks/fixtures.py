@@ -0,0 +1,95 @@
+import datetime
+import random
+from dataclasses import dataclass
+from html import escape
+
+from page_object.custom_types import Ticket, TicketCell
+
+STATUSES = ["예약하기", "매진", "매진", "매진", "좌석부족", "입석+좌석"]
+
+
+@dataclass
+class FixtureRow:
+    train_no: int
+    departure: str
+    destination: str
+    dep_time: datetime.time
+    arr_time: datetime.time
+    first_class: str
+    standard: str
+
+
+def random_rows(count: int = 30, seed: int = 0, departure: str = "수서", destination: str = "부산",
+                start: datetime.time = datetime.time(5, 0)) -> list[FixtureRow]:
+    rnd = random.Random(seed)
+    base = datetime.datetime.combine(datetime.date.today(), start)
+    rows = []
+    for i in range(count):
+        dep = base + datetime.timedelta(minutes=20 * i)
+        arr = dep + datetime.timedelta(hours=2, minutes=30)
+        rows.append(FixtureRow(301 + 2 * i, departure, destination, dep.time(), arr.time(),
+                               rnd.choice(STATUSES), rnd.choice(STATUSES)))
+    return rows
+
+
+def _status_cell(status: str, row_idx: int, cls_name: str) -> str:
+    return (f'<td><a href="javascript:void(0);" class="btn_small val_m wx90" '
+            f'onclick="requestReservationInfo(this, {row_idx}, \'{cls_name}\'); return false;">'
+            f'<span>{escape(status)}</span></a></td>')
+
+
+def render_time_table_rows(rows: list[FixtureRow]) -> str:
+    body = []
+    for idx, row in enumerate(rows):
+        body.append(
+            "<tr>"
+            f"<td>{idx + 1}</td>"
+            "<td><div class=\"trnNo\">SRT</div></td>"
+            f"<td>{row.train_no}</td>"
+            f"<td><div class=\"val_m wx90\">{escape(row.departure)}</div>"
+            f"<em class=\"time\">{row.dep_time:%H:%M}</em></td>"
+            f"<td><div class=\"val_m wx90\">{escape(row.destination)}</div>"
+            f"<em class=\"time\">{row.arr_time:%H:%M}</em></td>"
+            f"{_status_cell(row.first_class, idx, 'first_class')}"
+            f"{_status_cell(row.standard, idx, 'standard')}"
+            "<td>-</td>"
+            "<td>SRT</td>"
+            "<td>2시간 30분</td>"
+            "</tr>"
+        )
+    return "\n".join(body)
+
+
+def render_time_table_page(rows: list[FixtureRow]) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="UTF-8"><title>일반승차권 조회</title></head>
+<body>
+<div id="search_top_tag"><input type="button" value="조회하기"></div>
+<div class="tbl_wrap th_thead">
+<table>
+<thead><tr>
+<th>구분</th><th>열차종류</th><th>열차번호</th><th>출발역</th><th>도착역</th>
+<th>특실</th><th>일반실</th><th>예약대기</th><th>차량유형/편성정보</th><th>소요시간</th>
+</tr></thead>
+<tbody>
+{render_time_table_rows(rows)}
+</tbody>
+</table>
+</div>
+</body>
+</html>
+"""
+
+
+def to_ticket_cells(rows: list[FixtureRow]) -> list[list[TicketCell]]:
+    cells_rows = []
+    for row in rows:
+        cells = [TicketCell("") for _ in range(10)]
+        cells[Ticket.TRAIN_NO_IDX] = TicketCell(str(row.train_no))
+        cells[Ticket.DEP_IDX] = TicketCell(f"{row.departure}\n{row.dep_time:%H:%M}")
+        cells[Ticket.ARR_IDX] = TicketCell(f"{row.destination}\n{row.arr_time:%H:%M}")
+        cells[Ticket.FIRST_CLS_IDX] = TicketCell(row.first_class)
+        cells[Ticket.STANDARD_CLS_IDX] = TicketCell(row.standard)
+        cells_rows.append(cells)
+    return cells_rows
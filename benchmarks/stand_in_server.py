@@ -0,0 +1,415 @@
+import argparse
+import dataclasses
+import datetime
+import itertools
+import pathlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import FixtureRow, random_rows, render_time_table_page, render_time_table_rows
+from page_object.custom_types import SOLD_OUT
+from page_object.pages import SRT_LOGIN_PAGE_URL, SRT_SELECT_SCHEDULE_PAGE_URL, SRT_TICKETING_PAGE_URL
+
+LOGIN_PATH = urlsplit(SRT_LOGIN_PAGE_URL).path
+LOGIN_PROC_PATH = "/cmc/01/loginProc.do"
+SCHEDULE_PATH = urlsplit(SRT_SELECT_SCHEDULE_PAGE_URL).path
+RESERVE_PATH = "/hpg/hra/01/requestReservationInfo.do"
+TICKETING_PATH = urlsplit(SRT_TICKETING_PAGE_URL).path
+
+AVAILABLE = "예약하기"
+CLASS_NAMES = ("first_class", "standard")
+DEFAULT_SESSION = "stand-in"
+WEEKDAYS = "월화수목금토일"
+
+
+@dataclass
+class SeatRelease:
+    row_idx: int
+    cls_name: str
+    released_at: float
+    expires_at: float
+    first_served_at: float | None = None
+    reserved_at: float | None = None
+    account: str | None = None
+
+    def is_open(self, now: float) -> bool:
+        return self.reserved_at is None and self.released_at <= now < self.expires_at
+
+
+class SeatChurn:
+    # 모든 좌석이 매진인 시간표에서 평균 release_interval_sec 마다 한 자리가 풀렸다가 hold_sec 뒤 다시 사라진다
+
+    def __init__(self, rows: list[FixtureRow], release_interval_sec: float = 2.0, hold_sec: float = 1.5,
+                 seed: int = 0):
+        self._rows = [dataclasses.replace(row, first_class=SOLD_OUT, standard=SOLD_OUT) for row in rows]
+        self._release_interval_sec = release_interval_sec
+        self._hold_sec = hold_sec
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self._next_release_at = self.started_at + self._rng.expovariate(1 / release_interval_sec)
+        self.releases: list[SeatRelease] = []
+
+    def _advance(self, now: float):
+        while self._next_release_at <= now:
+            at = self._next_release_at
+            self.releases.append(SeatRelease(self._rng.randrange(len(self._rows)), self._rng.choice(CLASS_NAMES),
+                                             at, at + self._hold_sec))
+            self._next_release_at += self._rng.expovariate(1 / self._release_interval_sec)
+
+    def render_rows(self) -> str:
+        with self._lock:
+            now = time.perf_counter()
+            self._advance(now)
+            rows = [dataclasses.replace(row) for row in self._rows]
+            for release in self.releases:
+                if release.is_open(now):
+                    setattr(rows[release.row_idx], release.cls_name, AVAILABLE)
+                    if release.first_served_at is None:
+                        release.first_served_at = now
+        return render_time_table_rows(rows)
+
+    def reserve(self, row_idx: int, cls_name: str, account: str | None = None) -> SeatRelease | None:
+        with self._lock:
+            now = time.perf_counter()
+            self._advance(now)
+            for release in self.releases:
+                if release.row_idx == row_idx and release.cls_name == cls_name and release.is_open(now):
+                    release.reserved_at = now
+                    release.account = account
+                    return release
+        return None
+
+    def detect_latencies(self) -> list[float]:
+        return [release.first_served_at - release.released_at
+                for release in self.releases if release.first_served_at is not None]
+
+
+# 실제 페이지처럼 매 화면이 끌어오는 정적 자원: (Content-Type, 크기, Cache-Control).
+# 회전 배너와 분석 스크립트는 캐시되지 않는다
+FONT_PATH = "/fonts/NotoSansKR-Regular.woff2"
+ASSETS = {
+    "/css/common.css": ("text/css", 60_000, "max-age=86400"),
+    "/js/common.js": ("application/javascript", 150_000, "max-age=86400"),
+    FONT_PATH: ("font/woff2", 400_000, "max-age=86400"),
+    "/images/main_banner.jpg": ("image/jpeg", 200_000, "no-store"),
+    "/gtag/js": ("application/javascript", 90_000, "no-store"),
+}
+
+
+def _asset_body(path: str, size: int) -> bytes:
+    if path.endswith(".css"):
+        head = (f"@font-face {{ font-family: NotoSansKR; src: url({FONT_PATH}); }}\n"
+                "body { font-family: NotoSansKR; }\n")
+        return (head + "/*" + "x" * (size - len(head) - 4) + "*/").encode()
+    if path.startswith("/js/") or path.startswith("/gtag/"):
+        return ("//" + "x" * (size - 2)).encode()
+    return bytes(size)
+
+
+def _page(title: str, body: str, script: str = "") -> str:
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="UTF-8"><title>{escape(title)}</title>
+<link rel="stylesheet" href="/css/common.css">
+<script src="/js/common.js"></script>
+<script async src="/gtag/js?id=G-REPLAY"></script>
+</head>
+<body>
+<img src="/images/main_banner.jpg" alt="">
+{body}
+<script>{script}</script>
+</body>
+</html>
+"""
+
+
+def _login_page() -> str:
+    return _page("로그인", f"""<form method="post" action="{LOGIN_PROC_PATH}">
+<fieldset>
+<div><input type="text" id="srchDvNm01" name="srchDvNm01"></div>
+<div><input type="password" id="hmpgPwdCphd01" name="hmpgPwdCphd01"></div>
+<div><input type="submit" class="loginSubmit" value="확인"></div>
+</fieldset>
+</form>""")
+
+
+def _select(name: str, title: str, options: list[tuple[str, str]], selected: str | None) -> str:
+    items = "".join(f'<option value="{escape(value)}"{" selected" if value == selected else ""}>{escape(text)}</option>'
+                    for value, text in options)
+    return f'<select id="{name}" name="{name}" title="{escape(title)}">{items}</select>'
+
+
+def _search_form(form: dict[str, str], netfunnel_ms: int) -> str:
+    today = datetime.date.today()
+    dates = [today + datetime.timedelta(days=days) for days in range(30)]
+    date_options = [(f"{date:%Y%m%d}", f"{date:%Y/%m/%d}({WEEKDAYS[date.weekday()]})") for date in dates]
+    time_options = [(f"{hour:02d}0000", f"{hour:02d}") for hour in range(0, 24, 2)]
+    count_options = [(str(count), f"{count}명") for count in range(10)]
+    selects = [
+        _select("dptDt", "출발일", date_options, form.get("dptDt")),
+        _select("dptTm", "출발시간", time_options, form.get("dptTm")),
+        _select("psgInfoPerPrnb1", "어른 인원수 선택", count_options, form.get("psgInfoPerPrnb1", "1")),
+        _select("psgInfoPerPrnb5", "어린이 인원수 선택", count_options, form.get("psgInfoPerPrnb5")),
+        _select("psgInfoPerPrnb4", "경로 인원수 선택", count_options, form.get("psgInfoPerPrnb4")),
+        _select("psgInfoPerPrnb2", "중증장애인 인원수 선택", count_options, form.get("psgInfoPerPrnb2")),
+        _select("psgInfoPerPrnb3", "경증장애인 인원수 선택", count_options, form.get("psgInfoPerPrnb3")),
+        _select("locSeatAttCd1", "좌석위치 선택",
+                [("000", "기본"), ("011", "1인석"), ("012", "창측좌석"), ("013", "내측좌석")],
+                form.get("locSeatAttCd1")),
+        _select("rqSeatAttCd1", "좌석속성 선택",
+                [("000", "선택"), ("015", "일반"), ("021", "휠체어"), ("028", "전동휠체어")],
+                form.get("rqSeatAttCd1", "015")),
+    ]
+    return f"""<div id="NetFunnel_Loading_Popup" style="display:none">서비스 접속 대기 중입니다.</div>
+<form id="search-form" method="post" action="{SCHEDULE_PATH}" onsubmit="return netFunnel(this);">
+<input type="text" id="dptRsStnCdNm" name="dptRsStnCdNm" value="{escape(form.get("dptRsStnCdNm", ""))}">
+<input type="text" id="arvRsStnCdNm" name="arvRsStnCdNm" value="{escape(form.get("arvRsStnCdNm", ""))}">
+{"".join(selects)}
+<div id="search_top_tag"><input type="submit" value="조회하기"></div>
+</form>
+<script>
+function netFunnel(form) {{
+    var popup = document.getElementById("NetFunnel_Loading_Popup");
+    popup.style.display = "block";
+    setTimeout(function () {{ form.submit(); }}, {netfunnel_ms});
+    return false;
+}}
+</script>"""
+
+
+def _time_table_page(form: dict[str, str], rows_html: str, netfunnel_ms: int) -> str:
+    return _page("일반승차권 조회", f"""{_search_form(form, netfunnel_ms)}
+<div class="tbl_wrap th_thead">
+<table>
+<thead><tr>
+<th>구분</th><th>열차종류</th><th>열차번호</th><th>출발역</th><th>도착역</th>
+<th>특실</th><th>일반실</th><th>예약대기</th><th>차량유형/편성정보</th><th>소요시간</th>
+</tr></thead>
+<tbody>
+{rows_html}
+</tbody>
+</table>
+</div>
+<form id="reserve-form" method="post" action="{RESERVE_PATH}">
+<input type="hidden" name="row"><input type="hidden" name="cls">
+</form>""", """
+function requestReservationInfo(elem, rowIdx, clsName) {
+    var form = document.getElementById("reserve-form");
+    form.elements.row.value = rowIdx;
+    form.elements.cls.value = clsName;
+    form.submit();
+}""")
+
+
+def _ticketing_page(reservations: list[SeatRelease], rows: list[FixtureRow]) -> str:
+    # 예약 내역이 없을 때만 두 번째 div(안내 문구)가 생긴다. TicketingPage.validate 가 이것으로 판단한다
+    if not reservations:
+        return _page("예약확인", """<form id="list-form"><fieldset>
+<div class="tal_c">예약 내역</div>
+<div class="tal_c">예약하신 내역이 없습니다.</div>
+</fieldset></form>""")
+    items = "".join(f"<li>{rows[release.row_idx].train_no} {release.cls_name}</li>" for release in reservations)
+    return _page("예약확인", f"""<form id="list-form"><fieldset>
+<div class="tal_c"><ul>{items}</ul></div>
+</fieldset></form>""")
+
+
+class StandInServer:
+    # 로컬 SRT 대역 서버. 두 가지로 띄운다.
+    # - 페이지 모드(StandInServer(pages)): 어느 요청에나 녹화된(또는 합성한) 시간표 페이지를 돌려가며 응답한다
+    # - 재현 모드(StandInServer.replay(churn, rows)): 로그인 -> 조회 -> 시간표 -> 예약 -> 예약확인 흐름을 흉내낸다.
+    #   로그인한 회원번호를 세션 쿠키로 삼아 계정마다 예약 내역을 따로 보여준다
+
+    def __init__(self, pages: list[str] | None = None, churn: SeatChurn | None = None,
+                 rows: list[FixtureRow] | None = None, latency_sec: float = 0.0, netfunnel_sec: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        if (pages is None) == (churn is None):
+            raise ValueError("give either pages or churn")
+        self._pages = itertools.cycle(pages) if pages is not None else None
+        self.churn = churn
+        self._rows = rows or []
+        self._latency_sec = latency_sec
+        self._netfunnel_sec = netfunnel_sec
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.time_table_requests = 0
+        self.first_time_table_at: float | None = None
+        self.last_time_table_at: float | None = None
+        self.reservations: list[SeatRelease] = []
+        self.failed_reservations = 0
+        self.bytes_sent: dict[str, int] = {"html": 0, "asset": 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def replay(cls, churn: SeatChurn, rows: list[FixtureRow], latency_sec: float = 0.0, netfunnel_sec: float = 0.0,
+               host: str = "127.0.0.1", port: int = 0, seed: int = 0) -> "StandInServer":
+        return cls(churn=churn, rows=rows, latency_sec=latency_sec, netfunnel_sec=netfunnel_sec, host=host,
+                   port=port, seed=seed)
+
+    def count_bytes(self, kind: str, size: int):
+        with self._lock:
+            self.bytes_sent[kind] += size
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def schedule_url(self) -> str:
+        return self.url + SCHEDULE_PATH
+
+    def polls_per_sec(self) -> float:
+        if self.first_time_table_at is None or self.last_time_table_at == self.first_time_table_at:
+            return 0.0
+        return (self.time_table_requests - 1) / (self.last_time_table_at - self.first_time_table_at)
+
+    def _netfunnel_ms(self) -> int:
+        return int(self._netfunnel_sec * self._rng.uniform(0.5, 1.5) * 1000)
+
+    def _latency(self):
+        if self._latency_sec:
+            time.sleep(self._latency_sec * self._rng.uniform(0.5, 1.5))
+
+    def _count_time_table(self):
+        now = time.perf_counter()
+        with self._lock:
+            self.time_table_requests += 1
+            if self.first_time_table_at is None:
+                self.first_time_table_at = now
+            self.last_time_table_at = now
+
+    def next_page(self) -> str:
+        self._count_time_table()
+        with self._lock:
+            return next(self._pages)
+
+    def _time_table(self, form: dict[str, str]) -> str:
+        rows_html = self.churn.render_rows()
+        self._count_time_table()
+        return _time_table_page(form, rows_html, self._netfunnel_ms())
+
+    def _reserve(self, query: dict[str, str], session: str) -> str:
+        release = self.churn.reserve(int(query.get("row", -1)), query.get("cls", ""), session)
+        with self._lock:
+            if release is None:
+                self.failed_reservations += 1
+                return _page("예약", "", 'alert("잔여석없음. 다른 열차를 선택하여 주십시오.");')
+            self.reservations.append(release)
+        return _page("예약", "<div>예약이 완료되었습니다.</div>")
+
+    def handle(self, method: str, path: str, form: dict[str, str], session: str = DEFAULT_SESSION) -> str:
+        if self._pages is not None:
+            return self.next_page()
+        if path == LOGIN_PATH:
+            return _login_page()
+        if path == LOGIN_PROC_PATH:
+            return _page("메인", "<div>로그인 되었습니다.</div>")
+        if path == SCHEDULE_PATH:
+            if method == "POST":
+                return self._time_table(form)
+            return _page("일반승차권 조회", _search_form(form, self._netfunnel_ms()))
+        if path == RESERVE_PATH:
+            return self._reserve(form, session)
+        if path == TICKETING_PATH:
+            with self._lock:
+                reservations = [release for release in self.reservations if release.account == session]
+            return _ticketing_page(reservations, self._rows)
+        return _page("없음", "<div>404</div>")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                self._dispatch("GET", parts.path, parts.query)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+                self._dispatch("POST", urlsplit(self.path).path, body)
+
+            def _dispatch(self, method: str, path: str, query: str):
+                if path in ASSETS:
+                    content_type, size, cache_control = ASSETS[path]
+                    self._send(_asset_body(path, size), content_type, {"Cache-Control": cache_control})
+                    server.count_bytes("asset", size)
+                    return
+                form = {key: values[-1] for key, values in parse_qs(query, keep_blank_values=True).items()}
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                session = cookie["JSESSIONID"].value if "JSESSIONID" in cookie else DEFAULT_SESSION
+                if path == LOGIN_PROC_PATH:
+                    session = form.get("srchDvNm01") or DEFAULT_SESSION
+                server._latency()
+                body = server.handle(method, path, form, session).encode("utf-8")
+                self._send(body, "text/html; charset=utf-8", {"Set-Cookie": f"JSESSIONID={session}; Path=/"})
+                server.count_bytes("html", len(body))
+
+            def _send(self, body: bytes, content_type: str, headers: dict[str, str]):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def replay_rows(count: int = 30, seed: int = 0) -> list[FixtureRow]:
+    # 출발 20분 전 마감에 걸리지 않도록 내일 05시부터 20분 간격 열차
+    return random_rows(count=count, seed=seed, start=datetime.time(5, 0))
+
+
+def load_pages(record_dir: pathlib.Path | None, count: int = 10) -> list[str]:
+    if record_dir is not None:
+        return [path.read_text(encoding="utf-8") for path in sorted(record_dir.glob("*.html"))]
+    return [render_time_table_page(random_rows(seed=seed)) for seed in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--record-dir", type=pathlib.Path, default=None, help="페이지 모드로 돌려줄 녹화 페이지")
+    parser.add_argument("--replay", action="store_true", help="로그인부터 예약까지 흐름을 흉내낸다")
+    parser.add_argument("--release-interval", type=float, default=2.0)
+    parser.add_argument("--hold", type=float, default=1.5)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--netfunnel", type=float, default=0.0)
+    args = parser.parse_args()
+    if args.replay:
+        rows = replay_rows()
+        server = StandInServer.replay(SeatChurn(rows, args.release_interval, args.hold), rows, args.latency,
+                                      args.netfunnel, port=args.port)
+    else:
+        server = StandInServer(load_pages(args.record_dir), latency_sec=args.latency, port=args.port)
+    print(f"serving {server.url}")
+    server._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
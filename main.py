@@ -1,56 +1,133 @@
-from fastapi import FastAPI, Form
+import asyncio
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import TYPE_CHECKING
+
+from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import HTMLResponse
+from pydantic import ValidationError
+from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
 from starlette.requests import Request
-from starlette.templating import Jinja2Templates
 
-app = FastAPI()
+from app.job_store import job_store_key, job_store_path
+from app.job_events import JobEvent
+from app.jobs import FINISHED_STATUSES, JobScheduler, ReservationJob
+from app.options import ReserverOptions
+from app.schemas import ReservationRequest
+from page_object.tracing import TraceMetrics, trace_dir
+
+if TYPE_CHECKING:
+    from starlette.templating import Jinja2Templates
+
+scheduler = JobScheduler(job_store_path=job_store_path(), job_store_key=job_store_key())
+trace_metrics = TraceMetrics(trace_dir())
+EVENT_KEEPALIVE_SEC = 15
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler.start()
+    yield
+    scheduler.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+
+
+@cache
+def templates() -> "Jinja2Templates":
+    # jinja2 는 화면을 처음 그릴 때 읽는다
+    from starlette.templating import Jinja2Templates
+    return Jinja2Templates(directory="templates")
 
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates().TemplateResponse("index.html", {"request": request})
 
 
 @app.post("/submit", response_class=HTMLResponse)
-async def submit_form(
-    request: Request,
-    id: str = Form(...),
-    password: str = Form(...),
-    departure: str = Form(...),
-    destination: str = Form(...),
-    min_time: str = Form(...),
-    max_time: str = Form(...),
-    best_time: str = Form(None),
-    route: str = Form(...),
-    adult_count: str = Form(...),
-    child_count: str = Form(...),
-    elder_count: str = Form(...),
-    severe_disabled_count: str = Form(...),
-    mild_disabled_count: str = Form(...),
-    seat: str = Form(...),
-    train_type: str = Form(...)
-):
-    context = {
-        "departure": departure,
-        "destination": destination,
-        "min_time": min_time,
-        "max_time": max_time,
-        "best_time": best_time,
-        "route": route,
-        "adult_count": adult_count,
-        "child_count": child_count,
-        "elder_count": elder_count,
-        "severe_disabled_count": severe_disabled_count,
-        "mild_disabled_count": mild_disabled_count,
-        "seat": seat,
-        "train_type": train_type
-    }
-
-    return templates.TemplateResponse("result.html", {"request": request, **context})
+async def submit_form(request: Request):
+    form = await request.form()
+    try:
+        reservation = ReservationRequest.model_validate(dict(form))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=_without_input(e.errors()))
+    job = _submit(reservation)
+    return templates().TemplateResponse("result.html", {"request": request, "job": job.to_dict(),
+                                                        **reservation.context()})
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    # 기본 응답은 요청 본문(비밀번호 포함)을 그대로 돌려주므로 input 을 뺀다
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(_without_input(exc.errors()))})
+
+
+def _without_input(errors) -> list[dict]:
+    return [{key: value for key, value in error.items() if key not in ("input", "ctx", "url")} for error in errors]
+
+
+@app.post("/reservations", status_code=201)
+async def create_reservation(reservation: ReservationRequest):
+    return _submit(reservation).to_dict()
+
+
+def _submit(reservation: ReservationRequest) -> ReservationJob:
+    try:
+        options = ReserverOptions.from_request(reservation)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return scheduler.submit(reservation.id, reservation.password, options)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    # 작업 진행 상황을 Server-Sent Events 로 보낸다. 첫 이벤트는 현재 상태이고 작업이 끝나면 스트림을 닫는다
+    job = scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    subscription = scheduler.events.subscribe(job_id)
+
+    async def stream():
+        with subscription:
+            event = JobEvent.of("status", job.to_dict())
+            while True:
+                yield event.text
+                if event.data["status"] in FINISHED_STATUSES:
+                    return
+                try:
+                    event = await asyncio.wait_for(subscription.get(), EVENT_KEEPALIVE_SEC)
+                except asyncio.TimeoutError:
+                    event = JobEvent("keepalive", {"status": None}, ": keepalive\n\n")
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    job = scheduler.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+
+@app.get("/metrics")
+def metrics():
+    return trace_metrics.snapshot()
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable
+
+import httpx
+from selenium.webdriver import Chrome
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from .tracing import WEBDRIVER_COMMANDS, WEBDRIVER_SEC, tracer
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+COMMAND_TIMEOUT_SEC = 120  # Selenium 클라이언트 기본값과 같다
+
+
+class AsyncWebElement:
+    def __init__(self, driver: "AsyncWebDriver", element_id: str):
+        self._driver = driver
+        self.id = element_id
+
+    def _command(self, command: str = "") -> str:
+        return f"/element/{self.id}{command}"
+
+    async def click(self):
+        await self._driver.execute("POST", self._command("/click"), {})
+
+    async def clear(self):
+        await self._driver.execute("POST", self._command("/clear"), {})
+
+    async def send_keys(self, text: str):
+        await self._driver.execute("POST", self._command("/value"), {"text": text, "value": list(text)})
+
+    async def text(self) -> str:
+        return await self._driver.execute("GET", self._command("/text"))
+
+    async def find_element(self, by: str, value: str) -> "AsyncWebElement":
+        return await self._driver.execute("POST", self._command("/element"), {"using": by, "value": value})
+
+
+def executor_url(driver: Chrome) -> str:
+    executor = driver.command_executor
+    client_config = getattr(executor, "client_config", None)  # selenium 4.24 부터
+    return client_config.remote_server_addr if client_config is not None else executor._url
+
+
+class AsyncWebDriver:
+    # chromedriver 에 W3C WebDriver 명령을 httpx 비동기 클라이언트로 보낸다. 세션마다 keep-alive 연결 하나를 쓰고
+    # 명령은 세션 안에서 순서대로 보낸다. 명령을 기다리는 동안 스레드를 잡지 않으므로 루프 하나가 여러 세션을 돌린다.
+    # 세션을 여닫는 일(브라우저/chromedriver 프로세스 관리)만 Selenium 에 맡기고, 오류는 Selenium 과 같은 예외로 바꾼다.
+    # 로케이터는 W3C 방식(xpath, css selector 등)만 쓴다
+
+    def __init__(self, driver: Chrome, owns_driver: bool = False, transport: httpx.AsyncBaseTransport | None = None):
+        self.driver = driver
+        self.session_id: str = driver.session_id
+        self._owns_driver = owns_driver
+        self._lock = asyncio.Lock()
+        self._error_handler = ErrorHandler()
+        self._client = httpx.AsyncClient(base_url=f"{executor_url(driver).rstrip('/')}/session/{self.session_id}",
+                                         timeout=COMMAND_TIMEOUT_SEC, transport=transport,
+                                         limits=httpx.Limits(max_connections=1, max_keepalive_connections=1))
+
+    @classmethod
+    def attach(cls, driver: Chrome) -> "AsyncWebDriver":
+        return cls(driver)
+
+    @classmethod
+    async def start(cls, driver_factory: Callable[[], Chrome]) -> "AsyncWebDriver":
+        # 예: AsyncWebDriver.start(partial(create_driver, LEAN_PROFILE))
+        # 프로세스를 띄우는 일은 한 번뿐이라 스레드에서 하고, 그 뒤 명령은 모두 이 클라이언트로 보낸다
+        return cls(await asyncio.to_thread(driver_factory), owns_driver=True)
+
+    async def quit(self):
+        try:
+            await self._client.aclose()
+        finally:
+            if self._owns_driver:
+                await asyncio.to_thread(self.driver.quit)
+
+    async def execute(self, method: str, command: str, payload: dict | None = None) -> Any:
+        started = time.perf_counter()
+        try:
+            async with self._lock:
+                response = await self._client.request(method, command, json=payload)
+        finally:
+            tracer.count(WEBDRIVER_COMMANDS)
+            tracer.count(WEBDRIVER_SEC, time.perf_counter() - started)
+        if response.status_code >= 400:
+            self._error_handler.check_response({"status": response.status_code, "value": response.text})
+        return self._unwrap(json.loads(response.text)["value"] if response.content else None)
+
+    def _unwrap(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value and len(value) == 1:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        return value
+
+    @staticmethod
+    def _wrap(value: Any) -> Any:
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [AsyncWebDriver._wrap(item) for item in value]
+        return value
+
+    async def get(self, url: str):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def back(self):
+        await self.execute("POST", "/back", {})
+
+    async def refresh(self):
+        await self.execute("POST", "/refresh", {})
+
+    async def current_url(self) -> str:
+        return await self.execute("GET", "/url")
+
+    async def implicitly_wait(self, seconds: float):
+        await self.execute("POST", "/timeouts", {"implicit": int(seconds * 1000)})
+
+    async def set_script_timeout(self, seconds: float):
+        await self.execute("POST", "/timeouts", {"script": int(seconds * 1000)})
+
+    async def find_element(self, by: str, value: str) -> AsyncWebElement:
+        return await self.execute("POST", "/element", {"using": by, "value": value})
+
+    async def find_elements(self, by: str, value: str) -> list[AsyncWebElement]:
+        return await self.execute("POST", "/elements", {"using": by, "value": value})
+
+    async def execute_script(self, script: str, *args) -> Any:
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": self._wrap(args)})
+
+    async def execute_async_script(self, script: str, *args) -> Any:
+        return await self.execute("POST", "/execute/async", {"script": script, "args": self._wrap(args)})
+
+    async def alert_text(self) -> str:
+        return await self.execute("GET", "/alert/text")
+
+    async def accept_alert(self):
+        await self.execute("POST", "/alert/accept", {})
@@ -0,0 +1,239 @@
+import asyncio
+import datetime
+import time
+from abc import ABC
+from dataclasses import fields
+from typing import Awaitable, Callable, get_args
+
+from selenium.common.exceptions import NoAlertPresentException, NoSuchElementException, WebDriverException
+
+from . import checkout
+from .async_driver import AsyncWebDriver, AsyncWebElement
+from .custom_types import (TIME_TABLE_EXTRACT_SCRIPT, ClassPriorityOptions, Passenger, PassengerOptions, Region,
+                           SeatAttribute, SeatLocation, Ticket, TicketCell, TicketRow, TimePriorityOptions)
+from .locators import Locator, record_locator_time
+from .polling import PollingPolicy, PollingScheduler
+from .tracing import POLL_SPAN, QUEUE_WAIT_SPAN, traced, tracer
+from .pages import (MARK_STALE_TIME_TABLE_SCRIPT, SRT_LOGIN_PAGE_URL, SRT_SELECT_SCHEDULE_PAGE_URL,
+                    SRT_TICKETING_PAGE_URL, TIME_TABLE_WAIT_TIME, WAIT_FOR_TIME_TABLE_SCRIPT, LoginPage,
+                    SelectSchedulePage, TicketingPage, TimeTablePage)
+
+SELECT_OPTIONS_SCRIPT = "return Array.prototype.map.call(arguments[0].options, function (o) { return o.text; });"
+SELECT_INDEX_SCRIPT = """
+arguments[0].selectedIndex = arguments[1];
+arguments[0].dispatchEvent(new Event("change", {bubbles: true}));
+"""
+
+
+async def wait_for_next_poll(polling_scheduler: PollingScheduler, stop_event: asyncio.Event | None = None):
+    delay = polling_scheduler.next_wait()
+    if stop_event is None:
+        await asyncio.sleep(delay)
+        return
+    try:
+        await asyncio.wait_for(stop_event.wait(), delay)
+    except asyncio.TimeoutError:
+        pass
+
+
+class AsyncBasePage(ABC):
+    def __init__(self, driver: AsyncWebDriver):
+        self._driver = driver
+        self._implicit_wait_set = False
+        self.last_queue_wait_sec: float | None = None
+
+    async def _prepare(self):
+        if not self._implicit_wait_set:
+            await self._driver.implicitly_wait(10)
+            await self._driver.set_script_timeout(TIME_TABLE_WAIT_TIME + 1)
+            self._implicit_wait_set = True
+
+    async def is_alert_present(self) -> bool:
+        try:
+            await self._driver.alert_text()
+            return True
+        except NoAlertPresentException:
+            return False
+
+    async def _find(self, locator: Locator) -> AsyncWebElement:
+        started = time.perf_counter()
+        elem = await self._driver.find_element(locator.by, locator.value)
+        record_locator_time(time.perf_counter() - started)
+        return elem
+
+    async def _select_options(self, locator: Locator) -> tuple[AsyncWebElement, list[str]]:
+        elem = await self._find(locator)
+        return elem, await self._driver.execute_script(SELECT_OPTIONS_SCRIPT, elem)
+
+    async def _select_by_index(self, locator: Locator, idx: int):
+        await self._driver.execute_script(SELECT_INDEX_SCRIPT, await self._find(locator), idx)
+
+    async def _click_and_wait_for_time_table(self, button: AsyncWebElement) -> float:
+        await self._prepare()
+        await self._driver.execute_script(MARK_STALE_TIME_TABLE_SCRIPT)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + TIME_TABLE_WAIT_TIME
+        await button.click()
+        with tracer.span(QUEUE_WAIT_SPAN):
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    await self._driver.execute_async_script(WAIT_FOR_TIME_TABLE_SCRIPT, int(remaining * 1000))
+                    break
+                except WebDriverException:  # 대기 중에 페이지가 이동하면 새 페이지에서 다시 기다린다
+                    continue
+        queue_wait_sec = loop.time() - started
+        self.last_queue_wait_sec = queue_wait_sec
+        return queue_wait_sec
+
+
+class AsyncLoginPage(AsyncBasePage):
+    def __init__(self, driver: AsyncWebDriver, url: str = SRT_LOGIN_PAGE_URL):
+        AsyncBasePage.__init__(self, driver)
+        self._url = url
+
+    @traced
+    async def login(self, account_id: str, pw: str):
+        await self._prepare()
+        if len(account_id) != 10 or not account_id.isdigit():
+            raise ValueError
+        await self._driver.get(self._url)
+        await (await self._find(LoginPage._pw_input_box)).send_keys(pw)
+        await (await self._find(LoginPage._id_input_box)).send_keys(account_id)
+        await (await self._find(LoginPage._confirm_button)).click()
+        if await self.is_alert_present():
+            raise ValueError(await self._driver.alert_text())
+        else:
+            print("로그인 성공")
+
+
+class AsyncSelectSchedulePage(AsyncBasePage):
+    _passenger_locators = Passenger(adult=SelectSchedulePage._adult_select,
+                                    elder=SelectSchedulePage._elder_select,
+                                    child=SelectSchedulePage._children_select,
+                                    severe_disabled=SelectSchedulePage._severe_select,
+                                    mild_disabled=SelectSchedulePage._mild_select)
+
+    def __init__(self, driver: AsyncWebDriver, url: str = SRT_SELECT_SCHEDULE_PAGE_URL):
+        AsyncBasePage.__init__(self, driver)
+        self._url = url
+
+    @traced
+    async def enter_region(self, dep: Region, dst: Region):
+        await self._prepare()
+        if dep not in get_args(Region) or dst not in get_args(Region):
+            raise ValueError("지역 이상함;")
+        await self._driver.get(self._url)
+        dep_input_box = await self._find(SelectSchedulePage._dep_input_box)
+        await dep_input_box.clear()
+        await dep_input_box.send_keys(dep)
+        dst_input_box = await self._find(SelectSchedulePage._dst_input_box)
+        await dst_input_box.clear()
+        await dst_input_box.send_keys(dst)
+
+    @traced
+    async def select_date_time(self, date_time: datetime.datetime):
+        if datetime.datetime.today().date() > date_time.date():
+            raise ValueError
+        date_select, date_options = await self._select_options(SelectSchedulePage._date_select)
+        date_list = [datetime.datetime.strptime(date_string.split('(')[0], '%Y/%m/%d').date()
+                     for date_string in date_options]
+        await self._driver.execute_script(SELECT_INDEX_SCRIPT, date_select, date_list.index(date_time.date()))
+        dep_time = date_time.hour
+        dep_time = dep_time if dep_time % 2 == 0 else dep_time - 1
+        time_select, time_options = await self._select_options(SelectSchedulePage._time_select)
+        await self._driver.execute_script(SELECT_INDEX_SCRIPT, time_select, time_options.index(f"{dep_time:02d}"))
+
+    @traced
+    async def select_passenger(self, pessanger_count: PassengerOptions) -> None:
+        for f in fields(Passenger):
+            cnt: int = getattr(pessanger_count, f.name)
+            if cnt > 9:
+                raise ValueError
+            await self._select_by_index(getattr(self._passenger_locators, f.name), cnt)
+
+    @traced
+    async def select_seat_type(self, location: SeatLocation = SeatLocation.default,
+                               attribute: SeatAttribute = SeatAttribute.default):
+        await self._select_by_index(SelectSchedulePage.seat_loc_select, location.value)
+        await self._select_by_index(SelectSchedulePage.seat_attr_select, attribute.value)
+
+    @traced
+    async def search(self) -> float:
+        return await self._click_and_wait_for_time_table(await self._find(SelectSchedulePage._search_button))
+
+
+class AsyncTicketingPage(AsyncBasePage):
+    def __init__(self, driver: AsyncWebDriver, url: str = SRT_TICKETING_PAGE_URL):
+        AsyncBasePage.__init__(self, driver)
+        self._url = url
+
+    @traced
+    async def validate(self) -> bool:
+        await self._driver.get(self._url)
+        try:
+            await self._find(TicketingPage._reservation_list)
+            return False
+        except NoSuchElementException:
+            return True
+
+
+class AsyncTimeTablePage(AsyncBasePage):
+    def __init__(self, driver: AsyncWebDriver, ticketing_url: str = SRT_TICKETING_PAGE_URL):
+        AsyncBasePage.__init__(self, driver)
+        self._ticking_page = AsyncTicketingPage(self._driver, ticketing_url)
+        self.research: Callable[[], Awaitable[float]] | None = None  # 예약 확인 뒤 시간표로 돌아갈 때 다시 조회한다
+
+    async def run(self, class_priority_options: ClassPriorityOptions,
+                  time_priority_options: TimePriorityOptions, refresh_cycle_sec: float = 0.5,
+                  polling_scheduler: PollingScheduler | None = None, stop_event: asyncio.Event | None = None) -> bool:
+        if polling_scheduler is None:
+            polling_scheduler = PollingScheduler(PollingPolicy(interval_sec=refresh_cycle_sec), time_priority_options)
+        loop = asyncio.get_running_loop()
+        while (stop_event is None or not stop_event.is_set()) and not polling_scheduler.should_stop():
+            started = loop.time()
+            with tracer.span(POLL_SPAN, source="browser") as poll:
+                tickets = await self._get_tickets(class_priority_options, time_priority_options)
+                with tracer.span("rank"):
+                    rows = [row for row in tickets.sorted_by_priority() if row.cell.link is not None]
+                poll.set(available=bool(rows))
+            polling_scheduler.record(loop.time() - started)
+            outcome = await self._click(rows[0]) if rows else checkout.NO_CANDIDATES
+            if outcome == checkout.RESERVED:
+                return True
+            if outcome != checkout.UNKNOWN:  # 시간표에 그대로 있다. UNKNOWN 이면 방금 다시 조회했다
+                await self._driver.refresh()
+            await wait_for_next_poll(polling_scheduler, stop_event)
+        return False
+
+    async def _click(self, row: TicketRow) -> str:
+        # 자리가 없다는 안내만 뜨면 시간표에 그대로 있다. 예약 페이지로 넘어갔는데 예약이 안 됐으면 시간표로 돌아온다
+        with tracer.span("reserve_click"):
+            await row.cell.link.click()
+            tracer.count("reserve_clicks")
+            if await self.is_alert_present():
+                alert_text = await self._driver.alert_text()
+                await self._driver.accept_alert()
+                if any(marker in alert_text for marker in checkout.FAILURE_MARKERS):
+                    return checkout.SOLD_OUT
+        if await self._ticking_page.validate():
+            return checkout.RESERVED
+        with tracer.span("return_to_time_table"):
+            if self.research is not None:
+                await self.research()
+            else:
+                await self._driver.back()
+        return checkout.UNKNOWN
+
+    @traced
+    async def _get_tickets(self, class_priority_options: ClassPriorityOptions,
+                           time_priority_options: TimePriorityOptions) -> Ticket:
+        try:
+            table_elem = await self._find(TimeTablePage._table_body)
+        except NoSuchElementException:
+            await self._click_and_wait_for_time_table(await self._find(TimeTablePage._research_button))
+            table_elem = await self._find(TimeTablePage._table_body)
+        raw_rows = await self._driver.execute_script(TIME_TABLE_EXTRACT_SCRIPT, table_elem,
+                                                     [Ticket.FIRST_CLS_IDX, Ticket.STANDARD_CLS_IDX])
+        rows = [[TicketCell(text, link) for text, link in raw_row] for raw_row in raw_rows]
+        return Ticket(rows, class_priority_options, time_priority_options)
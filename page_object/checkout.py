@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .custom_types import TicketRow
+from .tracing import tracer
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome
+
+RESERVED = "reserved"
+SOLD_OUT = "sold_out"
+UNKNOWN = "unknown"  # 응답만으로는 판단이 안 됨. 예약 확인 페이지로 확인해야 한다
+UNSUPPORTED = "unsupported"  # 예약 링크가 폼을 보내지 않음
+NO_CANDIDATES = "no_candidates"  # 예약 가능하다는 칸은 있지만 누를 링크가 없음
+ERROR = "error"
+
+# 이미 다른 사람이 가져간 자리를 눌렀을 때 SRT 가 alert 로 띄우는 안내. 응답 본문 전체가 아니라 alert 문구에서만 찾는다
+# ("매진" 은 시간표나 안내문 어디에나 나올 수 있다). 성공 문구는 alert 를 뺀 본문에서 찾는다
+FAILURE_MARKERS = ("잔여석없음", "매진", "다른 열차를 선택")
+SUCCESS_MARKERS = ("예약이 완료", "10분 내에 결제")
+
+# 예약 링크의 onclick 이 채워서 보내는 폼을 가로채서, 페이지를 떠나지 않고 fetch 로 보낸다.
+# 자리가 없으면 같은 시간표의 다음 후보를 바로 시도하므로 후보 여러 개를 왕복 한 번에 시도한다.
+# 예약이 되면 응답 페이지(결제 안내)를 그대로 화면에 띄운다
+RESERVE_CANDIDATES_SCRIPT = """
+var links = arguments[0], failureMarkers = arguments[1], successMarkers = arguments[2];
+var done = arguments[arguments.length - 1];
+function capture(link) {
+    var captured = null, submit = HTMLFormElement.prototype.submit;
+    HTMLFormElement.prototype.submit = function () {
+        captured = {action: this.action, method: (this.method || "GET").toUpperCase(),
+                    body: new URLSearchParams(new FormData(this)).toString()};
+    };
+    try {
+        link.click();
+    } finally {
+        HTMLFormElement.prototype.submit = submit;
+    }
+    return captured;
+}
+var ALERT = /alert\\s*\\(\\s*(["'])([\\s\\S]*?)\\1\\s*\\)/g;
+function alertMessages(text) {
+    var messages = [], match;
+    ALERT.lastIndex = 0;
+    while ((match = ALERT.exec(text)) !== null) messages.push(match[2]);
+    return messages.join("\\n");
+}
+function contains(text, markers) {
+    for (var i = 0; i < markers.length; i++) {
+        if (text.indexOf(markers[i]) >= 0) return markers[i];
+    }
+    return null;
+}
+var results = [];
+(function attempt(idx) {
+    if (idx >= links.length) { done(results); return; }
+    var request = capture(links[idx]);
+    if (request === null) { results.push(["unsupported", ""]); done(results); return; }
+    var url = request.action, init = {method: request.method, credentials: "same-origin"};
+    if (request.method === "GET") {
+        url += (url.indexOf("?") >= 0 ? "&" : "?") + request.body;
+    } else {
+        init.body = request.body;
+        init.headers = {"Content-Type": "application/x-www-form-urlencoded"};
+    }
+    fetch(url, init).then(function (response) {
+        return response.text().then(function (text) {
+            var failure = contains(alertMessages(text), failureMarkers);
+            if (failure !== null) {
+                results.push(["sold_out", failure]);
+                attempt(idx + 1);
+                return;
+            }
+            var success = contains(text.replace(ALERT, ""), successMarkers);
+            results.push([success !== null ? "reserved" : "unknown", success || ""]);
+            done(results);
+            if (success !== null) {
+                setTimeout(function () {
+                    history.replaceState(null, "", response.url);
+                    document.open();
+                    document.write(text);
+                    document.close();
+                }, 0);
+            }
+        });
+    }).catch(function (error) {
+        results.push(["error", String(error)]);
+        done(results);
+    });
+})(0);
+"""
+
+
+@dataclass(frozen=True)
+class CheckoutAttempt:
+    row: TicketRow
+    outcome: str
+    message: str
+
+
+class Checkout:
+    # 시간표 스냅샷 하나에서 순위대로 max_candidates 개까지 예약을 시도한다
+    def __init__(self, driver: "Chrome", max_candidates: int = 3,
+                 failure_markers: tuple[str, ...] = FAILURE_MARKERS,
+                 success_markers: tuple[str, ...] = SUCCESS_MARKERS):
+        self._driver = driver
+        self.max_candidates = max_candidates
+        self._failure_markers = failure_markers
+        self._success_markers = success_markers
+
+    def try_candidates(self, ranked_rows: list[TicketRow]) -> list[CheckoutAttempt]:
+        rows = [row for row in ranked_rows if row.cell.link is not None][:self.max_candidates]
+        if not rows:
+            return []
+        results = self._driver.execute_async_script(RESERVE_CANDIDATES_SCRIPT, [row.cell.link for row in rows],
+                                                    list(self._failure_markers), list(self._success_markers))
+        attempts = [CheckoutAttempt(row, outcome, message) for row, (outcome, message) in zip(rows, results)]
+        for attempt in attempts:
+            tracer.count(f"checkout_{attempt.outcome}")
+        return attempts
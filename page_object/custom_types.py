@@ -1,12 +1,14 @@
+import copy
 import datetime
 from dataclasses import dataclass, field, fields
 from enum import IntEnum
-from typing import Generic, Iterator, Literal, TypeVar
+from typing import TYPE_CHECKING, Generic, Iterable, Iterator, Literal, TypeVar
 
-import pandas as pd
-from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import Select as SeleniumSelect
+from . import page_profile
+from .page_profile import TIME_TABLE_PROFILE
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webelement import WebElement
 
 
 T = TypeVar("T")
@@ -20,20 +22,30 @@ DISABLE: int = 0
 Region = Literal["수서", "동탄", "평택지제", "천안아산", "오송", "대전", "김천구미", "동대구", "서대구", "경주", "울산(통도사)", "울산", "부산"]
 
 
+# SRT 조회 폼의 역 코드(dptRsStnCd/arvRsStnCd)
+STATION_CODES: dict[str, str] = {
+    "수서": "0551", "동탄": "0552", "평택지제": "0553", "천안아산": "0502", "오송": "0297", "대전": "0010",
+    "김천구미": "0507", "동대구": "0015", "서대구": "0506", "경주": "0508", "울산(통도사)": "0509", "울산": "0509",
+    "부산": "0020",
+}
+
+
 @dataclass
 class RegionOptions:
     departure: Region
     destination: Region
 
 
-class Select(SeleniumSelect):
-    @property
-    def elem_options(self) -> list[WebElement]:
-        return self.options
+@dataclass(frozen=True)
+class RouteOption:
+    departure: Region
+    destination: Region
+    weight: float = 1.0  # 같은 조건이면 weight 가 큰 노선을 먼저
 
     @property
-    def text_options(self) -> list[str]:
-        return [elem.text for elem in self.options]
+    def form_fields(self) -> dict[str, str]:
+        return {"dptRsStnCd": STATION_CODES[self.departure], "arvRsStnCd": STATION_CODES[self.destination],
+                "dptRsStnCdNm": self.departure, "arvRsStnCdNm": self.destination}
 
 
 @dataclass
@@ -48,11 +60,6 @@ class Passenger(Generic[T]):
         return (getattr(self, f.name) for f in fields(self))
 
 
-@dataclass
-class PassengerSelect(Passenger[Select]):
-    pass
-
-
 @dataclass
 class PassengerOptions(Passenger[int]):
     adult: int = field(default=1)
@@ -99,19 +106,23 @@ class ClassPriorityOptions:
             self.standard_standing = DISABLE
         if self.first_class == DISABLE:
             self.first_class_standing = DISABLE
+        # 작업 하나 동안 바뀌지 않으므로 만들 때 한 번만 계산해 두고 조회마다 다시 쓴다
+        self.priority_order = self._sorted_priorities()
 
-    def __iter__(self):
+    def _sorted_priorities(self) -> tuple[str, ...]:
         priorities = {field.name: getattr(self, field.name) for field in fields(self) if field.name not in
                       ['allow_standing', "time_ascendig", "best_time", "time_prefer"]}
         filtered_priorities = {name: value for name, value in priorities.items() if value != DISABLE}
         sorted_priorities = sorted(filtered_priorities.items(), key=lambda item: item[1], reverse=True)
-        for name, _ in sorted_priorities:
-            yield name
+        return tuple(name for name, _ in sorted_priorities)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.priority_order)
 
 
 @dataclass
 class TimePriorityOptions:
-    min_datetime: datetime.datetime = datetime.datetime.now()
+    min_datetime: datetime.datetime = field(default_factory=datetime.datetime.now)
     max_datetime: datetime.datetime | None = None
     best_datetime: datetime.datetime | None = None
     prefer_time: bool = False
@@ -134,145 +145,183 @@ class PriorityOptions:
     time_priority_option: TimePriorityOptions
 
 
-class Ticket:
-    DEP_IDX = 3
-    FIRST_CLS_IDX = 5
-    STANDARD_CLS_IDX = 6
+# tbody 전체를 한 번의 왕복으로 가져온다: 셀 텍스트 + 예약 버튼(<a>) 핸들
+TIME_TABLE_EXTRACT_SCRIPT = """
+var linkIndices = arguments[1];
+return Array.prototype.map.call(arguments[0].rows, function (row) {
+    return Array.prototype.map.call(row.cells, function (cell, idx) {
+        var link = linkIndices.indexOf(idx) >= 0 ? cell.querySelector("a") : null;
+        return [cell.innerText.trim(), link];
+    });
+});
+"""
+
+
+@dataclass
+class TicketCell:
+    text: str
+    link: "WebElement | None" = None
 
-    def __init__(self, table_elem: WebElement, class_priority_options: ClassPriorityOptions,
-                 time_priority_options: TimePriorityOptions):
+
+def extract_time_table(table_elem: "WebElement", link_indices: Iterable[int]) -> list[list[TicketCell]]:
+    raw_rows = table_elem.parent.execute_script(TIME_TABLE_EXTRACT_SCRIPT, table_elem, list(link_indices))
+    return [[TicketCell(text, link) for text, link in raw_row] for raw_row in raw_rows]
+
+
+BOOKING_CUTOFF = datetime.timedelta(minutes=20)  # 출발 20분 전까지만 예매 가능
+
+SOLD_OUT = "매진"
+NOT_ENOUGH_SEATS = "좌석부족"
+STANDING = "입석+좌석"
+
+
+class TicketRow:
+    __slots__ = ("time", "seat_class", "cell", "route")
+
+    def __init__(self, time: datetime.datetime, seat_class: str, cell: TicketCell, route: RouteOption | None = None):
+        self.time = time
+        self.seat_class = seat_class
+        self.cell = cell
+        self.route = route
+
+    def __repr__(self):
+        route = f", {self.route.departure}-{self.route.destination}" if self.route is not None else ""
+        return f"TicketRow({self.time:%Y-%m-%d %H:%M}, {self.seat_class}, {self.cell.text}{route})"
+
+
+class Ticket:
+    # 칸 위치는 시간표 페이지 프로필을 따른다
+    TRAIN_NO_IDX = TIME_TABLE_PROFILE.index(page_profile.TRAIN_NO)
+    DEP_IDX = TIME_TABLE_PROFILE.index(page_profile.DEPARTURE)
+    ARR_IDX = TIME_TABLE_PROFILE.index(page_profile.DESTINATION)
+    FIRST_CLS_IDX = TIME_TABLE_PROFILE.index(page_profile.FIRST_CLASS)
+    STANDARD_CLS_IDX = TIME_TABLE_PROFILE.index(page_profile.STANDARD)
+
+    def __init__(self, rows: list[list[TicketCell]], class_priority_options: ClassPriorityOptions,
+                 time_priority_options: TimePriorityOptions, search_date: datetime.date | None = None):
         self._class_priority_options = class_priority_options
         self._time_priority_options = time_priority_options
+        self._search_date = search_date
         self.min_time = time_priority_options.min_datetime
         self.max_time = time_priority_options.max_datetime
         self.best_time = time_priority_options.best_datetime
-        _rows = [row_elem for row_elem in table_elem.find_elements(By.TAG_NAME, "tr")]
-        _time_table_df = self._get_time_table_df(_rows)
-        self._sorted_by_time_df = self._filter_by_time(_time_table_df)
+        timed_rows = self._filter_by_time(self._get_time_table(rows))
         self._standard, self._standard_standing, self._first_class, self._first_class_standing = \
-            self._split_by_class(self._sorted_by_time_df)
+            self._split_by_class(timed_rows)
 
-    def is_empty(self):
-        return (
-            self.standard.empty and
-            self.standard_standing.empty and
-            self.first_class.empty and
-            self.first_class_standing.empty
-        )
-
-    def _get_time_table_df(self, rows: list[WebElement]) -> pd.DataFrame:
-        columns = {Ticket.DEP_IDX: []}
-        if self._class_priority_options.standard:
-            columns[Ticket.STANDARD_CLS_IDX] = []
-        if self._class_priority_options.first_class:
-            columns[Ticket.FIRST_CLS_IDX] = []
+    @classmethod
+    def from_table_elem(cls, table_elem: "WebElement", class_priority_options: ClassPriorityOptions,
+                        time_priority_options: TimePriorityOptions) -> "Ticket":
+        rows = extract_time_table(table_elem, [Ticket.FIRST_CLS_IDX, Ticket.STANDARD_CLS_IDX])
+        return cls(rows, class_priority_options, time_priority_options)
 
+    def is_empty(self):
+        return not (self.standard or self.standard_standing or self.first_class or self.first_class_standing)
+
+    def bookable_count(self) -> int:
+        # 객실/시간 조건을 통과한 예약 가능한 칸 수
+        return len(self.standard) + len(self.standard_standing) + len(self.first_class) + len(self.first_class_standing)
+
+    @classmethod
+    def merge(cls, tickets: list["Ticket"]) -> "Ticket":
+        # 여러 조회(날짜/시간 블록) 결과를 한 순위로 합친다. 옵션은 모두 같다고 본다.
+        # 조회 결과는 블록 시작 시각부터 이어지므로 겹치는 열차는 앞 블록의 것만 남긴다
+        merged = copy.copy(tickets[0])
+        seen: set[tuple[RouteOption | None, datetime.datetime, str]] = set()
+
+        def unique(rows: Iterable[TicketRow]) -> list[TicketRow]:
+            kept = []
+            for row in rows:
+                if (row.route, row.time, row.seat_class) not in seen:
+                    seen.add((row.route, row.time, row.seat_class))
+                    kept.append(row)
+            return kept
+        merged._standard = unique(row for ticket in tickets for row in ticket.standard)
+        merged._standard_standing = unique(row for ticket in tickets for row in ticket.standard_standing)
+        merged._first_class = unique(row for ticket in tickets for row in ticket.first_class)
+        merged._first_class_standing = unique(row for ticket in tickets for row in ticket.first_class_standing)
+        return merged
+
+    def _get_time_table(self, rows: list[list[TicketCell]]) -> list[tuple[datetime.datetime, list[TicketCell]]]:
+        # 행에는 시각만 있으므로 날짜는 조회한 날짜(없으면 min_datetime 의 날짜)를 쓴다
+        base_datetime = self._time_priority_options.min_datetime
+        if self._search_date is not None:
+            base_datetime = base_datetime.replace(year=self._search_date.year, month=self._search_date.month,
+                                                  day=self._search_date.day)
+        time_table = []
         for row in rows:
-            row_elems = row.find_elements(By.TAG_NAME, "td")
-            for idx in columns.keys():
-                if idx == Ticket.DEP_IDX:
-                    elem = row_elems[idx]
-                    time_text = elem.text.split("\n")[1]
-                    hour, minute = time_text.split(":")
-                    new_time = self._time_priority_options.min_datetime.replace(hour=int(hour), minute=int(minute))
-                    columns[idx].append(new_time)
-                else:
-                    columns[idx].append(row_elems[idx])
-        time_table_df = pd.DataFrame(columns)
-        return time_table_df
-
-    def _filter_by_time(self, time_table_df: pd.DataFrame) -> pd.DataFrame:
-        time_series = time_table_df.iloc[:, 0]
-        time_filter = time_series >= self._time_priority_options.min_datetime
-        _20_minutes = (datetime.datetime.now() + datetime.timedelta(minutes=20))
-        _20_min_filter = time_series > _20_minutes
-        time_filter = time_filter & _20_min_filter
-        if self._time_priority_options.max_datetime is not None:
-            max_time_filterd = time_series <= self._time_priority_options.max_datetime
-            time_filter = time_filter & max_time_filterd
-        time_table_df = time_table_df[time_filter]
-        return time_table_df
-
-    def _split_by_class(self, time_table_df: pd.DataFrame) -> tuple[pd.DataFrame, ...]:
-        status = time_table_df.iloc[:, 1:].map(lambda elem: elem.text)
-        forbidon_statuses = ["좌석부족", "매진"]
+            time_text = row[Ticket.DEP_IDX].text.split("\n")[1]
+            hour, minute = time_text.split(":")
+            time_table.append((base_datetime.replace(hour=int(hour), minute=int(minute)), row))
+        return time_table
+
+    def _filter_by_time(self, time_table: list[tuple[datetime.datetime, list[TicketCell]]]
+                        ) -> list[tuple[datetime.datetime, list[TicketCell]]]:
+        min_datetime = self._time_priority_options.min_datetime
+        max_datetime = self._time_priority_options.max_datetime
+        _20_minutes = (datetime.datetime.now() + BOOKING_CUTOFF)
+        return [(time, row) for time, row in time_table
+                if time >= min_datetime and time > _20_minutes and (max_datetime is None or time <= max_datetime)]
+
+    def _split_by_class(self, time_table: list[tuple[datetime.datetime, list[TicketCell]]]
+                        ) -> tuple[list[TicketRow], ...]:
+        forbidon_statuses = {NOT_ENOUGH_SEATS, SOLD_OUT}
         if self._class_priority_options.allow_standing is False:
-            forbidon_statuses.append("입석+좌석")
-        for fs in forbidon_statuses:
-            status[status == fs] = False
-
-        if self._class_priority_options.standard:
-            standard = time_table_df[[Ticket.DEP_IDX, Ticket.STANDARD_CLS_IDX]
-                                     ][status[Ticket.STANDARD_CLS_IDX].astype(bool)]
-            if self._class_priority_options.allow_standing and self._class_priority_options.standard_standing:
-                standard_standing = standard[status[Ticket.STANDARD_CLS_IDX] == "입석+좌석"]
-                standard = standard[status[Ticket.STANDARD_CLS_IDX] != "입석+좌석"]
-            else:
-                standard_standing = pd.DataFrame()
-        else:
-            standard = pd.DataFrame()
-            standard_standing = pd.DataFrame()
-
-        if self._class_priority_options.first_class:
-            first_class = time_table_df[[Ticket.DEP_IDX, Ticket.FIRST_CLS_IDX]
-                                        ][status[Ticket.FIRST_CLS_IDX].astype(bool)]
-            if self._class_priority_options.allow_standing and self._class_priority_options.first_class_standing:
-                first_class_standing = first_class[status[Ticket.FIRST_CLS_IDX] == "입석+좌석"]
-                first_class = first_class[status[Ticket.FIRST_CLS_IDX] != "입석+좌석"]
-            else:
-                first_class_standing = pd.DataFrame()
-        else:
-            first_class = pd.DataFrame()
-            first_class_standing = pd.DataFrame()
-        if not standard.empty:
-            standard.columns = ['time', 'ticket']
-        if not standard_standing.empty:
-            standard_standing.columns = ['time', 'ticket']
-        if not first_class.empty:
-            first_class.columns = ['time', 'ticket']
-        if not first_class_standing.empty:
-            first_class_standing.columns = ['time', 'ticket']
+            forbidon_statuses.add(STANDING)
+        standard: list[TicketRow] = []
+        standard_standing: list[TicketRow] = []
+        first_class: list[TicketRow] = []
+        first_class_standing: list[TicketRow] = []
+        split_standard_standing = self._class_priority_options.allow_standing and \
+            bool(self._class_priority_options.standard_standing)
+        split_first_class_standing = self._class_priority_options.allow_standing and \
+            bool(self._class_priority_options.first_class_standing)
+
+        for time, row in time_table:
+            if self._class_priority_options.standard:
+                cell = row[Ticket.STANDARD_CLS_IDX]
+                if cell.text and cell.text not in forbidon_statuses:
+                    if split_standard_standing and cell.text == STANDING:
+                        standard_standing.append(TicketRow(time, "standard_standing", cell))
+                    else:
+                        standard.append(TicketRow(time, "standard", cell))
+            if self._class_priority_options.first_class:
+                cell = row[Ticket.FIRST_CLS_IDX]
+                if cell.text and cell.text not in forbidon_statuses:
+                    if split_first_class_standing and cell.text == STANDING:
+                        first_class_standing.append(TicketRow(time, "first_class_standing", cell))
+                    else:
+                        first_class.append(TicketRow(time, "first_class", cell))
         return standard, standard_standing, first_class, first_class_standing
 
     @property
-    def standard(self) -> pd.DataFrame:
+    def standard(self) -> list[TicketRow]:
         return self._standard
 
     @property
-    def standard_standing(self) -> pd.DataFrame:
+    def standard_standing(self) -> list[TicketRow]:
         return self._standard_standing
 
     @property
-    def first_class(self) -> pd.DataFrame:
+    def first_class(self) -> list[TicketRow]:
         return self._first_class
 
     @property
-    def first_class_standing(self) -> pd.DataFrame:
+    def first_class_standing(self) -> list[TicketRow]:
         return self._first_class_standing
 
-    def sorted_by_priority(self) -> pd.DataFrame:
+    def sorted_by_priority(self) -> list[TicketRow]:
         if self._time_priority_options.prefer_time:  # 오직 시간만을
-            all_df = pd.concat([self.standard, self.standard_standing, self.first_class, self.first_class_standing],
-                               axis=0)
-            if self._time_priority_options.best_datetime:  # 오직 베스트 타임과 가까울수록
-                return self._sort_by_best_time(all_df)
-            else:  # 객실 유형 무시하고 오름차순 or 내림차순으로만 정렬
-                return all_df.sort_values("time", ascending=self._time_priority_options.ascendig)
+            return self._sort_by_time(self.standard + self.standard_standing +
+                                      self.first_class + self.first_class_standing)
         else:  # 객실 유형별로 시간정렬 한 후에 객실 유형 우선순위맞춰서 합쳐야함
-            tickets_list: list[pd.DataFrame] = [getattr(self, p) for p in self._class_priority_options]
-            if self._time_priority_options.best_datetime:
-                for ticket in tickets_list:
-                    ticket = self._sort_by_best_time(ticket)
-                return pd.concat(tickets_list, axis=0).drop(columns=["time_diff"])
-            else:
-                all_df = pd.concat(tickets_list, axis=0)
-                all_df.sort_values("time", ascending=self._time_priority_options.ascendig)
-                return all_df
-
-    def _sort_by_best_time(self, df: pd.DataFrame) -> pd.DataFrame:
-        if df.empty:
-            return df
-        df["time_diff"] = df["time"].apply(lambda t: t - self._time_priority_options.best_datetime)
-        df = df.iloc[(df['time_diff'].abs()).argsort()]
-        df = df.drop(columns=["time_diff"])
-        return df
+            sorted_rows: list[TicketRow] = []
+            for p in self._class_priority_options:
+                sorted_rows.extend(self._sort_by_time(getattr(self, p)))
+            return sorted_rows
+
+    def _sort_by_time(self, rows: list[TicketRow]) -> list[TicketRow]:
+        best_datetime = self._time_priority_options.best_datetime
+        if best_datetime:  # 베스트 타임과 가까울수록
+            return sorted(rows, key=lambda row: abs(row.time - best_datetime))
+        return sorted(rows, key=lambda row: row.time, reverse=not self._time_priority_options.ascendig)
@@ -0,0 +1,199 @@
+import datetime
+import fcntl
+import os
+import threading
+from typing import Iterator
+
+import numpy as np
+
+from .custom_types import NOT_ENOUGH_SEATS, SOLD_OUT, STANDING, STATION_CODES, Ticket, TicketCell
+
+HISTORY_ENV = "SRT_HISTORY"
+
+# 상태 코드. Ticket._split_by_class 가 가르는 상태와 같다
+EMPTY = 0  # 칸이 비어 있음(해당 객실 없음)
+AVAILABLE = 1
+SOLD_OUT_CODE = 2
+NOT_ENOUGH_SEATS_CODE = 3
+STANDING_CODE = 4
+STATUS_CODES = {SOLD_OUT: SOLD_OUT_CODE, NOT_ENOUGH_SEATS: NOT_ENOUGH_SEATS_CODE, STANDING: STANDING_CODE}
+
+FIRST_CLASS = 0
+STANDARD = 1
+CLASS_CELLS = ((FIRST_CLASS, Ticket.FIRST_CLS_IDX), (STANDARD, Ticket.STANDARD_CLS_IDX))
+
+# 헤더 없는 고정 폭(24바이트) 레코드를 이어 붙인 파일. 시각은 로컬 시각 그대로 저장한다
+HISTORY_DTYPE = np.dtype([
+    ("observed_at", "M8[ms]"),
+    ("departs_at", "M8[m]"),
+    ("departure", "<u2"),  # 역 코드(STATION_CODES), 모르는 역은 0
+    ("destination", "<u2"),
+    ("train_no", "<u2"),
+    ("seat_class", "u1"),
+    ("status", "u1"),
+])
+KEY_FIELDS = ("departure", "destination", "train_no", "departs_at", "seat_class")
+
+LEAD_TIME = "lead_time"  # 출발 몇 분 전에 풀렸는지
+TIME_OF_DAY = "time_of_day"  # 하루 중 몇 시 몇 분에 풀렸는지
+
+_STATION_NAMES = {int(code): name for name, code in reversed(STATION_CODES.items())}
+
+
+def history_path() -> str | None:
+    return os.environ.get(HISTORY_ENV) or None
+
+
+def _station_code(text: str) -> int:
+    code = STATION_CODES.get(text)
+    return int(code) if code is not None else 0
+
+
+def _status_code(text: str) -> int:
+    if not text:
+        return EMPTY
+    return STATUS_CODES.get(text, AVAILABLE)
+
+
+def _encode(observed_at: datetime.datetime, search_date: datetime.date,
+            rows: list[tuple[str, ...]]) -> np.ndarray:
+    records = np.empty(len(rows) * len(CLASS_CELLS), HISTORY_DTYPE)
+    idx = 0
+    for train_no, departure, destination, *statuses in rows:
+        departure_name, _, departure_time = departure.partition("\n")
+        hour, _, minute = departure_time.partition(":")
+        try:
+            departs_at = datetime.datetime.combine(search_date, datetime.time(int(hour), int(minute)))
+            train_no = int(train_no)
+        except ValueError:
+            continue  # 시간표 행이 아님
+        for (seat_class, _), status in zip(CLASS_CELLS, statuses):
+            records[idx] = (observed_at, departs_at, _station_code(departure_name),
+                            _station_code(destination.partition("\n")[0]), train_no, seat_class,
+                            _status_code(status))
+            idx += 1
+    return records[:idx]
+
+
+class HistoryRecorder:
+    # 조회한 시간표를 고정 폭 레코드로 파일 끝에 덧붙인다. record 는 글자만 복사해 두고,
+    # 쓰기 스레드가 flush_interval_sec 마다 모아서 한 번에 쓴다.
+    # 워커 프로세스마다 하나씩 열어도 O_APPEND 로 레코드 단위 write 만 하므로 한 파일에 섞여 쌓인다
+    def __init__(self, path: str, flush_interval_sec: float = 1.0):
+        self.path = path
+        self.flush_interval_sec = flush_interval_sec
+        self._pending: list[tuple[datetime.datetime, datetime.date, list[tuple[str, ...]]]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.records = 0
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, rows: list[list[TicketCell]], search_date: datetime.date,
+               observed_at: datetime.datetime | None = None):
+        snapshot = [(row[Ticket.TRAIN_NO_IDX].text, row[Ticket.DEP_IDX].text, row[Ticket.ARR_IDX].text,
+                     *(row[cell_idx].text for _, cell_idx in CLASS_CELLS))
+                    for row in rows if len(row) > Ticket.STANDARD_CLS_IDX]
+        with self._lock:
+            self._pending.append((observed_at or datetime.datetime.now(), search_date, snapshot))
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval_sec)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        records = np.concatenate([_encode(*snapshot) for snapshot in pending])
+        data = memoryview(records.tobytes())
+        # write 가 일부만 쓰면 나머지를 마저 쓴다. 레코드가 어긋나면 그 뒤로 파일 전체를 읽을 수 없으므로,
+        # 다른 워커가 그 사이에 덧붙이지 못하도록 다 쓸 때까지 파일을 잠근다
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            while data:
+                data = data[os.write(self._fd, data):]
+        except OSError as e:
+            print(f"시간표 기록 실패: {e}")
+            return
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self.records += len(records)
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        os.close(self._fd)
+
+
+def iter_chunks(path: str, chunk_records: int = 1 << 20) -> Iterator[np.ndarray]:
+    # 파일 전체를 읽지 않고 memmap 으로 chunk_records 개씩 본다. 쓰다 만 마지막 레코드는 건너뛴다
+    count = os.path.getsize(path) // HISTORY_DTYPE.itemsize
+    if count == 0:
+        return
+    records = np.memmap(path, HISTORY_DTYPE, mode="r", shape=(count,))
+    for start in range(0, count, chunk_records):
+        yield records[start:start + chunk_records]
+
+
+def _releases(records: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # 같은 열차/객실에서 매진(또는 좌석부족)이던 칸이 예약 가능(입석 포함)으로 바뀐 레코드를 고른다.
+    # 반환: (풀린 레코드, 열차/객실마다 마지막 레코드)
+    order = np.lexsort([records[name] for name in ("observed_at", *reversed(KEY_FIELDS))])
+    records = records[order]
+    same_key = np.ones(len(records), dtype=bool)
+    for name in KEY_FIELDS:
+        same_key[1:] &= records[name][1:] == records[name][:-1]
+    same_key[0] = False
+    status = records["status"]
+    bookable = (status == AVAILABLE) | (status == STANDING_CODE)
+    was_full = np.zeros(len(records), dtype=bool)
+    was_full[1:] = (status[:-1] == SOLD_OUT_CODE) | (status[:-1] == NOT_ENOUGH_SEATS_CODE)
+    released = same_key & bookable & was_full
+    last = np.ones(len(records), dtype=bool)
+    last[:-1] = ~same_key[1:]
+    return records[released], records[last]
+
+
+def seat_release_histograms(path: str, bin_minutes: int = 60, by: str = LEAD_TIME,
+                            max_lead_minutes: int = 30 * 24 * 60,
+                            chunk_records: int = 1 << 20) -> dict[tuple[str, str, int], np.ndarray]:
+    # 열차(출발역, 도착역, 열차번호)마다 자리가 풀린 횟수를 bin_minutes 단위로 센다.
+    # 덩어리 경계를 넘는 변화는 덩어리마다 열차/객실별 마지막 레코드를 다음 덩어리 앞에 붙여서 잡는다
+    if by == LEAD_TIME:
+        bin_count = -(-max_lead_minutes // bin_minutes)
+    elif by == TIME_OF_DAY:
+        bin_count = -(-24 * 60 // bin_minutes)
+    else:
+        raise ValueError(f"unknown histogram axis: {by}")
+    histograms: dict[tuple[str, str, int], np.ndarray] = {}
+    carry = np.empty(0, HISTORY_DTYPE)
+    for chunk in iter_chunks(path, chunk_records):
+        released, carry = _releases(np.concatenate([carry, chunk]))
+        if not len(released):
+            continue
+        if by == LEAD_TIME:
+            minutes = (released["departs_at"] - released["observed_at"].astype("M8[m]")).astype(np.int64)
+        else:
+            observed_at = released["observed_at"].astype("M8[m]")
+            minutes = (observed_at - observed_at.astype("M8[D]")).astype(np.int64)
+        bins = np.clip(minutes // bin_minutes, 0, bin_count - 1)
+        trains = np.stack([released["departure"], released["destination"], released["train_no"]], axis=1)
+        unique_trains, train_idx = np.unique(trains, axis=0, return_inverse=True)
+        counts = np.zeros((len(unique_trains), bin_count), dtype=np.int64)
+        np.add.at(counts, (train_idx.ravel(), bins), 1)
+        for (departure, destination, train_no), train_counts in zip(unique_trains.tolist(), counts):
+            key = (_STATION_NAMES.get(departure, str(departure)), _STATION_NAMES.get(destination, str(destination)),
+                   train_no)
+            if key in histograms:
+                histograms[key] += train_counts
+            else:
+                histograms[key] = train_counts
+    return histograms
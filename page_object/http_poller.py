@@ -0,0 +1,166 @@
+import datetime
+import threading
+import time
+from abc import ABC, abstractmethod
+from http.cookies import SimpleCookie
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import parse_qsl, urlencode
+
+import urllib3
+
+from .custom_types import ClassPriorityOptions, Ticket, TicketCell, TicketRow, TimePriorityOptions
+from .polling import PollingScheduler
+from .seat_changes import SeatChangeFeed, TimeTableState
+from .time_table_parser import parse_time_table
+from .tracing import POLL_SPAN, traced, tracer
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome
+
+    from .history import HistoryRecorder
+
+# 조회 결과 페이지의 재조회 폼을 브라우저가 보낼 그대로 직렬화
+SEARCH_FORM_SCRIPT = """
+var form = document.querySelector("#search_top_tag input").form;
+return [form.action, new URLSearchParams(new FormData(form)).toString(), navigator.userAgent];
+"""
+
+# 찾은 뒤 같은 POST를 브라우저에서 다시 보내 Selenium 세션으로 넘긴다
+SUBMIT_FORM_SCRIPT = """
+var form = document.createElement("form");
+form.method = "POST";
+form.action = arguments[0];
+arguments[1].forEach(function (pair) {
+    var input = document.createElement("input");
+    input.type = "hidden";
+    input.name = pair[0];
+    input.value = pair[1];
+    form.appendChild(input);
+});
+document.body.appendChild(form);
+form.submit();
+"""
+
+
+class TimeTablePoller(ABC):
+    # 브라우저 없이 시간표를 조회하다가 빈자리가 보이면 Selenium 세션으로 넘기는 조회기
+    search_date: datetime.date | None = None
+    history: "HistoryRecorder | None" = None
+
+    @abstractmethod
+    def poll(self, class_priority_options: ClassPriorityOptions,
+             time_priority_options: TimePriorityOptions) -> Ticket:
+        ...
+
+    @abstractmethod
+    def hand_over(self, driver: "Chrome"):
+        ...
+
+    def rank(self, tickets: Ticket) -> list[TicketRow]:
+        return tickets.sorted_by_priority()
+
+    def attach_history(self, history: "HistoryRecorder | None"):
+        # 브라우저는 빈자리가 보인 뒤에야 시간표를 읽으므로, 매진이던 시간표는 조회기가 기록해야 남는다
+        self.history = history
+
+    def wait_for_seats(self, class_priority_options: ClassPriorityOptions,
+                       time_priority_options: TimePriorityOptions,
+                       polling_scheduler: PollingScheduler | None = None,
+                       stop_event: threading.Event | None = None,
+                       on_tickets: Callable[[Ticket], None] | None = None) -> Ticket | None:
+        # on_tickets: 조회할 때마다 조건으로 거른 결과를 받는다(진행 상황 표시용)
+        if polling_scheduler is None:
+            polling_scheduler = PollingScheduler(time_priority_options=time_priority_options)
+        while (stop_event is None or not stop_event.is_set()) and not polling_scheduler.should_stop():
+            started = time.perf_counter()
+            try:
+                tickets = self.poll(class_priority_options, time_priority_options)
+            except (ConnectionError, urllib3.exceptions.HTTPError):
+                polling_scheduler.record_failure()
+            else:
+                if on_tickets is not None:
+                    on_tickets(tickets)
+                if not tickets.is_empty():
+                    return tickets
+                polling_scheduler.record(time.perf_counter() - started)
+            polling_scheduler.wait(stop_event)
+        return None
+
+
+class HttpPoller(TimeTablePoller):
+    def __init__(self, url: str, form_body: str, cookies: dict[str, str], user_agent: str | None = None,
+                 pool_maxsize: int = 1, timeout_sec: float = 5.0, seat_changes: SeatChangeFeed | None = None,
+                 search_date: datetime.date | None = None):
+        self._url = url
+        self._form_body = form_body
+        self._cookies = dict(cookies)
+        self._user_agent = user_agent
+        self._timeout_sec = timeout_sec
+        self.search_date = search_date
+        headers = {"Content-Type": "application/x-www-form-urlencoded", "Connection": "keep-alive"}
+        if user_agent:
+            headers["User-Agent"] = user_agent
+        self._http = urllib3.PoolManager(maxsize=pool_maxsize, headers=headers, timeout=timeout_sec,
+                                         retries=False)
+        self.poll_count = 0
+        self._state = TimeTableState(seat_changes)
+        self._fingerprint: int | None = None
+        self._tickets: Ticket | None = None
+
+    @property
+    def seat_changes(self) -> SeatChangeFeed:
+        return self._state.seat_changes
+
+    @classmethod
+    def from_driver(cls, driver: "Chrome", **kwargs) -> "HttpPoller":
+        url, form_body, user_agent = driver.execute_script(SEARCH_FORM_SCRIPT)
+        cookies = {cookie["name"]: cookie["value"] for cookie in driver.get_cookies()}
+        return cls(url, form_body, cookies, user_agent, **kwargs)
+
+    def with_form_fields(self, search_date: datetime.date | None = None, **fields: str) -> "HttpPoller":
+        # 같은 세션으로 조회 조건(예: dptDt, dptTm)만 바꾼 조회기
+        pairs = [(name, fields.get(name, value)) for name, value in parse_qsl(self._form_body, keep_blank_values=True)]
+        return HttpPoller(self._url, urlencode(pairs), self._cookies, self._user_agent, timeout_sec=self._timeout_sec,
+                          search_date=search_date or self.search_date)
+
+    def fetch_rows(self) -> list[list[TicketCell]]:
+        return self._fetch()[0]
+
+    def _fetch(self) -> tuple[list[list[TicketCell]], bool]:
+        cookie_header = "; ".join(f"{name}={value}" for name, value in self._cookies.items())
+        response = self._http.request("POST", self._url, body=self._form_body, headers={
+            **self._http.headers, "Cookie": cookie_header})
+        self.poll_count += 1
+        for set_cookie in response.headers.get_all("Set-Cookie") or []:
+            for name, morsel in SimpleCookie(set_cookie).items():
+                self._cookies[name] = morsel.value
+        if response.status != 200:
+            raise ConnectionError(f"시간표 조회 실패: HTTP {response.status}")
+        # 시간표(tbody) 부분이 직전 응답과 같으면 파싱하지 않는다
+        data = response.data
+        start = data.find(b"<tbody")
+        fingerprint = hash(data[start:data.find(b"</tbody>", start)] if start >= 0 else data)
+        if fingerprint == self._fingerprint:
+            tracer.count("unchanged_time_tables")
+            return self._state.rows, False
+        rows = parse_time_table(data)
+        self._fingerprint = fingerprint
+        is_changed = self._state.update(enumerate(rows), len(rows))
+        return self._state.rows, is_changed
+
+    def poll(self, class_priority_options: ClassPriorityOptions,
+             time_priority_options: TimePriorityOptions) -> Ticket:
+        with tracer.span(POLL_SPAN, source="http") as span:
+            rows, is_changed = self._fetch()
+            if is_changed and self.history is not None:
+                self.history.record(rows, self.search_date or time_priority_options.min_datetime.date())
+            if is_changed or self._tickets is None or not self._tickets.is_empty():
+                self._tickets = Ticket(rows, class_priority_options, time_priority_options, self.search_date)
+            span.set(available=not self._tickets.is_empty())
+        return self._tickets
+
+    @traced
+    def hand_over(self, driver: "Chrome"):
+        for name, value in self._cookies.items():
+            driver.add_cookie({"name": name, "value": value})
+        driver.execute_script(SUBMIT_FORM_SCRIPT, self._url, parse_qsl(self._form_body, keep_blank_values=True))
@@ -0,0 +1,94 @@
+import time
+import weakref
+from typing import Any, Callable
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+from .tracing import LOCATOR_SEC, SLOW_LOCATORS, tracer
+
+SLOW_LOCATOR_SEC = 1.0
+
+# 드라이버별 페이지 로드 세대. 이동/새로고침마다 올라가고, 캐시된 요소는 세대가 바뀌면 다시 찾는다
+_page_generations: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+
+
+def page_generation(driver) -> int:
+    return _page_generations.get(driver, 0)
+
+
+def invalidate_page(driver):
+    _page_generations[driver] = page_generation(driver) + 1
+
+
+def record_locator_time(elapsed_sec: float):
+    # 감싸고 있는 span(poll/reserve)에 더해져 /metrics 에 나온다
+    tracer.count(LOCATOR_SEC, elapsed_sec)
+    if elapsed_sec >= SLOW_LOCATOR_SEC:
+        tracer.count(SLOW_LOCATORS)
+
+
+class Locator:
+    def __init__(self, by: str, value: str, wrapper: Callable[[Any], Any] | None = None):
+        self.by = by
+        self.value = value
+        self.wrapper = wrapper
+        self.key = value
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.key = f"{owner.__name__}.{name}"
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        proxies = page.__dict__.setdefault("_locator_proxies", {})
+        if self not in proxies:
+            proxy = LazyElement(page, self)
+            proxies[self] = self.wrapper(proxy) if self.wrapper is not None else proxy
+        return proxies[self]
+
+    def find(self, page) -> WebElement:
+        cache: dict[Locator, tuple[int, WebElement]] = page.__dict__.setdefault("_element_cache", {})
+        generation = page_generation(page._driver)
+        cached = cache.get(self)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        started = time.perf_counter()
+        elem = page._driver.find_element(self.by, self.value)
+        record_locator_time(time.perf_counter() - started)
+        cache[self] = (generation, elem)
+        return elem
+
+    def forget(self, page):
+        page.__dict__.get("_element_cache", {}).pop(self, None)
+
+
+class LazyElement:
+    # 처음 쓸 때 요소를 찾고, stale 이면 한 번 다시 찾아서 재시도하는 WebElement 대리자
+
+    def __init__(self, page, locator: Locator):
+        self._page = page
+        self._locator = locator
+
+    def unwrap(self) -> WebElement:
+        return self._locator.find(self._page)
+
+    def _refind(self) -> WebElement:
+        self._locator.forget(self._page)
+        return self._locator.find(self._page)
+
+    def __getattr__(self, name: str):
+        try:
+            value = getattr(self.unwrap(), name)
+        except StaleElementReferenceException:
+            value = getattr(self._refind(), name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            try:
+                return value(*args, **kwargs)
+            except StaleElementReferenceException:
+                return getattr(self._refind(), name)(*args, **kwargs)
+        return call
@@ -0,0 +1,123 @@
+import datetime
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass
+from typing import Any, Iterator, MutableMapping
+
+from .custom_types import PassengerOptions, Region, SeatOptions, TicketCell
+
+
+@dataclass(frozen=True)
+class ObservationKey:
+    departure: Region
+    destination: Region
+    date: datetime.date
+    time_block: int
+    passengers: tuple[int, ...]
+    seat: tuple[int, int]
+
+    @classmethod
+    def of(cls, departure: Region, destination: Region, min_datetime: datetime.datetime,
+           passenger_options: PassengerOptions, seat_options: SeatOptions) -> "ObservationKey":
+        # 같은 조회 조건이면 같은 시간표를 보므로, 조회 화면에서 고르는 2시간 단위 블록까지 키에 넣는다
+        hour = min_datetime.hour
+        return cls(departure, destination, min_datetime.date(), hour - hour % 2, astuple(passenger_options),
+                   (int(seat_options.seat_location), int(seat_options.seat_attribute)))
+
+
+class ObservationCache:
+    # 같은 노선/날짜/조건을 보는 작업들이 시간표 하나를 같이 쓴다.
+    # ttl_sec 안에 누가 본 시간표가 있으면 그것을 쓰고, 없으면 임대(lease)를 얻은 한 작업만 조회해서 올린다.
+    # 워커 프로세스끼리 나누려면 multiprocessing Manager 의 dict/Lock 을 넘긴다(shared 참고)
+
+    def __init__(self, ttl_sec: float = 0.5, lease_sec: float = 10.0, evict_after_sec: float = 60.0,
+                 store: MutableMapping | None = None, lock: Any = None):
+        self.ttl_sec = ttl_sec
+        self.lease_sec = lease_sec
+        self.evict_after_sec = evict_after_sec
+        self._store: MutableMapping = store if store is not None else {}
+        self._lock = lock if lock is not None else threading.Lock()
+
+    @classmethod
+    def shared(cls, manager, **kwargs) -> "ObservationCache":
+        return cls(store=manager.dict(), lock=manager.Lock(), **kwargs)
+
+    def fresh_rows(self, key: ObservationKey, now: float | None = None) -> list[list[str]] | None:
+        snapshot = self._store.get(("snapshot", key))
+        if snapshot is None:
+            return None
+        observed_at, rows = snapshot
+        if (now or time.time()) - observed_at > self.ttl_sec:
+            return None
+        return rows
+
+    def acquire(self, key: ObservationKey, owner: str, now: float | None = None) -> bool:
+        now = now or time.time()
+        with self._lock:
+            lease = self._store.get(("lease", key))
+            if lease is not None and lease[0] != owner and lease[1] > now:
+                return False
+            self._store[("lease", key)] = (owner, now + self.lease_sec)
+            return True
+
+    def publish(self, key: ObservationKey, owner: str, rows: list[list[str]]):
+        with self._lock:
+            self._store[("snapshot", key)] = (time.time(), rows)
+            lease = self._store.get(("lease", key))
+            if lease is not None and lease[0] == owner:
+                del self._store[("lease", key)]
+
+    def subscribers(self, key: ObservationKey) -> int:
+        return self._store.get(("subscribers", key), 0)
+
+    def _add_subscriber(self, key: ObservationKey, delta: int):
+        with self._lock:
+            count = self._store.get(("subscribers", key), 0) + delta
+            if count > 0:
+                self._store[("subscribers", key)] = count
+            else:
+                self._store.pop(("subscribers", key), None)
+
+    @contextmanager
+    def subscribe(self, key: ObservationKey, owner: str) -> Iterator["SharedObservation"]:
+        self._add_subscriber(key, 1)
+        try:
+            yield SharedObservation(self, key, owner)
+        finally:
+            self._add_subscriber(key, -1)
+
+    def evict_expired(self, now: float | None = None):
+        # 구독자가 없고 evict_after_sec 동안 갱신되지 않은 시간표와 만료된 임대를 지운다
+        now = now or time.time()
+        with self._lock:
+            for entry in list(self._store.keys()):
+                kind, key = entry
+                value = self._store.get(entry)
+                if value is None:
+                    continue
+                if kind == "snapshot" and now - value[0] > self.evict_after_sec \
+                        and ("subscribers", key) not in self._store:
+                    del self._store[entry]
+                elif kind == "lease" and value[1] <= now:
+                    del self._store[entry]
+
+
+class SharedObservation:
+    def __init__(self, cache: ObservationCache, key: ObservationKey, owner: str):
+        self._cache = cache
+        self.key = key
+        self.owner = owner
+
+    def fresh_rows(self) -> list[list[TicketCell]] | None:
+        rows = self._cache.fresh_rows(self.key)
+        if rows is None:
+            return None
+        return [[TicketCell(text) for text in row] for row in rows]
+
+    def acquire(self) -> bool:
+        return self._cache.acquire(self.key, self.owner)
+
+    def publish(self, rows: list[list[TicketCell]]):
+        # 예약 링크는 각 브라우저의 것이므로 글자만 올린다
+        self._cache.publish(self.key, self.owner, [[cell.text for cell in row] for row in rows])
@@ -0,0 +1,107 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+
+PROFILE_ENV = "SRT_PAGE_PROFILE"
+PROFILE_FORMAT = 1  # 프로필 파일 형식 버전. 페이지 구조 버전(PageProfile.version)과 별개
+
+# Ticket 이 읽는 칸
+TRAIN_NO = "train_no"
+DEPARTURE = "departure"
+DESTINATION = "destination"
+FIRST_CLASS = "first_class"
+STANDARD = "standard"
+FIELDS = (TRAIN_NO, DEPARTURE, DESTINATION, FIRST_CLASS, STANDARD)
+
+# 브라우저에서 프로필의 머리글 XPath 로 머리글 글자를 읽는다
+HEADER_TEXTS_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var texts = [];
+for (var i = 0; i < result.snapshotLength; i++) texts.push(result.snapshotItem(i).textContent.trim());
+return texts;
+"""
+
+
+class ProfileMismatch(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Column:
+    index: int
+    header: str  # 이 칸의 머리글. 페이지와 다르면 구조가 바뀐 것으로 본다
+
+
+@dataclass(frozen=True)
+class PageProfile:
+    # 시간표 페이지 구조. 선택자는 XPath 라서 lxml 과 브라우저(document.evaluate)에서 그대로 쓴다
+    version: str
+    rows: str
+    headers: str
+    columns: dict[str, Column]
+    station: str  # 역 칸(출발역/도착역) 안에서 역 이름
+    time: str  # 역 칸 안에서 시각(HH:MM)
+
+    def __post_init__(self):
+        missing = [name for name in FIELDS if name not in self.columns]
+        if missing:
+            raise ValueError(f"page profile {self.version} has no column for {', '.join(missing)}")
+
+    def index(self, name: str) -> int:
+        return self.columns[name].index
+
+    @property
+    def width(self) -> int:
+        return max(column.index for column in self.columns.values()) + 1
+
+    def validate(self, headers: list[str] | tuple[str, ...]):
+        for name, column in self.columns.items():
+            actual = headers[column.index].strip() if column.index < len(headers) else None
+            if actual != column.header:
+                raise ProfileMismatch(f"시간표 구조가 프로필({self.version})과 다릅니다: "
+                                      f"{column.index}번째 칸({name}) 머리글 {column.header!r} 예상, {actual!r} 있음")
+
+    def to_dict(self) -> dict:
+        return {"format": PROFILE_FORMAT, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PageProfile":
+        if data.get("format") != PROFILE_FORMAT:
+            raise ValueError(f"unsupported page profile format: {data.get('format')}")
+        return cls(data["version"], data["rows"], data["headers"],
+                   {name: Column(**column) for name, column in data["columns"].items()},
+                   data["station"], data["time"])
+
+    @classmethod
+    def load(cls, path: str) -> "PageProfile":
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+
+
+SRT_TIME_TABLE_V1 = PageProfile(
+    version="srt-time-table/1",
+    rows="//tbody/tr",
+    headers="//thead/tr/th",
+    columns={
+        TRAIN_NO: Column(2, "열차번호"),
+        DEPARTURE: Column(3, "출발역"),
+        DESTINATION: Column(4, "도착역"),
+        FIRST_CLASS: Column(5, "특실"),
+        STANDARD: Column(6, "일반실"),
+    },
+    station="./div",
+    time="./em[contains(@class, 'time')]",
+)
+
+
+def active_profile() -> PageProfile:
+    # 페이지가 바뀌면 코드 대신 SRT_PAGE_PROFILE 에 새 프로필(json) 경로를 준다
+    path = os.environ.get(PROFILE_ENV)
+    return PageProfile.load(path) if path else SRT_TIME_TABLE_V1
+
+
+TIME_TABLE_PROFILE = active_profile()
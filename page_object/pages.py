@@ -1,31 +1,102 @@
 import datetime
+import threading
 import time
 from abc import ABC
-from dataclasses import fields
-from typing import get_args
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Callable, get_args
+from urllib.parse import urlsplit
 
-from custom_types import (ClassPriorityOptions, Passenger, PassengerOptions,
-                          PassengerSelect, Region, SeatAttribute, SeatLocation,
-                          Select, Ticket, TimePriorityOptions)
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
 from selenium.webdriver import Chrome
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select as SeleniumSelect
 from selenium.webdriver.support.ui import WebDriverWait
 
+from . import checkout
+from .checkout import Checkout, CheckoutAttempt
+from .custom_types import (ClassPriorityOptions, Passenger, PassengerOptions, Region, SeatAttribute, SeatLocation,
+                           Ticket, TicketCell, TicketRow, TimePriorityOptions)
+from .http_poller import TimeTablePoller
+from .locators import LazyElement, Locator, invalidate_page
+from .observation_cache import SharedObservation
+from .page_profile import HEADER_TEXTS_SCRIPT, TIME_TABLE_PROFILE
+from .polling import PollingPolicy, PollingScheduler
+from .seat_changes import SeatChangeFeed, TimeTableWatcher
+from .tracing import POLL_SPAN, QUEUE_WAIT_SPAN, traced, tracer
+
+if TYPE_CHECKING:
+    from .history import HistoryRecorder
+    from .scoring import CandidateScorer
+
 SRT_LOGIN_PAGE_URL = r"https://etk.srail.kr/cmc/01/selectLoginForm.do?pageId=TK0701000000"
 SRT_SELECT_SCHEDULE_PAGE_URL = r"https://etk.srail.kr/hpg/hra/01/selectScheduleList.do?pageId=TK0101010000"
 SRT_TICKETING_PAGE_URL = r"https://etk.srail.kr/hpg/hra/02/selectReservationList.do?pageId=TK0102010000"
 SRT_MAIN_URL = r"https://etk.srail.kr/main.do"
 POP_UP_VISIBLE_EXPLICIT_WAIT_TIME = 3
 POP_UP_INVISIBLE_EXPLICIT_WAIT_TIME = 10
+TIME_TABLE_WAIT_TIME = POP_UP_VISIBLE_EXPLICIT_WAIT_TIME + POP_UP_INVISIBLE_EXPLICIT_WAIT_TIME
+
+
+class Select(SeleniumSelect):
+    @property
+    def elem_options(self) -> list[WebElement]:
+        return self.options
+
+    @property
+    def text_options(self) -> list[str]:
+        return [elem.text for elem in self.options]
+
+
+@dataclass
+class PassengerSelect(Passenger[Select]):
+    pass
+
+
+def rebase_url(url: str, base_url: str | None) -> str:
+    # 같은 경로를 다른 호스트(로컬 대역 서버 등)로 보낸다
+    if base_url is None:
+        return url
+    parts = urlsplit(url)
+    return base_url.rstrip("/") + parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+# 조회 전 현재 시간표를 표시해 두고, 새 시간표가 채워지고 NetFunnel 대기열 팝업이 닫히는 순간 끝나는 대기
+MARK_STALE_TIME_TABLE_SCRIPT = """
+Array.prototype.forEach.call(document.getElementsByTagName("tbody"), function (tbody) {
+    tbody.setAttribute("data-stale", "");
+});
+"""
+WAIT_FOR_TIME_TABLE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+function ready() {
+    var popup = document.getElementById("NetFunnel_Loading_Popup");
+    if (popup !== null) {
+        var style = getComputedStyle(popup);
+        if (style.display !== "none" && style.visibility !== "hidden") return false;
+    }
+    var tbody = document.querySelector("tbody:not([data-stale])");
+    return tbody !== null && tbody.rows.length > 0;
+}
+if (ready()) { done(true); return; }
+var observer = new MutationObserver(function () { if (ready()) finish(true); });
+var timer = setTimeout(function () { finish(false); }, arguments[0]);
+function finish(result) {
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+observer.observe(document.documentElement,
+                 {childList: true, subtree: true, attributes: true, attributeFilter: ["style", "class"]});
+"""
 
 
 class BasePage(ABC):
     def __init__(self, driver: Chrome):
         self._driver = driver
         self._driver.implicitly_wait(10)
+        self.last_queue_wait_sec: float | None = None
 
     def is_alert_present(self) -> bool:
         try:
@@ -34,24 +105,53 @@ class BasePage(ABC):
         except Exception:
             return False
 
-    def _get_select(self, xpath: str):
-        elem = self._driver.find_element(By.XPATH, xpath)
-        return Select(elem)
+    def accept_alert(self) -> str | None:
+        if not self.is_alert_present():
+            return None
+        alert = self._driver.switch_to.alert
+        text = alert.text
+        alert.accept()
+        return text
+
+    def _navigate(self, url: str):
+        self._driver.get(url)
+        invalidate_page(self._driver)
+
+    def _refresh(self):
+        self._driver.refresh()
+        invalidate_page(self._driver)
+
+    def _click_and_wait_for_time_table(self, button: WebElement | LazyElement) -> float:
+        self._driver.execute_script(MARK_STALE_TIME_TABLE_SCRIPT)
+        started = time.perf_counter()
+        deadline = started + TIME_TABLE_WAIT_TIME
+        self._driver.set_script_timeout(TIME_TABLE_WAIT_TIME + 1)
+        button.click()
+        with tracer.span(QUEUE_WAIT_SPAN):
+            while (remaining := deadline - time.perf_counter()) > 0:
+                try:
+                    self._driver.execute_async_script(WAIT_FOR_TIME_TABLE_SCRIPT, int(remaining * 1000))
+                    break
+                except WebDriverException:  # 대기 중에 페이지가 이동하면 새 페이지에서 다시 기다린다
+                    continue
+        invalidate_page(self._driver)
+        queue_wait_sec = time.perf_counter() - started
+        self.last_queue_wait_sec = queue_wait_sec
+        return queue_wait_sec
 
 
 class LoginPage(BasePage):
+    _id_input_box = Locator(By.XPATH, "//*[@id='srchDvNm01']")
+    _pw_input_box = Locator(By.XPATH, "//*[@id='hmpgPwdCphd01']")
+    _confirm_button = Locator(By.XPATH, "//*[@id='srchDvNm01']/following::input[@type='submit'][1]")
+
     def __init__(self, driver: Chrome, url: str = SRT_LOGIN_PAGE_URL):
         BasePage.__init__(self, driver)
         self._url = url
-        _id_input_box_xpath = "//*[@id='srchDvNm01']"
-        self._id_input_box = self._driver.find_element(By.XPATH, _id_input_box_xpath)
-        _pw_input_box_xpath = "//*[@id='hmpgPwdCphd01']"
-        self._pw_input_box = self._driver.find_element(By.XPATH, _pw_input_box_xpath)
-        _confirm_button_xpath = "/html/body/div/div[4]/div/div[2]/form/fieldset/div[1]/div[1]/div[2]/div/div[2]/input"
-        self._confirm_button = self._driver.find_element(By.XPATH, _confirm_button_xpath)
 
+    @traced
     def login(self, account_id: str, pw: str):
-        self._driver.get(self._url)
+        self._navigate(self._url)
         if len(account_id) != 10 or not account_id.isdigit():
             raise ValueError
         self._pw_input_box.send_keys(pw)
@@ -65,48 +165,43 @@ class LoginPage(BasePage):
 
 
 class SelectSchedulePage(BasePage):
+    _dep_input_box = Locator(By.XPATH, "//*[@id='dptRsStnCdNm']")
+    _dst_input_box = Locator(By.XPATH, "//*[@id='arvRsStnCdNm']")
+    _date_select = Locator(By.XPATH, "//*[@id='dptDt']", Select)
+    _time_select = Locator(By.XPATH, "//*[@id='dptTm']", Select)
+    _adult_select = Locator(By.XPATH, "//select[@name='psgInfoPerPrnb1']", Select)
+    _children_select = Locator(By.XPATH, "//select[@name='psgInfoPerPrnb5']", Select)
+    _elder_select = Locator(By.XPATH, "//select[@name='psgInfoPerPrnb4']", Select)
+    _severe_select = Locator(By.XPATH, "//select[@title='중증장애인 인원수 선택']", Select)
+    _mild_select = Locator(By.XPATH, "//select[@title='경증장애인 인원수 선택']", Select)
+    seat_loc_select = Locator(By.XPATH, "//select[@title='좌석위치 선택']", Select)
+    seat_attr_select = Locator(By.XPATH, "//select[@title='좌석속성 선택']", Select)
+    _search_button = Locator(By.XPATH, "//input[@value='조회하기']")
+
     def __init__(self, driver: Chrome, url: str = SRT_SELECT_SCHEDULE_PAGE_URL):
         BasePage.__init__(self, driver)
         self._url = url
-        _dep_input_box_xpath = "//*[@id='dptRsStnCdNm']"
-        self._dep_input_box = self._driver.find_element(By.XPATH, _dep_input_box_xpath)
-        self._dep_input_box.clear()
-        _dst_input_box_xpath = "//*[@id='arvRsStnCdNm']"
-        self._dst_input_box = self._driver.find_element(By.XPATH, _dst_input_box_xpath)
-        self._dst_input_box.clear()
 
-        _date_select_xpath = "//*[@id='dptDt']"
-        self._date_select = self._get_select(_date_select_xpath)
-        _time_select_xpath = "//*[@id='dptTm']"
-        self._time_select = self._get_select(_time_select_xpath)
-
-        _adult_select_xpath = "//select[@name='psgInfoPerPrnb1']"
-        _children_select_xpath = "//select[@name='psgInfoPerPrnb5']"
-        _elder_select_xpath = "//select[@name='psgInfoPerPrnb4']"
-        _severe_select_xpath = "//select[@title='중증장애인 인원수 선택']"
-        _mild_select_xpath = "//select[@title='경증장애인 인원수 선택']"
-        self._passenger_selects = PassengerSelect(self._get_select(_adult_select_xpath),
-                                                  self._get_select(_children_select_xpath),
-                                                  self._get_select(_elder_select_xpath),
-                                                  self._get_select(_severe_select_xpath),
-                                                  self._get_select(_mild_select_xpath),
-                                                  )
-
-        _seat_location_xpath = "//select[@title='좌석위치 선택']"
-        _seat_attr_xpath = "//select[@title='좌석속성 선택']"
-        self.seat_loc_select = self._get_select(_seat_location_xpath)
-        self.seat_attr_select = self._get_select(_seat_attr_xpath)
-
-        _search_button_xpath = "//input[@value='조회하기']"
-        self._search_button = self._driver.find_element(By.XPATH, _search_button_xpath)
+    @property
+    def _passenger_selects(self) -> PassengerSelect:
+        return PassengerSelect(adult=self._adult_select,
+                               elder=self._elder_select,
+                               child=self._children_select,
+                               severe_disabled=self._severe_select,
+                               mild_disabled=self._mild_select,
+                               )
 
+    @traced
     def enter_region(self, dep: Region, dst: Region):
-        self._driver.get(self._url)
         if dep not in get_args(Region) or dst not in get_args(Region):
-            ValueError("지역 이상함;")
+            raise ValueError("지역 이상함;")
+        self._navigate(self._url)
+        self._dep_input_box.clear()
         self._dep_input_box.send_keys(dep)
+        self._dst_input_box.clear()
         self._dst_input_box.send_keys(dst)
 
+    @traced
     def select_date_time(self, date_time: datetime.datetime):
         if datetime.datetime.today().date() > date_time.date():
             raise ValueError
@@ -120,6 +215,7 @@ class SelectSchedulePage(BasePage):
         time_idx = time_list.index(f"{dep_time:02d}")
         self._time_select.select_by_index(time_idx)
 
+    @traced
     def select_passenger(self, pessanger_count: PassengerOptions) -> None:
         for f in fields(Passenger):
             cnt: int = getattr(pessanger_count, f.name)
@@ -128,82 +224,274 @@ class SelectSchedulePage(BasePage):
             select: Select = getattr(self._passenger_selects, f.name)
             select.select_by_index(cnt)
 
+    @traced
     def select_seat_type(self, location: SeatLocation = SeatLocation.default,
                          attribute: SeatAttribute = SeatAttribute.default):
         self.seat_loc_select.select_by_index(location.value)
         self.seat_attr_select.select_by_index(attribute.value)
 
-    def search(self):
-        self._search_button.click()
-        popup_xpath = "//*[@id=\"NetFunnel_Loading_Popup\"]"
-        try:
-            # 요소가 나타날 때까지 대기
-            popup_xpath = "//*[@id=\"NetFunnel_Loading_Popup\"]"
-            WebDriverWait(self._driver, POP_UP_VISIBLE_EXPLICIT_WAIT_TIME).until(
-                EC.presence_of_element_located((By.XPATH, popup_xpath))
-            )
-            # 요소가 사라질 때까지 대기
-            WebDriverWait(self._driver, POP_UP_INVISIBLE_EXPLICIT_WAIT_TIME).until(
-                EC.invisibility_of_element((By.XPATH, popup_xpath))
-            )
-        except BaseException:
-            pass
+    @traced
+    def search(self) -> float:
+        return self._click_and_wait_for_time_table(self._search_button)
 
 
 class TimeTablePage(BasePage):
-    def __init__(self, driver: Chrome):
+    _table_body = Locator(By.XPATH, "//tbody")
+    _research_button = Locator(By.XPATH, "//*[@id=\"search_top_tag\"]/input")
+
+    def __init__(self, driver: Chrome, ticketing_url: str = SRT_TICKETING_PAGE_URL,
+                 seat_changes: SeatChangeFeed | None = None, fast_checkout: bool = True, max_candidates: int = 3):
         self._driver = driver
-        self._table_body_xpath = "//tbody"
-        self._ticking_page = TicketingPage(self._driver)
+        self._ticking_page = TicketingPage(self._driver, ticketing_url)
+        # 한 시간표에서 순위대로 시도할 후보 수
+        self._max_candidates = max_candidates
+        # 페이지를 떠나지 않고 예약 응답으로 성공/실패를 판단한다. 끄면 클릭 후 예약 확인 페이지로 확인한다
+        self._checkout = Checkout(driver, max_candidates) if fast_checkout else None
+        self.last_queue_wait_sec: float | None = None
+        self._watcher = TimeTableWatcher(seat_changes)
+        self._profile_checked = False
+        self._tickets: Ticket | None = None
+        self._search_date: datetime.date | None = None
+        # 조회할 때마다 조건으로 거른 결과를 받는다(조회 경로와 상관없이. 진행 상황 표시용)
+        self.on_tickets: Callable[[Ticket], None] | None = None
+        # 켜 두면 바뀐 시간표를 모두 기록한다(자리가 풀리는 시점 분석용)
+        self.history: "HistoryRecorder | None" = None
+        self._last_shared_texts: list[list[str]] | None = None
+        # 예약 확인 페이지로 떠났다가 시간표로 돌아오는 방법(조회 폼을 다시 보낸다). 없으면 브라우저 뒤로 가기
+        self.research: Callable[[], float] | None = None
+        self._hands_over = False
+
+    @property
+    def seat_changes(self) -> SeatChangeFeed:
+        return self._watcher.seat_changes
 
     def run(self, class_priority_options: ClassPriorityOptions,
-            time_priority_options: TimePriorityOptions, refresh_cycle_sec: float = 0.5):
-        while True:
-            tickets = self._get_tickets(class_priority_options, time_priority_options)
+            time_priority_options: TimePriorityOptions, refresh_cycle_sec: float = 0.5,
+            http_poller: TimeTablePoller | None = None, stop_event: threading.Event | None = None,
+            polling_scheduler: PollingScheduler | None = None,
+            observation: SharedObservation | None = None,
+            scorer: "CandidateScorer | None" = None) -> bool:
+        if polling_scheduler is None:
+            polling_scheduler = PollingScheduler(PollingPolicy(interval_sec=refresh_cycle_sec), time_priority_options)
+        self._hands_over = http_poller is not None
+        refresh_before_poll = False
+        while (stop_event is None or not stop_event.is_set()) and not polling_scheduler.should_stop():
+            if http_poller is not None:
+                # 빈자리가 보일 때까지 브라우저 없이 조회한 뒤 Selenium 세션으로 넘긴다
+                if http_poller.wait_for_seats(class_priority_options, time_priority_options, polling_scheduler,
+                                              stop_event, self.on_tickets) is None:
+                    break
+                self._hand_over(http_poller)
+            elif observation is not None:
+                # 다른 작업이 방금 본 시간표가 있으면 그것으로 판단하고, 자리가 보일 때만 내 브라우저로 조회한다
+                shared_rows = observation.fresh_rows()
+                if shared_rows is not None:
+                    tracer.count("shared_observations")
+                    self._record_shared(shared_rows, time_priority_options)
+                    shared_tickets = Ticket(shared_rows, class_priority_options, time_priority_options)
+                    self._report(shared_tickets)
+                    if shared_tickets.is_empty():
+                        polling_scheduler.wait(stop_event)
+                        continue
+                elif not observation.acquire():
+                    polling_scheduler.wait(stop_event)  # 다른 작업이 조회 중
+                    continue
+                if refresh_before_poll:
+                    self._refresh()
+            started = time.perf_counter()
+            with tracer.span(POLL_SPAN, source="browser") as poll:
+                tickets = self._get_tickets(class_priority_options, time_priority_options)
+                self._report(tickets)
+                poll.set(available=not tickets.is_empty())
+                if observation is not None and http_poller is None:
+                    observation.publish(self._watcher.rows)
+                    refresh_before_poll = True
+                elif tickets.is_empty() and http_poller is None:
+                    self._refresh()
             if tickets.is_empty():
-                self._driver.refresh()
-                time.sleep(refresh_cycle_sec)
+                if http_poller is None:
+                    polling_scheduler.record(time.perf_counter() - started)
+                    polling_scheduler.wait(stop_event)
             else:
-                sorted_ticket = tickets.sorted_by_priority()
-                best_ticket: WebElement = sorted_ticket["ticket"].iloc[0]
-                reservation_button = best_ticket.find_element(By.TAG_NAME, "a")
-                reservation_button.click()
-                if self.is_alert_present():
-                    alert = self._driver.switch_to.alert
-                    alert.accept()
-                if self._ticking_page.validate():
+                if stop_event is not None and stop_event.is_set():
+                    # 조회하는 동안 취소되었거나, 같은 여정을 잡던 다른 계정이 이미 예약했다
                     break
+                with tracer.span("rank"):
+                    sorted_ticket = http_poller.rank(tickets) if http_poller is not None \
+                        else tickets.sorted_by_priority()
+                    if scorer is not None:
+                        # 지난 시도에서 자주 실패한 열차/객실과 인원수·좌석 속성상 잡기 어려운 칸을 뒤로 미룬다
+                        sorted_ticket = scorer.rank(sorted_ticket)
+                if self._checkout is not None:
+                    with tracer.span("checkout") as checkout_span:
+                        try:
+                            attempts = self._checkout.try_candidates(sorted_ticket)
+                        except StaleElementReferenceException:
+                            self._watcher.reset()
+                            continue
+                        except WebDriverException:
+                            attempts = [CheckoutAttempt(sorted_ticket[0], checkout.ERROR, "")]
+                        checkout_span.set(attempts=len(attempts))
+                    if scorer is not None:
+                        for attempt in attempts:
+                            if attempt.outcome in (checkout.RESERVED, checkout.SOLD_OUT):
+                                scorer.record(attempt.row, attempt.outcome == checkout.RESERVED)
+                    if not attempts:
+                        # 누를 링크가 없다. 같은 스냅샷을 곧바로 다시 보지 않도록 기다렸다가 새 시간표를 받는다
+                        self._wait_for_next_snapshot(polling_scheduler, stop_event, started,
+                                                     refresh=http_poller is None and observation is None)
+                        continue
+                    outcome = attempts[-1].outcome
+                    if outcome == checkout.RESERVED:
+                        return True
+                    if outcome == checkout.SOLD_OUT:
+                        # 이 스냅샷의 후보가 모두 팔렸다. 페이지는 그대로이므로 새 시간표를 받아 다시 본다
+                        if http_poller is None:
+                            self._wait_for_next_snapshot(polling_scheduler, stop_event, started,
+                                                         refresh=observation is None)
+                        continue
+                    if outcome == checkout.UNSUPPORTED:
+                        # 링크가 폼을 보내지 않는 페이지. 이미 눌렀으므로 확인만 하고 이후로는 클릭으로 예약한다
+                        self._checkout = None
+                        self.accept_alert()
+                        if self._validate_reservation():
+                            return True
+                        continue
+                    if outcome in (checkout.UNKNOWN, checkout.ERROR):
+                        self.accept_alert()
+                        if self._validate_reservation():
+                            return True
+                        continue
+                with tracer.span("reserve_click") as click_span:
+                    outcome = self._click_candidates(sorted_ticket, scorer)
+                    click_span.set(outcome=outcome)
+                if outcome == checkout.RESERVED:
+                    return True
+                if outcome == checkout.SOLD_OUT and http_poller is None:
+                    self._wait_for_next_snapshot(polling_scheduler, stop_event, started, refresh=observation is None)
+                elif outcome in (checkout.UNKNOWN, checkout.NO_CANDIDATES):
+                    # 판단이 안 되거나 누를 링크가 없다. 조회 경로와 상관없이 기다렸다가 다시 본다
+                    self._wait_for_next_snapshot(polling_scheduler, stop_event, started,
+                                                 refresh=http_poller is None and observation is None)
+        return False
+
+    def _report(self, tickets: Ticket):
+        if self.on_tickets is not None:
+            self.on_tickets(tickets)
+
+    def _record_shared(self, rows: list[list[TicketCell]], time_priority_options: TimePriorityOptions):
+        # 다른 작업이 본 시간표로 판단할 때도 기록한다. 같은 스냅샷을 여러 번 받으므로 바뀐 것만 남긴다
+        if self.history is None:
+            return
+        texts = [[cell.text for cell in row] for row in rows]
+        if texts != self._last_shared_texts:
+            self._last_shared_texts = texts
+            self.history.record(rows, self._search_date or time_priority_options.min_datetime.date())
+
+    def _wait_for_next_snapshot(self, polling_scheduler: PollingScheduler, stop_event: threading.Event | None,
+                                started: float, refresh: bool):
+        polling_scheduler.record(time.perf_counter() - started)
+        polling_scheduler.wait(stop_event)
+        if refresh:
+            self._refresh()
+
+    def _click_candidates(self, ranked_rows: list[TicketRow], scorer: "CandidateScorer | None") -> str:
+        # 순위대로 예약 링크를 누른다. 자리가 없다는 안내만 뜨고 시간표에 그대로 있으면
+        # 시간표를 다시 읽지 않고 같은 스냅샷의 다음 후보를 누른다
+        rows = [row for row in ranked_rows if row.cell.link is not None][:self._max_candidates]
+        for idx, row in enumerate(rows):
+            try:
+                row.cell.link.click()
+            except StaleElementReferenceException:
+                if idx == 0:
+                    # 바뀌지 않은 행의 링크는 이전 페이지의 것일 수 있으므로 전부 다시 받는다
+                    self._watcher.reset()
+                    return checkout.UNKNOWN
+                return self._validate_after_leaving()
+            tracer.count("reserve_clicks")
+            alert_text = self.accept_alert()
+            if alert_text is not None and any(marker in alert_text for marker in checkout.FAILURE_MARKERS):
+                if scorer is not None:
+                    scorer.record(row, False)
+                continue
+            reserved = self._validate_reservation()
+            if scorer is not None:
+                scorer.record(row, reserved)
+            return checkout.RESERVED if reserved else checkout.UNKNOWN
+        if not rows:
+            return checkout.NO_CANDIDATES
+        try:
+            rows[-1].cell.link.is_enabled()  # 안내 뒤에도 시간표에 그대로 있는지
+        except StaleElementReferenceException:
+            return self._validate_after_leaving()
+        return checkout.SOLD_OUT
+
+    def _validate_after_leaving(self) -> str:
+        # 안내 뒤 페이지가 바뀌었다. 이전처럼 예약 확인 페이지로 확인한다
+        return checkout.RESERVED if self._validate_reservation() else checkout.UNKNOWN
+
+    def _validate_reservation(self) -> bool:
+        # 예약 확인 페이지로 가서 확인한다. 예약이 안 됐으면 시간표로 돌아와 다음 조회를 이어 간다
+        if self._ticking_page.validate():
+            return True
+        self._return_to_time_table()
+        return False
+
+    def _return_to_time_table(self):
+        self._watcher.reset()
+        self._tickets = None
+        if self._hands_over:
+            return  # 다음 조회에서 HTTP 조회 결과를 브라우저로 다시 넘기면서 시간표로 돌아간다
+        with tracer.span("return_to_time_table"):
+            if self.research is not None:
+                self.research()
+            else:
+                self._driver.back()
+                invalidate_page(self._driver)
+
+    @traced
+    def _hand_over(self, http_poller: TimeTablePoller):
+        old_page = self._driver.find_element(By.TAG_NAME, "html")
+        self._search_date = http_poller.search_date
+        http_poller.hand_over(self._driver)
+        WebDriverWait(self._driver, POP_UP_INVISIBLE_EXPLICIT_WAIT_TIME).until(EC.staleness_of(old_page))
+        invalidate_page(self._driver)
 
+    @traced
     def _get_tickets(self, class_priority_options: ClassPriorityOptions, time_priority_options: TimePriorityOptions) -> Ticket:
         try:
-            table_elem = self._driver.find_element(By.XPATH, self._table_body_xpath)
+            table_elem = self._table_body.unwrap()
         except NoSuchElementException:
-            search_button = self._driver.find_element(By.XPATH, "//*[@id=\"search_top_tag\"]/input")
-            search_button.click()
-            try:
-                popup_xpath = "//*[@id=\"NetFunnel_Loading_Popup\"]"
-                WebDriverWait(self._driver, POP_UP_VISIBLE_EXPLICIT_WAIT_TIME).until(
-                    EC.presence_of_element_located((By.XPATH, popup_xpath))
-                )
-                WebDriverWait(self._driver, POP_UP_INVISIBLE_EXPLICIT_WAIT_TIME).until(
-                    EC.invisibility_of_element((By.XPATH, popup_xpath))
-                )
-            except BaseException:
-                pass
-            table_elem = self._driver.find_element(By.XPATH, self._table_body_xpath)
-        tickets = Ticket(table_elem, class_priority_options, time_priority_options)
-        return tickets
+            self._click_and_wait_for_time_table(self._research_button)
+            table_elem = self._table_body.unwrap()
+        if not self._profile_checked:
+            # 칸 위치가 바뀐 페이지를 엉뚱한 칸으로 읽지 않도록 처음 한 번 머리글을 프로필과 맞춰 본다
+            TIME_TABLE_PROFILE.validate(self._driver.execute_script(HEADER_TEXTS_SCRIPT, TIME_TABLE_PROFILE.headers))
+            self._profile_checked = True
+        # 시간표가 그대로이고 직전 결과가 비어 있었다면 다시 거를 필요가 없다
+        is_changed = self._watcher.update(table_elem)
+        if is_changed and self.history is not None:
+            self.history.record(self._watcher.rows, self._search_date or time_priority_options.min_datetime.date())
+        if is_changed or self._tickets is None or not self._tickets.is_empty():
+            self._tickets = Ticket(self._watcher.rows, class_priority_options, time_priority_options,
+                                   self._search_date)
+        else:
+            tracer.count("unchanged_time_tables")
+        return self._tickets
 
 
 class TicketingPage(BasePage):
+    _reservation_list = Locator(By.XPATH, "//*[@id=\"list-form\"]/fieldset/div[2]")
+
     def __init__(self, driver: Chrome, url: str = SRT_TICKETING_PAGE_URL):
         BasePage.__init__(self, driver)
         self._url = url
 
+    @traced
     def validate(self):
-        self._driver.get(self._url)
+        self._navigate(self._url)
         try:
-            self._driver.find_element(By.XPATH, "//*[@id=\"list-form\"]/fieldset/div[2]")
+            self._reservation_list.unwrap()
             return False
         except NoSuchElementException:
             return True
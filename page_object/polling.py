@@ -0,0 +1,100 @@
+import datetime
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from .custom_types import BOOKING_CUTOFF, TimePriorityOptions
+
+SRT_OPEN_TIME = datetime.time(7, 0)  # 매일 한 달 뒤 열차의 승차권이 열리는 시각
+
+
+@dataclass
+class BurstWindow:
+    at: datetime.time
+    before: datetime.timedelta = datetime.timedelta(minutes=1)
+    after: datetime.timedelta = datetime.timedelta(minutes=5)
+    interval_sec: float = 0.2
+
+    def contains(self, now: datetime.datetime) -> bool:
+        # 창이 자정을 넘을 수 있으므로 어제/오늘/내일 기준 시각을 모두 본다
+        for days in (-1, 0, 1):
+            center = datetime.datetime.combine(now.date() + datetime.timedelta(days=days), self.at)
+            if center - self.before <= now <= center + self.after:
+                return True
+        return False
+
+
+def release_windows(release_times: Iterable[datetime.time] = ()) -> list[BurstWindow]:
+    # 승차권이 열리는 시각과 주어진 시각(미결제 예약이 풀리는 시각 등) 앞뒤로 짧은 간격으로 조회한다
+    return [BurstWindow(at) for at in dict.fromkeys((SRT_OPEN_TIME, *release_times))]
+
+
+@dataclass
+class PollingPolicy:
+    interval_sec: float = 0.5
+    jitter_ratio: float = 0.2
+    backoff_factor: float = 2.0
+    max_interval_sec: float = 30.0
+    slow_response_sec: float = 3.0
+    burst_windows: list[BurstWindow] = field(default_factory=release_windows)
+
+
+class PollingScheduler:
+    def __init__(self, policy: PollingPolicy | None = None, time_priority_options: TimePriorityOptions | None = None,
+                 rng: random.Random | None = None):
+        self._policy = policy or PollingPolicy()
+        self._time_priority_options = time_priority_options
+        self._rng = rng or random.Random()
+        self._backoff_level = 0
+        # 조회 한 번마다 wait 가 한 번 불리므로 그 횟수를 조회 횟수로 센다
+        self.polls = 0
+        self.on_wait: Callable[[int], None] | None = None
+
+    @property
+    def backoff_level(self) -> int:
+        return self._backoff_level
+
+    def record(self, elapsed_sec: float):
+        if elapsed_sec >= self._policy.slow_response_sec:
+            self.record_failure()
+        else:
+            self._backoff_level = 0
+
+    def record_failure(self):
+        # 서버가 느리거나 요청을 거부하면 지수적으로 간격을 늘린다
+        self._backoff_level += 1
+
+    def next_delay(self, now: datetime.datetime | None = None) -> float:
+        now = now or datetime.datetime.now()
+        interval = self._policy.interval_sec
+        for window in self._policy.burst_windows:
+            if window.contains(now):
+                interval = min(interval, window.interval_sec)
+        if self._backoff_level:
+            backoff = self._policy.interval_sec * self._policy.backoff_factor ** self._backoff_level
+            interval = max(interval, min(backoff, self._policy.max_interval_sec))
+        jitter = self._policy.jitter_ratio
+        return interval * self._rng.uniform(1 - jitter, 1 + jitter)
+
+    def should_stop(self, now: datetime.datetime | None = None) -> bool:
+        # max_datetime 이 출발 20분 전 마감을 지나면 더 이상 잡을 수 있는 열차가 없다
+        if self._time_priority_options is None or self._time_priority_options.max_datetime is None:
+            return False
+        now = now or datetime.datetime.now()
+        return now + BOOKING_CUTOFF >= self._time_priority_options.max_datetime
+
+    def next_wait(self) -> float:
+        # 조회 한 번을 세고 다음 조회까지 기다릴 시간을 돌려준다
+        self.polls += 1
+        if self.on_wait is not None:
+            self.on_wait(self.polls)
+        return self.next_delay()
+
+    def wait(self, stop_event: threading.Event | None = None):
+        delay = self.next_wait()
+        if stop_event is None:
+            time.sleep(delay)
+        else:
+            stop_event.wait(delay)
@@ -0,0 +1,137 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import urllib3
+
+from .custom_types import STATION_CODES, ClassPriorityOptions, RouteOption, Ticket, TicketRow, TimePriorityOptions
+from .http_poller import HttpPoller, TimeTablePoller
+from .search_plan import FanOutPoller, SearchBlock
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome
+
+    from .history import HistoryRecorder
+
+
+@dataclass
+class ScoreWeights:
+    class_priority: float = 1.0  # 객실 우선순위 한 단계
+    hours_off: float = 0.25  # 원하는 시각에서 1시간 멀어질 때 깎는 점수
+    route: float = 1.0  # 노선 weight 1.0
+
+
+def unique_routes(routes: list[RouteOption]) -> list[RouteOption]:
+    # 역 코드가 같은 노선(예: 울산/울산(통도사))은 같은 시간표를 받으므로 한 번만 조회한다. weight 가 큰 쪽을 남긴다
+    by_codes: dict[tuple[str, str], RouteOption] = {}
+    for route in routes:
+        codes = (STATION_CODES[route.departure], STATION_CODES[route.destination])
+        if codes not in by_codes or route.weight > by_codes[codes].weight:
+            by_codes[codes] = route
+    return list(by_codes.values())
+
+
+def candidate_score(row: TicketRow, class_priority_options: ClassPriorityOptions,
+                    time_priority_options: TimePriorityOptions, weights: ScoreWeights) -> float:
+    # 객실 우선순위, best_datetime(없으면 정렬 방향의 시작점)과의 거리, 노선 선호를 한 점수로 합친다.
+    # prefer_time 이면 Ticket.sorted_by_priority 처럼 객실은 보지 않는다
+    if time_priority_options.best_datetime is not None:
+        off = abs(row.time - time_priority_options.best_datetime)
+    elif time_priority_options.ascendig or time_priority_options.max_datetime is None:
+        off = row.time - time_priority_options.min_datetime
+    else:
+        off = time_priority_options.max_datetime - row.time
+    route_weight = row.route.weight if row.route is not None else 1.0
+    class_priority = 0 if time_priority_options.prefer_time else getattr(class_priority_options, row.seat_class)
+    return (weights.class_priority * class_priority
+            - weights.hours_off * off / datetime.timedelta(hours=1)
+            + weights.route * route_weight)
+
+
+def rank_by_score(tickets: Ticket, class_priority_options: ClassPriorityOptions,
+                  time_priority_options: TimePriorityOptions, weights: ScoreWeights) -> list[TicketRow]:
+    rows = tickets.standard + tickets.standard_standing + tickets.first_class + tickets.first_class_standing
+    return sorted(rows, key=lambda row: candidate_score(row, class_priority_options, time_priority_options, weights),
+                  reverse=True)
+
+
+class RoutePoller(TimeTablePoller):
+    # 여러 출발/도착역 조합을 동시에 조회하고 모든 후보를 한 점수로 줄 세운다
+    def __init__(self, pollers: dict[RouteOption, TimeTablePoller], weights: ScoreWeights | None = None):
+        self._pollers = pollers
+        self._weights = weights or ScoreWeights()
+        self._executor = ThreadPoolExecutor(max_workers=len(pollers), thread_name_prefix="route-poller")
+        self._best: RouteOption = next(iter(pollers))
+        self._options: tuple[ClassPriorityOptions, TimePriorityOptions] | None = None
+
+    @classmethod
+    def from_poller(cls, poller: HttpPoller, routes: list[RouteOption], blocks: list[SearchBlock] | None = None,
+                    weights: ScoreWeights | None = None) -> "RoutePoller":
+        pollers: dict[RouteOption, TimeTablePoller] = {}
+        for route in unique_routes(routes):
+            route_poller = poller.with_form_fields(**route.form_fields)
+            pollers[route] = FanOutPoller.from_poller(route_poller, blocks) if blocks and len(blocks) > 1 \
+                else route_poller
+        return cls(pollers, weights)
+
+    @classmethod
+    def from_driver(cls, driver: "Chrome", routes: list[RouteOption], blocks: list[SearchBlock] | None = None,
+                    weights: ScoreWeights | None = None) -> "RoutePoller":
+        return cls.from_poller(HttpPoller.from_driver(driver), routes, blocks, weights)
+
+    @property
+    def poll_count(self) -> int:
+        return sum(getattr(poller, "poll_count", 0) for poller in self._pollers.values())
+
+    @property
+    def search_date(self) -> datetime.date | None:
+        return self._pollers[self._best].search_date
+
+    def poll(self, class_priority_options: ClassPriorityOptions,
+             time_priority_options: TimePriorityOptions) -> Ticket:
+        self._options = (class_priority_options, time_priority_options)
+        futures = [(route, self._executor.submit(poller.poll, class_priority_options, time_priority_options))
+                   for route, poller in self._pollers.items()]
+        results: list[Ticket] = []
+        error: Exception | None = None
+        for route, future in futures:
+            try:
+                tickets = future.result()
+            except (ConnectionError, urllib3.exceptions.HTTPError) as e:
+                error = e
+                continue
+            for rows in (tickets.standard, tickets.standard_standing, tickets.first_class,
+                         tickets.first_class_standing):
+                for row in rows:
+                    row.route = route
+            results.append(tickets)
+        if not results:
+            assert error is not None
+            raise error
+        merged = Ticket.merge(results)
+        if not merged.is_empty():
+            best_row = self.rank(merged)[0]
+            self._best = best_row.route or self._best
+            best_poller = self._pollers[self._best]
+            if isinstance(best_poller, FanOutPoller):
+                best_poller.select(best_row)
+        return merged
+
+    def rank(self, tickets: Ticket) -> list[TicketRow]:
+        if self._options is None:
+            return tickets.sorted_by_priority()
+        return rank_by_score(tickets, *self._options, self._weights)
+
+    def attach_history(self, history: "HistoryRecorder | None"):
+        for poller in self._pollers.values():
+            poller.attach_history(history)
+
+    def hand_over(self, driver: "Chrome"):
+        self._pollers[self._best].hand_over(driver)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for poller in self._pollers.values():
+            if isinstance(poller, FanOutPoller):
+                poller.close()
@@ -0,0 +1,70 @@
+import datetime
+from dataclasses import dataclass
+
+import numpy as np
+
+from .custom_types import STANDING, PassengerOptions, RouteOption, SeatAttribute, SeatOptions, TicketRow
+
+
+@dataclass
+class FeasibilityPriors:
+    seat_fail_rate: float = 0.2  # "예약하기" 칸에서 한 사람 자리를 못 잡을 사전 확률
+    standing_fail_rate: float = 0.5  # "입석+좌석" 칸
+    special_seat_fail_rate: float = 0.5  # 휠체어/전동휠체어석을 요청했을 때 추가로 실패할 확률
+    strength: float = 2.0  # 사전 확률을 시도 몇 번어치로 볼지
+
+
+class CandidateScorer:
+    # 기존 순위(Ticket.sorted_by_priority 나 poller.rank)를 바탕으로, 예약이 실제로 될 확률을 반영해 다시 줄 세운다.
+    # 실패 확률은 인원수/좌석 속성으로 정한 사전 확률에서 시작해, 열차/객실마다 지난 시도의 성공/실패로 갱신한다.
+    # 기록이 없고 상태가 같으면 원래 순서를 그대로 둔다
+    def __init__(self, passenger_count: int = 1, special_seat: bool = False,
+                 priors: FeasibilityPriors | None = None, feasibility_weight: float = 3.0):
+        self.passenger_count = max(passenger_count, 1)
+        self.special_seat = special_seat
+        self.priors = priors or FeasibilityPriors()
+        self.feasibility_weight = feasibility_weight  # 성공 확률이 e 배 줄 때마다 몇 순위 밀어낼지
+        self._stats: dict[tuple[RouteOption | None, datetime.datetime, str], list[int]] = {}  # key -> [시도, 실패]
+
+    @classmethod
+    def for_options(cls, passenger_options: PassengerOptions, seat_options: SeatOptions,
+                    priors: FeasibilityPriors | None = None) -> "CandidateScorer":
+        return cls(sum(passenger_options), seat_options.seat_attribute != SeatAttribute.default, priors)
+
+    @staticmethod
+    def _key(row: TicketRow) -> tuple[RouteOption | None, datetime.datetime, str]:
+        # 입석+좌석도 같은 열차의 같은 객실이다
+        return row.route, row.time, row.seat_class.removesuffix("_standing")
+
+    @property
+    def profile(self) -> tuple[int, bool]:
+        # 사전 확률이 같은 작업끼리는 기록을 같이 쓴다
+        return self.passenger_count, self.special_seat
+
+    def forget_before(self, when: datetime.datetime):
+        # 이미 떠난 열차의 기록은 다시 쓸 일이 없다
+        self._stats = {key: stats for key, stats in self._stats.items() if key[1] >= when}
+
+    def record(self, row: TicketRow, success: bool):
+        stats = self._stats.setdefault(self._key(row), [0, 0])
+        stats[0] += 1
+        stats[1] += not success
+
+    def failure_rates(self, rows: list[TicketRow]) -> np.ndarray:
+        count = len(rows)
+        stats = [self._stats.get(self._key(row)) for row in rows]
+        attempts = np.fromiter((s[0] if s else 0 for s in stats), np.float64, count)
+        failures = np.fromiter((s[1] if s else 0 for s in stats), np.float64, count)
+        standing = np.fromiter((row.cell.text == STANDING for row in rows), np.bool_, count)
+        priors = self.priors
+        # 일행 모두의 자리가 있어야 하므로 사람 수만큼 거듭제곱한다
+        prior = 1 - (1 - np.where(standing, priors.standing_fail_rate, priors.seat_fail_rate)) ** self.passenger_count
+        if self.special_seat:
+            prior = 1 - (1 - prior) * (1 - priors.special_seat_fail_rate)
+        return (failures + priors.strength * prior) / (attempts + priors.strength)
+
+    def rank(self, ranked_rows: list[TicketRow]) -> list[TicketRow]:
+        if len(ranked_rows) < 2:
+            return ranked_rows
+        score = self.feasibility_weight * np.log1p(-self.failure_rates(ranked_rows)) - np.arange(len(ranked_rows))
+        return [ranked_rows[idx] for idx in np.argsort(-score, kind="stable")]
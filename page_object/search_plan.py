@@ -0,0 +1,108 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import urllib3
+
+from .custom_types import BOOKING_CUTOFF, ClassPriorityOptions, Ticket, TicketRow, TimePriorityOptions
+from .http_poller import HttpPoller, TimeTablePoller
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome
+
+    from .history import HistoryRecorder
+
+BLOCK_HOURS = 2  # 조회 화면의 dptTm 은 2시간 단위
+
+
+@dataclass(frozen=True)
+class SearchBlock:
+    date: datetime.date
+    hour: int
+
+    @property
+    def form_fields(self) -> dict[str, str]:
+        return {"dptDt": f"{self.date:%Y%m%d}", "dptTm": f"{self.hour:02d}0000"}
+
+
+def plan_searches(time_priority_options: TimePriorityOptions,
+                  now: datetime.datetime | None = None) -> list[SearchBlock]:
+    # min_datetime ~ max_datetime 창을 덮는 (날짜, 2시간 블록) 조회 목록. 이미 마감된 앞부분은 뺀다
+    now = now or datetime.datetime.now()
+    start = max(time_priority_options.min_datetime, now + BOOKING_CUTOFF)
+    end = time_priority_options.max_datetime or datetime.datetime.combine(
+        time_priority_options.min_datetime.date(), datetime.time(23, 59))
+    block = start.replace(hour=start.hour - start.hour % BLOCK_HOURS, minute=0, second=0, microsecond=0)
+    blocks = []
+    while block <= end:
+        blocks.append(SearchBlock(block.date(), block.hour))
+        block += datetime.timedelta(hours=BLOCK_HOURS)
+    return blocks
+
+
+class FanOutPoller(TimeTablePoller):
+    # 블록마다 따로 연결을 둔 HttpPoller 로 동시에 조회하고 결과를 한 순위로 합친다.
+    # 넘겨줄 때는 전체 1순위가 나온 블록의 조회를 브라우저에서 다시 보낸다
+    def __init__(self, pollers: dict[SearchBlock, HttpPoller]):
+        self._pollers = pollers
+        self._executor = ThreadPoolExecutor(max_workers=len(pollers), thread_name_prefix="fan-out-poller")
+        self._best: HttpPoller = next(iter(pollers.values()))
+        self._results: list[tuple[HttpPoller, Ticket]] = []
+
+    @classmethod
+    def from_poller(cls, poller: HttpPoller, blocks: list[SearchBlock]) -> "FanOutPoller":
+        return cls({block: poller.with_form_fields(search_date=block.date, **block.form_fields) for block in blocks})
+
+    @classmethod
+    def from_driver(cls, driver: "Chrome", blocks: list[SearchBlock]) -> "FanOutPoller":
+        return cls.from_poller(HttpPoller.from_driver(driver), blocks)
+
+    @property
+    def blocks(self) -> list[SearchBlock]:
+        return list(self._pollers)
+
+    @property
+    def poll_count(self) -> int:
+        return sum(poller.poll_count for poller in self._pollers.values())
+
+    @property
+    def search_date(self) -> datetime.date | None:
+        return self._best.search_date
+
+    def poll(self, class_priority_options: ClassPriorityOptions,
+             time_priority_options: TimePriorityOptions) -> Ticket:
+        futures = [(poller, self._executor.submit(poller.poll, class_priority_options, time_priority_options))
+                   for poller in self._pollers.values()]
+        results: list[tuple[HttpPoller, Ticket]] = []
+        error: Exception | None = None
+        for poller, future in futures:
+            try:
+                results.append((poller, future.result()))
+            except (ConnectionError, urllib3.exceptions.HTTPError) as e:
+                error = e
+        if not results:
+            assert error is not None
+            raise error
+        self._results = results
+        merged = Ticket.merge([tickets for _, tickets in results])
+        if not merged.is_empty():
+            self.select(merged.sorted_by_priority()[0])
+        return merged
+
+    def select(self, best_row: TicketRow):
+        # 넘겨줄 블록을 best_row 가 나온 조회로 정한다
+        for poller, tickets in self._results:
+            if any(row is best_row for row in tickets.sorted_by_priority()):
+                self._best = poller
+                return
+
+    def attach_history(self, history: "HistoryRecorder | None"):
+        for poller in self._pollers.values():
+            poller.attach_history(history)
+
+    def hand_over(self, driver: "Chrome"):
+        self._best.hand_over(driver)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
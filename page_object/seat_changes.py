@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from .custom_types import Ticket, TicketCell
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webelement import WebElement
+
+# 행마다 칸 글자의 FNV-1a 해시를 만들고, 직전 해시와 다른 행만 칸 글자와 예약 링크를 돌려준다.
+# 바뀐 것이 없으면 해시 목록만 오가므로 왕복 한 번에 응답도 작다
+TIME_TABLE_FINGERPRINT_SCRIPT = """
+var previous = arguments[1], linkIndices = arguments[2];
+function fnv(text) {
+    var hash = 0x811c9dc5;
+    for (var i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return hash;
+}
+var hashes = [], changed = [];
+Array.prototype.forEach.call(arguments[0].rows, function (row, rowIdx) {
+    var texts = Array.prototype.map.call(row.cells, function (cell) { return cell.innerText.trim(); });
+    var hash = fnv(texts.join("\\u001f"));
+    hashes.push(hash);
+    if (previous[rowIdx] !== hash) {
+        changed.push([rowIdx, Array.prototype.map.call(row.cells, function (cell, idx) {
+            return [texts[idx], linkIndices.indexOf(idx) >= 0 ? cell.querySelector("a") : null];
+        })]);
+    }
+});
+return [hashes, changed];
+"""
+
+STATUS_CELLS = {"first_class": Ticket.FIRST_CLS_IDX, "standard": Ticket.STANDARD_CLS_IDX}
+
+
+@dataclass(frozen=True)
+class SeatChangeEvent:
+    row_idx: int
+    departure: str
+    seat_class: str
+    before: str
+    after: str
+
+    def __str__(self):
+        return f"row {self.row_idx} {self.seat_class} went {self.before} → {self.after}"
+
+
+class SeatChangeFeed:
+    def __init__(self):
+        self._subscribers: list[Callable[[SeatChangeEvent], None]] = []
+
+    def subscribe(self, callback: Callable[[SeatChangeEvent], None]) -> Callable[[], None]:
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def publish(self, events: Iterable[SeatChangeEvent]):
+        for event in events:
+            for callback in list(self._subscribers):
+                callback(event)
+
+
+def diff_row(row_idx: int, before: list[TicketCell], after: list[TicketCell]) -> list[SeatChangeEvent]:
+    events = []
+    for seat_class, cell_idx in STATUS_CELLS.items():
+        old = before[cell_idx].text if cell_idx < len(before) else ""
+        new = after[cell_idx].text if cell_idx < len(after) else ""
+        if old != new:
+            departure = after[Ticket.DEP_IDX].text.replace("\n", " ") if Ticket.DEP_IDX < len(after) else ""
+            events.append(SeatChangeEvent(row_idx, departure, seat_class, old, new))
+    return events
+
+
+class TimeTableState:
+    # 마지막으로 본 시간표. 바뀐 행만 받아 갱신하고 좌석 상태 변화를 구독자에게 알린다
+    def __init__(self, seat_changes: SeatChangeFeed | None = None):
+        self.rows: list[list[TicketCell]] = []
+        self.seat_changes = seat_changes or SeatChangeFeed()
+
+    def reset(self):
+        self.rows = []
+
+    def update(self, changed_rows: Iterable[tuple[int, list[TicketCell]]], row_count: int) -> bool:
+        is_changed = row_count != len(self.rows)
+        if is_changed:
+            self.rows = self.rows[:row_count] + [[] for _ in range(row_count - len(self.rows))]
+        events = []
+        for row_idx, cells in changed_rows:
+            before = self.rows[row_idx]
+            if before == cells:
+                continue
+            if before:
+                events.extend(diff_row(row_idx, before, cells))
+            self.rows[row_idx] = cells
+            is_changed = True
+        self.seat_changes.publish(events)
+        return is_changed
+
+
+class TimeTableWatcher:
+    def __init__(self, seat_changes: SeatChangeFeed | None = None):
+        self._state = TimeTableState(seat_changes)
+        self._hashes: list[int] = []
+
+    @property
+    def rows(self) -> list[list[TicketCell]]:
+        return self._state.rows
+
+    @property
+    def seat_changes(self) -> SeatChangeFeed:
+        return self._state.seat_changes
+
+    def reset(self):
+        # 캐시된 링크가 stale 해졌을 때 다음 조회에서 모든 행을 다시 받는다
+        self._state.reset()
+        self._hashes = []
+
+    def update(self, table_elem: "WebElement") -> bool:
+        hashes, changed = table_elem.parent.execute_script(TIME_TABLE_FINGERPRINT_SCRIPT, table_elem, self._hashes,
+                                                           [Ticket.FIRST_CLS_IDX, Ticket.STANDARD_CLS_IDX])
+        self._hashes = hashes
+        return self._state.update(((row_idx, [TicketCell(text, link) for text, link in raw_row])
+                                   for row_idx, raw_row in changed), len(hashes))
@@ -0,0 +1,112 @@
+import datetime
+from dataclasses import dataclass
+
+from lxml import etree
+
+from . import page_profile
+from .custom_types import TicketCell
+from .page_profile import TIME_TABLE_PROFILE, PageProfile, ProfileMismatch
+
+
+@dataclass
+class TimeTableRow:
+    train_no: int
+    departure: str
+    departs_at: datetime.time
+    destination: str
+    arrives_at: datetime.time
+    first_class: str  # 칸에 보이는 글자 그대로(예약하기/매진/좌석부족/입석+좌석, 없으면 "")
+    standard: str
+
+
+def _text(element: etree._Element) -> str:
+    return "".join(element.itertext()).strip()
+
+
+def _parse_time(text: str) -> datetime.time:
+    hour, _, minute = text.partition(":")
+    return datetime.time(int(hour), int(minute))
+
+
+class TimeTableHtmlParser:
+    # 브라우저 없이 시간표 페이지 HTML 을 프로필대로 읽는다. Selenium 의 page_source, HTTP 응답,
+    # 녹화한 페이지 모두 같은 경로로 읽는다. 머리글은 직전과 같으면 다시 검사하지 않는다
+    def __init__(self, profile: PageProfile = TIME_TABLE_PROFILE):
+        self.profile = profile
+        self._rows = etree.XPath(profile.rows)
+        self._headers = etree.XPath(profile.headers)
+        self._station = etree.XPath(f"normalize-space({profile.station})")
+        self._time = etree.XPath(f"normalize-space({profile.time})")
+        self._indices = [profile.index(name) for name in page_profile.FIELDS]
+        # lxml.html 의 요소 클래스 조회를 건너뛰는 기본 HTML 파서. bytes 는 utf-8 로 읽는다
+        self._html_parser = etree.HTMLParser(encoding="utf-8")
+        self._str_parser = etree.HTMLParser()
+        self._validated_headers: tuple[str, ...] | None = None
+
+    def document(self, html: str | bytes) -> etree._Element:
+        if isinstance(html, str):
+            return etree.fromstring(html, self._str_parser)
+        return etree.fromstring(html, self._html_parser)
+
+    def headers(self, document: etree._Element) -> tuple[str, ...]:
+        return tuple(_text(th) for th in self._headers(document))
+
+    def validate(self, document: etree._Element):
+        headers = self.headers(document)
+        if headers == self._validated_headers:
+            return
+        self.profile.validate(headers)
+        self._validated_headers = headers
+
+    def _station_cell(self, td: etree._Element) -> tuple[str, datetime.time]:
+        station, time = self._station(td), self._time(td)
+        if not station or not time:
+            raise ProfileMismatch(f"시간표 구조가 프로필({self.profile.version})과 다릅니다: 역 칸에 역 이름/시각이 없습니다")
+        return station, _parse_time(time)
+
+    def parse(self, html: str | bytes) -> list[TimeTableRow]:
+        document = self.document(html)
+        self.validate(document)
+        train_no_idx, departure_idx, destination_idx, first_class_idx, standard_idx = self._indices
+        width = self.profile.width
+        rows = []
+        for tr in self._rows(document):
+            tds = tr.findall("td")
+            if len(tds) < width:
+                continue  # "조회 결과가 없습니다" 같은 안내 행
+            departure, departs_at = self._station_cell(tds[departure_idx])
+            destination, arrives_at = self._station_cell(tds[destination_idx])
+            rows.append(TimeTableRow(int(_text(tds[train_no_idx])), departure, departs_at, destination,
+                                     arrives_at, _text(tds[first_class_idx]),
+                                     _text(tds[standard_idx])))
+        return rows
+
+    def to_cells(self, rows: list[TimeTableRow]) -> list[list[TicketCell]]:
+        # Ticket/TimeTableState 가 읽는 칸 모양(Selenium innerText 와 같음)으로 펼친다. 역 칸은 "역\nHH:MM"
+        train_no_idx, departure_idx, destination_idx, first_class_idx, standard_idx = self._indices
+        width = self.profile.width
+        cells_rows = []
+        for row in rows:
+            cells = [TicketCell("") for _ in range(width)]
+            cells[train_no_idx] = TicketCell(str(row.train_no))
+            cells[departure_idx] = TicketCell(f"{row.departure}\n{row.departs_at:%H:%M}")
+            cells[destination_idx] = TicketCell(f"{row.destination}\n{row.arrives_at:%H:%M}")
+            cells[first_class_idx] = TicketCell(row.first_class)
+            cells[standard_idx] = TicketCell(row.standard)
+            cells_rows.append(cells)
+        return cells_rows
+
+
+_default_parser: TimeTableHtmlParser | None = None
+
+
+def default_parser() -> TimeTableHtmlParser:
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = TimeTableHtmlParser()
+    return _default_parser
+
+
+def parse_time_table(html: str | bytes) -> list[list[TicketCell]]:
+    parser = default_parser()
+    return parser.to_cells(parser.parse(html))
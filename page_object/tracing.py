@@ -0,0 +1,215 @@
+import functools
+import glob
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+TRACE_DIR_ENV = "SRT_TRACE_DIR"  # 설정해야 trace 를 남긴다(예: SRT_TRACE_DIR=traces)
+MAX_READ_BYTES = 4 * 1024 * 1024  # TraceMetrics 가 refresh 한 번에 파일마다 읽는 최대 크기
+
+POLL_SPAN = "poll"
+QUEUE_WAIT_SPAN = "queue_wait"
+RESERVE_SPAN = "reserve"
+WEBDRIVER_COMMANDS = "webdriver_commands"
+WEBDRIVER_SEC = "webdriver_sec"
+LOCATOR_SEC = "locator_sec"  # 요소 탐색(find_element)에 쓴 시간
+SLOW_LOCATORS = "slow_locators"  # SLOW_LOCATOR_SEC 를 넘긴 요소 탐색 수
+
+
+@dataclass
+class Span:
+    name: str
+    attrs: dict[str, Any]
+    started_at: float
+    counters: dict[str, float] = field(default_factory=dict)
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+# 현재 열린 span 들. 스레드와 asyncio task 마다 따로 잡힌다
+_open_spans: ContextVar[tuple[Span, ...]] = ContextVar("open_spans", default=())
+
+
+def trace_dir() -> str | None:
+    return os.environ.get(TRACE_DIR_ENV) or None
+
+
+class Tracer:
+    # span 이 끝날 때마다 프로세스별 JSON-lines 파일(trace-<pid>.jsonl)에 한 줄씩 남긴다
+    def __init__(self, directory: str | None):
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._file = None
+        self._pid: int | None = None
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        span = Span(name, attrs, time.time())
+        started = time.perf_counter()
+        token = _open_spans.set(_open_spans.get() + (span,))
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs["error"] = type(e).__name__
+            raise
+        finally:
+            _open_spans.reset(token)
+            self._export(span, time.perf_counter() - started)
+
+    def count(self, name: str, value: float = 1):
+        # 바깥 span 까지 모두 더해서, poll span 에 그 안의 WebDriver 명령 수가 모이게 한다
+        for span in _open_spans.get():
+            span.counters[name] = span.counters.get(name, 0) + value
+
+    def _export(self, span: Span, duration_sec: float):
+        if self._directory is None:
+            return
+        record = json.dumps({"name": span.name,
+                             "pid": os.getpid(),
+                             "start": span.started_at,
+                             "duration_sec": duration_sec,
+                             "attrs": span.attrs,
+                             "counters": span.counters,
+                             }, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None or self._pid != os.getpid():
+                os.makedirs(self._directory, exist_ok=True)
+                self._pid = os.getpid()
+                self._file = open(os.path.join(self._directory, f"trace-{self._pid}.jsonl"), "a",
+                                  encoding="utf-8", buffering=1)
+            self._file.write(record + "\n")
+
+
+tracer = Tracer(trace_dir())
+
+
+def traced(func):
+    name = func.__qualname__
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with tracer.span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def instrument_driver(driver):
+    # Selenium 의 모든 명령은 driver.execute 를 거치므로 여기서 왕복 횟수와 시간을 센다
+    if getattr(driver, "_srt_traced", False):
+        return driver
+    execute = driver.execute
+
+    def traced_execute(driver_command: str, params: dict | None = None):
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            tracer.count(WEBDRIVER_COMMANDS)
+            tracer.count(WEBDRIVER_SEC, time.perf_counter() - started)
+
+    driver.execute = traced_execute
+    driver._srt_traced = True
+    return driver
+
+
+def _percentile(samples, q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class TraceMetrics:
+    # 워커 프로세스들이 남긴 trace 파일을 이어서 읽으며(읽은 위치 기억) 최근 지표를 모은다
+    def __init__(self, directory: str | None, window_sec: float = 60, max_samples: int = 10000,
+                 max_read_bytes: int = MAX_READ_BYTES):
+        self._directory = directory
+        self._window_sec = window_sec
+        self._offsets: dict[str, int] = {}
+        self._max_read_bytes = max_read_bytes
+        self._lock = threading.Lock()
+        self.poll_count = 0
+        self._poll_ends: deque[float] = deque(maxlen=max_samples)
+        self._poll_latencies: deque[float] = deque(maxlen=max_samples)
+        self._poll_commands: deque[float] = deque(maxlen=max_samples)
+        self._poll_locator_secs: deque[float] = deque(maxlen=max_samples)
+        self.slow_locators = 0
+        self._queue_waits: deque[float] = deque(maxlen=max_samples)
+        self._reserve_times: deque[float] = deque(maxlen=max_samples)
+        self.reserve_attempts = 0
+
+    def refresh(self):
+        if self._directory is None:
+            return
+        for path in glob.glob(os.path.join(self._directory, "trace-*.jsonl")):
+            offset = self._offsets.get(path, 0)
+            with open(path, "rb") as trace_file:
+                size = os.fstat(trace_file.fileno()).st_size
+                if size - offset > self._max_read_bytes:
+                    # 밀린 양이 많으면 최근 max_read_bytes 만 읽는다. 중간에서 시작한 첫 줄은 버린다
+                    offset = size - self._max_read_bytes
+                    trace_file.seek(offset)
+                    offset += len(trace_file.readline())
+                trace_file.seek(offset)
+                data = trace_file.read(self._max_read_bytes)
+            end = data.rfind(b"\n") + 1  # 아직 쓰는 중인 마지막 줄은 다음에 읽는다
+            for line in data[:end].splitlines():
+                try:
+                    self._add(json.loads(line))
+                except ValueError:
+                    continue
+            self._offsets[path] = offset + end
+
+    def _add(self, record: dict):
+        name = record["name"]
+        duration_sec = record["duration_sec"]
+        if name == POLL_SPAN:
+            self.poll_count += 1
+            self._poll_ends.append(record["start"] + duration_sec)
+            self._poll_latencies.append(duration_sec)
+            self._poll_commands.append(record["counters"].get(WEBDRIVER_COMMANDS, 0))
+            self._poll_locator_secs.append(record["counters"].get(LOCATOR_SEC, 0))
+        elif name == QUEUE_WAIT_SPAN:
+            self._queue_waits.append(duration_sec)
+        elif name == RESERVE_SPAN:
+            self.reserve_attempts += 1
+            # reserve span 이 로그인부터 예약까지 감싸므로 느린 요소 탐색은 여기서만 센다(poll 과 겹치지 않게)
+            self.slow_locators += record["counters"].get(SLOW_LOCATORS, 0)
+            if record["attrs"].get("success"):
+                self._reserve_times.append(duration_sec)
+
+    def snapshot(self, now: float | None = None) -> dict[str, Any]:
+        with self._lock:
+            self.refresh()
+            now = now or time.time()
+            recent_polls = sum(1 for end in self._poll_ends if end >= now - self._window_sec)
+            return {
+                "polls": self.poll_count,
+                "poll_rate_per_sec": recent_polls / self._window_sec,
+                "poll_latency_p50_sec": _percentile(self._poll_latencies, 0.5),
+                "poll_latency_p99_sec": _percentile(self._poll_latencies, 0.99),
+                "webdriver_commands_per_poll": (sum(self._poll_commands) / len(self._poll_commands)
+                                                if self._poll_commands else None),
+                "locator_sec_per_poll": (sum(self._poll_locator_secs) / len(self._poll_locator_secs)
+                                         if self._poll_locator_secs else None),
+                "slow_locators": self.slow_locators,
+                "queue_wait_p50_sec": _percentile(self._queue_waits, 0.5),
+                "reserve_attempts": self.reserve_attempts,
+                "reservations": len(self._reserve_times),
+                "time_to_reserve_p50_sec": _percentile(self._reserve_times, 0.5),
+                "time_to_reserve_p99_sec": _percentile(self._reserve_times, 0.99),
+            }
@@ -3,6 +3,9 @@ window.onload = function() {
     const minTimeInput = document.getElementById('min_time');
     const maxTimeInput = document.getElementById('max_time');
     const bestTimeInput = document.getElementById('best_time');
+    if (!minTimeInput) {
+        return;  // 결과 페이지
+    }
 
     const currentDateTime = getCurrentDateTime();
     minTimeInput.value = currentDateTime;
@@ -37,3 +40,25 @@ window.onload = function() {
         bestTimeInput.min = minTimeInput.value;
     });
 };
+
+// 결과 페이지: 서버가 보내는 작업 진행 상황(SSE)으로 상태를 갱신한다. 작업이 끝나면 서버가 스트림을 닫는다
+const FINISHED_STATUSES = ['succeeded', 'failed', 'cancelled'];
+
+function watchJob(jobId) {
+    const source = new EventSource(`/jobs/${jobId}/events`);
+    const update = function(event) {
+        const job = JSON.parse(event.data);
+        document.getElementById('job-status').textContent = job.status;
+        document.getElementById('job-stage').textContent = job.stage || '';
+        document.getElementById('job-polls').textContent = job.polls;
+        document.getElementById('job-available').textContent = job.available === null ? '' : job.available;
+        document.getElementById('job-error').textContent = job.error || '';
+        if (FINISHED_STATUSES.includes(job.status)) {
+            source.close();  // 닫지 않으면 EventSource 가 다시 연결한다
+            document.getElementById('cancel-form').hidden = true;
+        }
+    };
+    ['status', 'stage', 'progress'].forEach(function(kind) {
+        source.addEventListener(kind, update);
+    });
+}
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from selenium.common.exceptions import NoAlertPresentException, NoSuchElementException
+
+from page_object.async_driver import ELEMENT_KEY, AsyncWebDriver, AsyncWebElement
+
+
+class FakeExecutor:
+    _url = "http://127.0.0.1:9515"
+    client_config = None
+
+
+class FakeChrome:
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.command_executor = FakeExecutor()
+
+
+def chromedriver(delay_sec: float = 0.0) -> tuple[httpx.MockTransport, list[tuple[str, str, dict | None]]]:
+    requests = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content) if request.content else None
+        requests.append((request.method, request.url.path, payload))
+        await asyncio.sleep(delay_sec)
+        command = request.url.path.split("/", 3)[-1]
+        if command == "element":
+            if payload["value"] == "//missing":
+                return httpx.Response(404, json={"value": {"error": "no such element", "message": "missing"}})
+            return httpx.Response(200, json={"value": {ELEMENT_KEY: "e1"}})
+        if command == "alert/text":
+            return httpx.Response(404, json={"value": {"error": "no such alert", "message": "no alert"}})
+        if command == "execute/sync":
+            return httpx.Response(200, json={"value": payload["args"]})
+        return httpx.Response(200, json={"value": None})
+
+    return httpx.MockTransport(handle), requests
+
+
+def test_elements_round_trip_through_scripts():
+    async def scenario():
+        transport, requests = chromedriver()
+        driver = AsyncWebDriver(FakeChrome("s1"), transport=transport)
+        elem = await driver.find_element("xpath", "//tbody")
+        assert isinstance(elem, AsyncWebElement) and elem.id == "e1"
+        assert (await driver.execute_script("return arguments;", elem, 1))[0].id == "e1"
+        await elem.click()
+        await driver.quit()
+        return requests
+
+    requests = asyncio.run(scenario())
+    assert requests[1] == ("POST", "/session/s1/execute/sync",
+                           {"script": "return arguments;", "args": [{ELEMENT_KEY: "e1"}, 1]})
+    assert requests[2][:2] == ("POST", "/session/s1/element/e1/click")
+
+
+def test_errors_map_to_selenium_exceptions():
+    async def scenario():
+        driver = AsyncWebDriver(FakeChrome("s1"), transport=chromedriver()[0])
+        with pytest.raises(NoSuchElementException):
+            await driver.find_element("xpath", "//missing")
+        with pytest.raises(NoAlertPresentException):
+            await driver.alert_text()
+        await driver.quit()
+
+    asyncio.run(scenario())
+
+
+def test_sessions_wait_concurrently_on_one_loop():
+    async def scenario():
+        drivers = [AsyncWebDriver(FakeChrome(f"s{idx}"), transport=chromedriver(delay_sec=0.2)[0])
+                   for idx in range(5)]
+        started = time.perf_counter()
+        await asyncio.gather(*(driver.refresh() for driver in drivers))
+        elapsed = time.perf_counter() - started
+        await asyncio.gather(*(driver.quit() for driver in drivers))
+        return elapsed
+
+    assert asyncio.run(scenario()) < 0.5
@@ -0,0 +1,114 @@
+import asyncio
+import datetime
+
+from selenium.common.exceptions import NoAlertPresentException
+
+from page_object.async_pages import AsyncTimeTablePage
+from page_object.custom_types import ClassPriorityOptions, Ticket, TimePriorityOptions
+from page_object.polling import PollingPolicy, PollingScheduler
+
+TOMORROW = datetime.date.today() + datetime.timedelta(days=1)
+TIME_OPTIONS = TimePriorityOptions(min_datetime=datetime.datetime.combine(TOMORROW, datetime.time(6)))
+
+
+class FakeLink:
+    def __init__(self, driver: "FakeDriver", alert_text: str | None = None):
+        self._driver = driver
+        self._alert_text = alert_text
+        self.clicks = 0
+
+    async def click(self):
+        self.clicks += 1
+        self._driver.alert = self._alert_text
+
+
+class FakeDriver:
+    # 조회할 때마다 timetables 에서 시간표를 하나씩 꺼내 준다
+    def __init__(self, timetables: list[list[tuple[str, FakeLink | None]]], reserved: list[bool]):
+        self.timetables = iter(timetables)
+        self.reserved = iter(reserved)
+        self.alert: str | None = None
+        self.commands: list[str] = []
+
+    async def find_element(self, by: str, value: str):
+        return object()
+
+    async def execute_script(self, script: str, *args):
+        row = [("", None)] * (Ticket.STANDARD_CLS_IDX + 1)
+        return [[*row[:Ticket.DEP_IDX], ("수서\n07:00", None), *row[Ticket.DEP_IDX + 1:Ticket.STANDARD_CLS_IDX],
+                 cell] for cell in next(self.timetables)]
+
+    async def alert_text(self) -> str:
+        if self.alert is None:
+            raise NoAlertPresentException()
+        return self.alert
+
+    async def accept_alert(self):
+        self.alert = None
+
+    async def refresh(self):
+        self.commands.append("refresh")
+
+    async def back(self):
+        self.commands.append("back")
+
+
+class FakeTicketingPage:
+    def __init__(self, driver: FakeDriver):
+        self._driver = driver
+
+    async def validate(self) -> bool:
+        self._driver.commands.append("validate")
+        return next(self._driver.reserved)
+
+
+def make_page(driver: FakeDriver) -> AsyncTimeTablePage:
+    page = AsyncTimeTablePage(driver)
+    page._implicit_wait_set = True
+    page._ticking_page = FakeTicketingPage(driver)
+
+    async def research() -> float:
+        driver.commands.append("search")
+        return 0.0
+
+    page.research = research
+    return page
+
+
+def run(page: AsyncTimeTablePage, stop_event: asyncio.Event | None = None) -> bool:
+    async def scenario() -> bool:
+        return await page.run(ClassPriorityOptions(), TIME_OPTIONS, stop_event=stop_event,
+                              polling_scheduler=PollingScheduler(PollingPolicy(interval_sec=0.0)))
+    return asyncio.run(scenario())
+
+
+def test_failed_validate_searches_again_before_next_poll():
+    driver = FakeDriver([], [False, True])
+    unlinked, first, second = ("예약하기", None), ("예약하기", FakeLink(driver)), ("예약하기", FakeLink(driver))
+    driver.timetables = iter([[unlinked], [first], [second]])
+    page = make_page(driver)
+    assert run(page)
+    assert driver.commands == ["refresh", "validate", "search", "validate"]
+    assert first[1].clicks == 1 and second[1].clicks == 1
+
+
+def test_sold_out_alert_stays_on_time_table():
+    driver = FakeDriver([], [True])
+    sold_out, bookable = FakeLink(driver, "잔여석없음"), FakeLink(driver)
+    driver.timetables = iter([[("예약하기", sold_out)], [("예약하기", bookable)]])
+    page = make_page(driver)
+    assert run(page)
+    assert driver.commands == ["refresh", "validate"]
+
+
+def test_stop_event_ends_polling():
+    driver = FakeDriver([[("매진", None)]], [])
+    page = make_page(driver)
+
+    async def scenario() -> bool:
+        stop_event = asyncio.Event()
+        stop_event.set()
+        return await page.run(ClassPriorityOptions(), TIME_OPTIONS, stop_event=stop_event)
+
+    assert not asyncio.run(scenario())
+    assert driver.commands == []
@@ -0,0 +1,57 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from page_object import checkout
+
+# RESERVE_CANDIDATES_SCRIPT 를 브라우저 대신 node 에서 돌린다. 링크를 누르면 폼을 보내고(submit),
+# fetch 는 링크마다 정해 둔 응답 본문을 돌려준다
+HARNESS = """
+const {script, responses, failureMarkers, successMarkers} = JSON.parse(require("fs").readFileSync(0, "utf8"));
+globalThis.HTMLFormElement = function (action) { this.action = action; this.method = "post"; };
+HTMLFormElement.prototype.submit = function () { throw new Error("form left the page"); };
+globalThis.FormData = function (form) { this.entries = [["train", form.action]]; };
+globalThis.URLSearchParams = function (data) { this.toString = () => data.entries.map(e => e.join("=")).join("&"); };
+globalThis.fetch = (url, init) => {
+    const text = responses[Number(init.body.split("=")[1])];
+    if (text === null) return Promise.reject(new Error("network down"));
+    return Promise.resolve({url: url, text: () => Promise.resolve(text)});
+};
+globalThis.history = {replaceState() {}};
+globalThis.document = {open() {}, write() {}, close() {}};
+const links = responses.map((text, idx) => ({click() {
+    if (text !== "no form") new HTMLFormElement(String(idx)).submit();
+}}));
+new Function(script)(links, failureMarkers, successMarkers, results => console.log(JSON.stringify(results)));
+"""
+
+
+def try_candidates(*responses: str | None) -> list[list[str]]:
+    if shutil.which("node") is None:
+        pytest.skip("node 가 필요하다")
+    scenario = {"script": checkout.RESERVE_CANDIDATES_SCRIPT, "responses": list(responses),
+                "failureMarkers": list(checkout.FAILURE_MARKERS), "successMarkers": list(checkout.SUCCESS_MARKERS)}
+    completed = subprocess.run(["node", "-e", HARNESS], input=json.dumps(scenario), capture_output=True, text=True,
+                               check=True, timeout=30)
+    return json.loads(completed.stdout)
+
+
+def test_sold_out_alert_moves_to_next_candidate_until_reserved():
+    results = try_candidates("<script>alert('잔여석없음 입니다.');</script>",
+                             "<p>예약이 완료되었습니다. 10분 내에 결제하세요</p>",
+                             "<p>never tried</p>")
+    assert results == [[checkout.SOLD_OUT, "잔여석없음"], [checkout.RESERVED, "예약이 완료"]]
+
+
+def test_markers_outside_alerts_are_not_failures():
+    # 시간표 안내문의 "매진" 이나 alert 안의 성공 문구만으로는 판단하지 않는다
+    assert try_candidates("<td>매진</td><p>좌석을 선택하세요</p>") == [[checkout.UNKNOWN, ""]]
+    assert try_candidates('<script>alert("예약이 완료되었습니다")</script>') == [[checkout.UNKNOWN, ""]]
+
+
+def test_links_without_form_and_network_errors_stop_the_attempts():
+    assert try_candidates("no form", "<p>예약이 완료</p>") == [[checkout.UNSUPPORTED, ""]]
+    assert try_candidates("<script>alert('매진되었습니다')</script>", None) == [
+        [checkout.SOLD_OUT, "매진"], [checkout.ERROR, "Error: network down"]]
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.driver_pool import DriverPool, PooledDriver, process_tree_rss
+
+
+class FakeDriver:
+    def __init__(self):
+        self.healthy = True
+        self.quits = 0
+
+    def execute_script(self, script: str):
+        if not self.healthy:
+            raise RuntimeError("session lost")
+        return 1
+
+    def quit(self):
+        self.quits += 1
+
+
+class FakePool(DriverPool):
+    def __init__(self, **kwargs):
+        self.drivers: list[FakeDriver] = []
+        self.logins = 0
+        self.fail_login = False
+        DriverPool.__init__(self, "0123456789", "pw", size=1, health_check_interval_sec=60,
+                            driver_factory=self._new_driver, **kwargs)
+
+    def _new_driver(self) -> FakeDriver:
+        self.drivers.append(FakeDriver())
+        return self.drivers[-1]
+
+    def _login(self, pooled: PooledDriver):
+        if self.fail_login:
+            raise ValueError("login failed")
+        self.logins += 1
+        pooled.last_used = time.monotonic()
+
+
+def test_failed_relogin_replaces_driver():
+    pool = FakePool(max_idle_sec=0).start()
+    pool.fail_login = True
+    with pytest.raises(ValueError):
+        with pool.lease(timeout=1):
+            pass
+    assert pool.drivers[0].quits == 1
+    assert pool._missing == 1  # 다시 만들 때도 로그인에 실패했다. 점검 스레드가 채운다
+    pool.fail_login = False
+    pool._replace()
+    with pool.lease(timeout=1) as driver:
+        assert driver is pool.drivers[-1]
+    pool.close()
+
+
+def test_unhealthy_driver_is_recreated_inside_lease():
+    pool = FakePool().start()
+    pool.drivers[0].healthy = False
+    with pool.lease(timeout=1) as driver:
+        assert driver is pool.drivers[1]
+    assert pool.drivers[0].quits == 1 and len(pool._idle) == 1
+    pool.close()
+
+
+def test_idle_time_counts_from_last_release():
+    pool = FakePool(max_idle_sec=0.2).start()
+    for _ in range(3):
+        with pool.lease(timeout=1):
+            time.sleep(0.1)
+    assert pool.logins == 1  # 0.3 초 넘게 썼지만 돌려받은 뒤로는 0.2 초가 지나지 않았다
+    pool.close()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="/proc 가 필요하다")
+def test_process_tree_rss_includes_children():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        time.sleep(0.2)
+        assert process_tree_rss(os.getpid()) > process_tree_rss(child.pid) > 0
+    finally:
+        child.kill()
+        child.wait()
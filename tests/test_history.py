@@ -0,0 +1,80 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from page_object import history
+from page_object.custom_types import Ticket, TicketCell
+
+DAY = datetime.date(2026, 10, 20)
+START = datetime.datetime(2026, 10, 19, 9, 0)
+
+
+def row(train_no: int, dep_time: str, first_class: str, standard: str) -> list[TicketCell]:
+    cells = [TicketCell("") for _ in range(Ticket.STANDARD_CLS_IDX + 1)]
+    cells[Ticket.TRAIN_NO_IDX] = TicketCell(str(train_no))
+    cells[Ticket.DEP_IDX] = TicketCell(f"수서\n{dep_time}")
+    cells[Ticket.ARR_IDX] = TicketCell("부산\n23:59")
+    cells[Ticket.FIRST_CLS_IDX] = TicketCell(first_class)
+    cells[Ticket.STANDARD_CLS_IDX] = TicketCell(standard)
+    return cells
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    # 301 열차 일반실은 두 번 풀리고(매진→예약하기, 좌석부족→입석+좌석), 303 열차는 계속 매진
+    path = str(tmp_path / "history.bin")
+    recorder = history.HistoryRecorder(path, flush_interval_sec=60)
+    snapshots = [("매진", "매진"), ("매진", "예약하기"), ("매진", "좌석부족"), ("", "입석+좌석"), ("매진", "입석+좌석")]
+    for minutes, (first_class, standard) in enumerate(snapshots):
+        recorder.record([row(301, "08:00", first_class, standard), row(303, "08:30", "매진", "매진")], DAY,
+                        START + datetime.timedelta(minutes=minutes))
+    recorder.close()
+    return path
+
+
+def test_recorder_writes_fixed_width_records(history_file):
+    records = np.concatenate(list(history.iter_chunks(history_file)))
+    assert len(records) == 5 * 2 * len(history.CLASS_CELLS)
+    first = records[0]
+    assert first["observed_at"] == np.datetime64(START, "ms")
+    assert first["departs_at"] == np.datetime64(datetime.datetime(2026, 10, 20, 8, 0), "m")
+    assert first["train_no"] == 301
+    assert (first["seat_class"], first["status"]) == (history.FIRST_CLASS, history.SOLD_OUT_CODE)
+
+
+def test_iter_chunks_skips_partial_record(history_file):
+    with open(history_file, "ab") as file:
+        file.write(b"\x00" * 5)
+    assert sum(len(chunk) for chunk in history.iter_chunks(history_file, chunk_records=3)) == 20
+
+
+def test_releases_finds_full_to_bookable_transitions(history_file):
+    records = np.concatenate(list(history.iter_chunks(history_file)))
+    released, last = history._releases(records[::-1].copy())  # 기록 순서와 상관없이 시각 순으로 본다
+    assert released["train_no"].tolist() == [301, 301]
+    assert released["seat_class"].tolist() == [history.STANDARD, history.STANDARD]
+    assert released["observed_at"].tolist() == [START + datetime.timedelta(minutes=1),
+                                                START + datetime.timedelta(minutes=3)]
+    # 열차/객실마다 마지막 레코드 하나
+    assert len(last) == 4
+    assert set(last["observed_at"].tolist()) == {START + datetime.timedelta(minutes=4)}
+
+
+@pytest.mark.parametrize("chunk_records", [1, 3, 1 << 20])
+def test_histograms_count_releases_across_chunks(history_file, chunk_records):
+    histograms = history.seat_release_histograms(history_file, bin_minutes=60, chunk_records=chunk_records)
+    assert list(histograms) == [("수서", "부산", 301)]
+    counts = histograms[("수서", "부산", 301)]
+    # 출발 약 23시간 전에 두 번 풀렸다
+    assert counts.sum() == 2 and counts[22] == 2
+
+
+def test_histograms_by_time_of_day(history_file):
+    counts = history.seat_release_histograms(history_file, bin_minutes=30, by=history.TIME_OF_DAY)[("수서", "부산", 301)]
+    assert len(counts) == 48 and counts[18] == 2
+
+
+def test_histograms_reject_unknown_axis(history_file):
+    with pytest.raises(ValueError):
+        history.seat_release_histograms(history_file, by="weekday")
@@ -0,0 +1,46 @@
+import datetime
+
+from page_object.custom_types import ClassPriorityOptions, Ticket, TicketCell, TimePriorityOptions
+from page_object.http_poller import TimeTablePoller
+from page_object.polling import PollingPolicy, PollingScheduler
+
+TOMORROW = datetime.date.today() + datetime.timedelta(days=1)
+TIME_OPTIONS = TimePriorityOptions(min_datetime=datetime.datetime.combine(TOMORROW, datetime.time(6)))
+
+
+def tickets(*trains: tuple[str, str, str]) -> Ticket:
+    rows = []
+    for dep_time, first_class, standard in trains:
+        row = [TicketCell("") for _ in range(Ticket.STANDARD_CLS_IDX + 1)]
+        row[Ticket.DEP_IDX] = TicketCell(f"수서\n{dep_time}")
+        row[Ticket.FIRST_CLS_IDX] = TicketCell(first_class, link=object())
+        row[Ticket.STANDARD_CLS_IDX] = TicketCell(standard, link=object())
+        rows.append(row)
+    return Ticket(rows, ClassPriorityOptions(), TIME_OPTIONS)
+
+
+class ScriptedPoller(TimeTablePoller):
+    def __init__(self, results: list[Ticket]):
+        self._results = iter(results)
+
+    def poll(self, class_priority_options, time_priority_options) -> Ticket:
+        return next(self._results)
+
+    def hand_over(self, driver):
+        pass
+
+
+def test_bookable_count_ignores_sold_out_cells_and_filtered_times():
+    # 매진/좌석부족 칸에도 링크가 있지만 예약 가능한 칸으로 세지 않는다. 05:00 열차는 min_datetime 전이다
+    assert tickets(("05:00", "예약하기", "예약하기"), ("07:00", "매진", "예약하기"),
+                   ("08:00", "좌석부족", "매진")).bookable_count() == 1
+
+
+def test_wait_for_seats_reports_every_poll():
+    polled = [tickets(("07:00", "매진", "매진")), tickets(("07:00", "예약하기", "입석+좌석"), ("08:00", "매진", "예약하기"))]
+    reported = []
+    found = ScriptedPoller(polled).wait_for_seats(ClassPriorityOptions(), TIME_OPTIONS,
+                                                  PollingScheduler(PollingPolicy(interval_sec=0.0)),
+                                                  on_tickets=lambda ticket: reported.append(ticket.bookable_count()))
+    assert found is polled[1]
+    assert reported == [0, 2]
@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.bench_import_time import BUDGETS, import_time
+
+RUNS = 3  # 새 인터프리터라 편차가 크므로 가장 빠른 값으로 본다
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_stays_within_budget(module):
+    budget_ms, forbidden = BUDGETS[module]
+    samples = [import_time(module) for _ in range(RUNS)]
+    heavy = sorted(samples[0][1].intersection(forbidden))
+    assert not heavy, f"{module} loads {', '.join(heavy)}"
+    elapsed_ms = min(elapsed_ms for elapsed_ms, _ in samples)
+    assert elapsed_ms <= budget_ms, f"{module} took {elapsed_ms:.1f} ms (budget {budget_ms:.0f} ms)"
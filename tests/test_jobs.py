@@ -0,0 +1,248 @@
+import datetime
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import closing
+
+import pytest
+
+from app import jobs
+from app.options import ReserverOptions
+from page_object.custom_types import (HIGH, LOW, ClassPriorityOptions, PassengerOptions, PriorityOptions,
+                                      RegionOptions, RouteOption, SeatAttribute, SeatLocation, SeatOptions,
+                                      TimePriorityOptions)
+from page_object.polling import PollingPolicy, release_windows
+
+
+class FakeProcess:
+    def __init__(self):
+        self.alive = True
+        self.exitcode = None
+        self.on_join = None
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def join(self, timeout=None):
+        if self.on_join is not None:
+            self.on_join()
+        self.alive = False
+
+    def terminate(self):
+        self.alive = False
+
+
+class FakeWorker:
+    # 프로세스를 띄우지 않고 스케줄러가 넘기는 작업만 받아 둔다
+    def __init__(self, ctx=None, idx: int = 0, *args):
+        self.idx = idx
+        self.task_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.job = None
+        self.process = FakeProcess()
+
+
+def make_options(departure: str = "수서", destination: str = "부산") -> ReserverOptions:
+    time_priority = TimePriorityOptions(min_datetime=datetime.datetime.now() + datetime.timedelta(days=1))
+    return ReserverOptions(RegionOptions(departure=departure, destination=destination), PassengerOptions(),
+                           SeatOptions(SeatLocation.default, SeatAttribute.default),
+                           PriorityOptions(ClassPriorityOptions(), time_priority))
+
+
+def make_scheduler(workers: int = 1, job_store_path: str | None = None,
+                   job_store_key: str | None = None) -> jobs.JobScheduler:
+    scheduler = jobs.JobScheduler(max_workers=workers, share_observations=False, job_store_path=job_store_path,
+                                  job_store_key=job_store_key)
+    scheduler._result_queue = queue.Queue()
+    scheduler._workers = [FakeWorker(idx=idx) for idx in range(workers)]
+    return scheduler
+
+
+def collect(scheduler: jobs.JobScheduler, *messages):
+    for message in messages:
+        scheduler._result_queue.put(message)
+    scheduler._result_queue.put(None)
+    scheduler._collect_results()
+
+
+@pytest.fixture(autouse=True)
+def no_worker_processes(monkeypatch):
+    monkeypatch.setattr(jobs, "_Worker", FakeWorker)
+
+
+def test_submit_dispatches_to_idle_worker_and_queues_the_rest():
+    scheduler = make_scheduler()
+    first = scheduler.submit("0000000001", "pw", make_options())
+    second = scheduler.submit("0000000002", "pw", make_options())
+    worker = scheduler._workers[0]
+    assert worker.job is first and first.worker == 0
+    job_id, account_id, password, run_kwargs = worker.task_queue.get_nowait()
+    assert (job_id, account_id, password) == (first.id, "0000000001", "pw")
+    assert run_kwargs["departure"] == "수서"
+    assert second.status == jobs.QUEUED and second.worker is None
+
+
+def test_finished_job_releases_worker_to_next_job():
+    scheduler = make_scheduler()
+    first = scheduler.submit("0000000001", "pw", make_options())
+    second = scheduler.submit("0000000002", "pw", make_options())
+    collect(scheduler, (first.id, jobs.RUNNING, None), (first.id, jobs.SUCCEEDED, None))
+    assert first.status == jobs.SUCCEEDED and first.password == ""
+    assert scheduler._workers[0].job is second
+
+
+def test_cancel_queued_job_finishes_it_without_a_worker():
+    scheduler = make_scheduler()
+    scheduler.submit("0000000001", "pw", make_options())
+    queued = scheduler.submit("0000000002", "pw", make_options())
+    scheduler.cancel(queued.id)
+    assert queued.status == jobs.CANCELLED
+    assert not any(queued in route_queue for route_queue in scheduler._route_queues.values())
+
+
+def test_cancel_dispatched_job_waits_for_worker():
+    scheduler = make_scheduler()
+    job = scheduler.submit("0000000001", "pw", make_options())
+    worker = scheduler._workers[0]
+    scheduler.cancel(job.id)
+    # 워커가 멈췄다고 알리기 전까지는 끝내지 않는다(RUNNING 응답 전이라도)
+    assert worker.cancel_event.is_set() and job.status == jobs.QUEUED and worker.job is job
+    collect(scheduler, (job.id, jobs.RUNNING, None), (job.id, jobs.CANCELLED, None))
+    assert job.status == jobs.CANCELLED and job.cancel_requested
+    assert worker.job is None
+
+
+def test_dispatch_clears_previous_cancel_signal():
+    scheduler = make_scheduler()
+    first = scheduler.submit("0000000001", "pw", make_options())
+    second = scheduler.submit("0000000002", "pw", make_options())
+    scheduler.cancel(first.id)
+    collect(scheduler, (first.id, jobs.CANCELLED, None))
+    assert scheduler._workers[0].job is second
+    assert not scheduler._workers[0].cancel_event.is_set()
+
+
+def test_late_messages_do_not_reopen_finished_job():
+    scheduler = make_scheduler()
+    job = scheduler.submit("0000000001", "pw", make_options())
+    collect(scheduler, (job.id, jobs.FAILED, "boom"), (job.id, jobs.PROGRESS, (3, 1)),
+            (job.id, jobs.SUCCEEDED, None))
+    assert job.status == jobs.FAILED and job.error == "boom"
+    assert job.polls == 0
+
+
+def test_checkpoint_and_progress_do_not_change_status():
+    scheduler = make_scheduler()
+    job = scheduler.submit("0000000001", "pw", make_options())
+    collect(scheduler, (job.id, jobs.RUNNING, None), (job.id, jobs.CHECKPOINT, "polling"),
+            (job.id, jobs.PROGRESS, (5, 2)))
+    assert (job.status, job.stage, job.polls, job.available) == (jobs.RUNNING, "polling", 5, 2)
+
+
+def test_next_job_prefers_route_with_fewest_running_jobs():
+    scheduler = make_scheduler()
+    busy = scheduler.submit("0000000001", "pw", make_options("수서", "부산"))
+    waiting = scheduler.submit("0000000002", "pw", make_options("수서", "부산"))
+    other = scheduler.submit("0000000003", "pw", make_options("수서", "목포"))
+    scheduler.max_workers = 2
+    scheduler._dispatch()
+    # 새 워커는 먼저 들어온 부산 작업 대신 아무도 보지 않는 목포 노선을 받는다
+    assert scheduler._workers[0].job is busy
+    assert scheduler._workers[1].job is other
+    assert waiting.status == jobs.QUEUED
+
+
+def test_requeue_puts_interrupted_job_first_until_max_resumes():
+    scheduler = make_scheduler()
+    running = scheduler.submit("0000000001", "pw", make_options())
+    waiting = scheduler.submit("0000000002", "pw", make_options())
+    scheduler._workers[0].job = None
+    scheduler._requeue(running, "worker died")
+    assert running.status == jobs.QUEUED and running.resumes == 1
+    assert list(scheduler._route_queues[running.route_key]) == [running, waiting]
+
+    running.resumes = jobs.MAX_RESUMES
+    scheduler._route_queues[running.route_key].remove(running)
+    scheduler._requeue(running, "worker died")
+    assert running.status == jobs.FAILED and "gave up" in running.error
+
+
+def test_dead_worker_is_replaced_and_its_job_resumed():
+    scheduler = make_scheduler()
+    job = scheduler.submit("0000000001", "pw", make_options())
+    dead = scheduler._workers[0]
+    dead.process.alive = False
+    dead.process.exitcode = -9
+    scheduler._reap_dead_workers()
+    replacement = scheduler._workers[0]
+    assert replacement is not dead
+    assert replacement.job is job and job.resumes == 1
+
+
+def shut_down_with_interrupted_job(path: str, job_store_key: str | None) -> tuple[str, str]:
+    scheduler = make_scheduler(workers=2, job_store_path=path, job_store_key=job_store_key)
+    scheduler.start()
+    interrupted = scheduler.submit("0000000001", "pw1", make_options())
+    cancelled = scheduler.submit("0000000002", "pw2", make_options())
+    scheduler._result_queue.put((interrupted.id, jobs.RUNNING, None))
+    scheduler._result_queue.put((cancelled.id, jobs.RUNNING, None))
+    scheduler.cancel(cancelled.id)
+    scheduler._result_queue.put((cancelled.id, jobs.CANCELLED, None))
+    # 종료 신호를 받은 워커는 하던 작업을 CANCELLED 로 알리고 끝난다
+    scheduler._workers[0].process.on_join = lambda: scheduler._result_queue.put((interrupted.id, jobs.CANCELLED,
+                                                                                 None))
+    scheduler.shutdown()
+    assert interrupted.status == jobs.CANCELLED and cancelled.status == jobs.CANCELLED
+    return interrupted.id, cancelled.id
+
+
+def stored_passwords(path: str) -> dict[str, str | None]:
+    with closing(sqlite3.connect(path)) as conn:
+        return dict(conn.execute("SELECT id, password FROM jobs").fetchall())
+
+
+def test_shutdown_keeps_interrupted_jobs_resumable(tmp_path):
+    fernet = pytest.importorskip("cryptography.fernet")
+    path, key = str(tmp_path / "jobs.sqlite3"), fernet.Fernet.generate_key().decode()
+    interrupted_id, cancelled_id = shut_down_with_interrupted_job(path, key)
+    passwords = stored_passwords(path)
+    assert passwords[cancelled_id] is None
+    assert passwords[interrupted_id] not in (None, "pw1")  # 암호화해서 남긴다
+
+    resumed = make_scheduler(job_store_path=path, job_store_key=key)
+    resumed.start()
+    try:
+        assert resumed.get(cancelled_id) is None
+        job = resumed.get(interrupted_id)
+        assert job.password == "pw1" and job.resumes == 1
+        assert resumed._workers[0].job is job
+    finally:
+        resumed.shutdown()
+
+
+def test_jobs_without_stored_password_fail_on_resume(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    interrupted_id, _ = shut_down_with_interrupted_job(path, None)
+    assert set(stored_passwords(path).values()) == {None}
+
+    resumed = make_scheduler(job_store_path=path)
+    resumed.start()
+    try:
+        job = resumed.get(interrupted_id)
+        assert job.status == jobs.FAILED and "password was not stored" in job.error
+        assert resumed._workers[0].job is None
+    finally:
+        resumed.shutdown()
+
+
+def test_options_round_trip_through_json():
+    options = make_options()
+    options = ReserverOptions(options.region_options, PassengerOptions(adult=2, child=1),
+                              SeatOptions(SeatLocation.window_seat, SeatAttribute.default),
+                              PriorityOptions(ClassPriorityOptions(standard=LOW, first_class=HIGH),
+                                              options.priority_options.time_priority_option),
+                              [RouteOption("수서", "부산"), RouteOption("동탄", "부산", 0.5)],
+                              PollingPolicy(burst_windows=release_windows([datetime.time(0, 10)])))
+    restored = ReserverOptions.from_dict(json.loads(json.dumps(options.to_dict())))
+    assert restored.run_kwargs() == options.run_kwargs()
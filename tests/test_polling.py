@@ -0,0 +1,96 @@
+import datetime
+import random
+import threading
+import time
+
+import pytest
+
+from page_object.custom_types import TimePriorityOptions
+from page_object.polling import SRT_OPEN_TIME, BurstWindow, PollingPolicy, PollingScheduler, release_windows
+
+NOW = datetime.datetime(2026, 10, 18, 12, 0)
+
+
+def scheduler(**policy) -> PollingScheduler:
+    return PollingScheduler(PollingPolicy(jitter_ratio=0.0, **policy))
+
+
+def test_delay_is_interval_with_bounded_jitter():
+    polling = PollingScheduler(PollingPolicy(interval_sec=1.0, jitter_ratio=0.2), rng=random.Random(1))
+    delays = [polling.next_delay(NOW) for _ in range(200)]
+    assert all(0.8 <= delay <= 1.2 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_slow_responses_back_off_exponentially_up_to_max():
+    polling = scheduler(interval_sec=0.5, backoff_factor=2.0, max_interval_sec=3.0, slow_response_sec=2.0)
+    polling.record(2.5)
+    assert polling.backoff_level == 1 and polling.next_delay(NOW) == pytest.approx(1.0)
+    polling.record_failure()
+    assert polling.next_delay(NOW) == pytest.approx(2.0)
+    polling.record_failure()
+    assert polling.next_delay(NOW) == pytest.approx(3.0)
+
+
+def test_fast_response_resets_backoff():
+    polling = scheduler(interval_sec=0.5)
+    polling.record_failure()
+    polling.record_failure()
+    polling.record(0.1)
+    assert polling.backoff_level == 0 and polling.next_delay(NOW) == pytest.approx(0.5)
+
+
+def test_burst_window_shortens_interval_only_inside_window():
+    polling = scheduler(interval_sec=0.5, burst_windows=[BurstWindow(datetime.time(12, 0), interval_sec=0.1)])
+    assert polling.next_delay(NOW - datetime.timedelta(seconds=30)) == pytest.approx(0.1)
+    assert polling.next_delay(NOW + datetime.timedelta(minutes=5)) == pytest.approx(0.1)
+    assert polling.next_delay(NOW - datetime.timedelta(minutes=2)) == pytest.approx(0.5)
+    assert polling.next_delay(NOW + datetime.timedelta(minutes=6)) == pytest.approx(0.5)
+
+
+def test_backoff_overrides_burst_window():
+    polling = scheduler(interval_sec=0.5, burst_windows=[BurstWindow(datetime.time(12, 0), interval_sec=0.1)])
+    polling.record_failure()
+    assert polling.next_delay(NOW) == pytest.approx(1.0)
+
+
+def test_stops_once_last_train_is_past_booking_cutoff():
+    options = TimePriorityOptions(min_datetime=NOW, max_datetime=NOW + datetime.timedelta(hours=1))
+    polling = PollingScheduler(time_priority_options=options)
+    assert not polling.should_stop(NOW + datetime.timedelta(minutes=39))
+    assert polling.should_stop(NOW + datetime.timedelta(minutes=40))
+    assert not PollingScheduler(time_priority_options=TimePriorityOptions(min_datetime=NOW)).should_stop(NOW)
+
+
+def test_wait_counts_polls_and_returns_early_when_stopped():
+    polling = scheduler(interval_sec=10.0)
+    polls = []
+    polling.on_wait = polls.append
+    stop_event = threading.Event()
+    stop_event.set()
+    started = time.monotonic()
+    polling.wait(stop_event)
+    polling.wait(stop_event)
+    assert time.monotonic() - started < 1.0
+    assert polls == [1, 2] and polling.polls == 2
+
+
+def test_burst_window_crosses_midnight():
+    window = BurstWindow(datetime.time(23, 58), before=datetime.timedelta(minutes=1),
+                         after=datetime.timedelta(minutes=5))
+    assert window.contains(datetime.datetime(2026, 10, 19, 0, 2))
+    assert window.contains(datetime.datetime(2026, 10, 18, 23, 57))
+    assert not window.contains(datetime.datetime(2026, 10, 19, 0, 4))
+    window = BurstWindow(datetime.time(0, 0), before=datetime.timedelta(minutes=2))
+    assert window.contains(datetime.datetime(2026, 10, 18, 23, 59))
+
+
+def test_default_policy_bursts_around_ticket_open():
+    polling = PollingScheduler(PollingPolicy(jitter_ratio=0.0))
+    assert polling.next_delay(datetime.datetime(2026, 10, 18, 7, 1)) == pytest.approx(0.2)
+    assert polling.next_delay(NOW) == pytest.approx(0.5)
+
+
+def test_release_windows_keep_open_time_and_drop_duplicates():
+    windows = release_windows([datetime.time(0, 10), SRT_OPEN_TIME])
+    assert [window.at for window in windows] == [SRT_OPEN_TIME, datetime.time(0, 10)]
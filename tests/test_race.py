@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from app import race
+from page_object.custom_types import ClassPriorityOptions, PriorityOptions, TimePriorityOptions
+
+RUN_KWARGS = {"priority_options": PriorityOptions(ClassPriorityOptions(), TimePriorityOptions())}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+
+
+def wait_until_stopped(stop_event: threading.Event) -> bool:
+    stop_event.wait(5)
+    return False
+
+
+def reserve_after(delay_sec: float):
+    def reserve(stop_event: threading.Event) -> bool:
+        time.sleep(delay_sec)
+        return True
+    return reserve
+
+
+@pytest.fixture
+def racers(monkeypatch) -> dict:
+    # 계정 아이디 -> stop_event 를 받아 예약 성공 여부를 돌려주는 함수
+    behaviours = {}
+
+    class FakeReserver:
+        def __init__(self, driver, base_url=None):
+            pass
+
+        def run(self, account_id, password, stop_event, polling_scheduler, **run_kwargs):
+            return behaviours[account_id](stop_event)
+
+    monkeypatch.setattr(race, "AutoReserver", FakeReserver)
+    return behaviours
+
+
+def coordinator(*account_ids: str) -> tuple[race.RaceCoordinator, list[FakeDriver]]:
+    drivers = []
+
+    def driver_factory() -> FakeDriver:
+        drivers.append(FakeDriver())
+        return drivers[-1]
+    return race.RaceCoordinator([race.RaceAccount(account_id, "pw") for account_id in account_ids],
+                                driver_factory=driver_factory), drivers
+
+
+def test_first_reservation_wins_and_stops_the_others(racers):
+    racers.update({"0000000001": wait_until_stopped, "0000000002": reserve_after(0.05)})
+    race_coordinator, drivers = coordinator("0000000001", "0000000002")
+    result = race_coordinator.run(**RUN_KWARGS)
+    assert result.winner == "0000000002" and result.duplicates == [] and result.errors == {}
+    assert result.elapsed_sec < 1.0
+    assert [driver.quits for driver in drivers] == [1, 1]
+
+
+def test_near_simultaneous_reservations_are_reported_as_duplicates(racers):
+    racers.update({"0000000001": reserve_after(0.0), "0000000002": reserve_after(0.0)})
+    result = coordinator("0000000001", "0000000002")[0].run(**RUN_KWARGS)
+    assert result.winner in ("0000000001", "0000000002")
+    assert result.duplicates == [account_id for account_id in result.reserved_sec if account_id != result.winner]
+    assert len(result.reserved_sec) == 2
+
+
+def test_user_cancel_stops_every_racer_without_a_winner(racers):
+    racers.update({"0000000001": wait_until_stopped, "0000000002": wait_until_stopped})
+    stop_event = threading.Event()
+    threading.Timer(0.1, stop_event.set).start()
+    race_coordinator, drivers = coordinator("0000000001", "0000000002")
+    result = race_coordinator.run(stop_event=stop_event, **RUN_KWARGS)
+    assert result.winner is None and result.reserved_sec == {} and result.errors == {}
+    assert result.elapsed_sec < 1.0
+    assert [driver.quits for driver in drivers] == [1, 1]
+
+
+def test_racer_errors_are_kept_until_the_race_is_decided(racers):
+    def fail(stop_event: threading.Event) -> bool:
+        raise RuntimeError("login failed")
+    racers.update({"0000000001": fail, "0000000002": reserve_after(0.1)})
+    result = coordinator("0000000001", "0000000002")[0].run(**RUN_KWARGS)
+    assert result.winner == "0000000002"
+    assert "login failed" in result.errors["0000000001"]
+
+
+def test_per_account_arguments_are_rejected():
+    with pytest.raises(ValueError):
+        coordinator("0000000001")[0].run(polling_scheduler=None, **RUN_KWARGS)
+    with pytest.raises(ValueError):
+        race.RaceCoordinator([race.RaceAccount("0000000001", "a"), race.RaceAccount("0000000001", "b")])
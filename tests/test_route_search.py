@@ -0,0 +1,48 @@
+import datetime
+
+from page_object.custom_types import (HIGH, LOW, ClassPriorityOptions, RouteOption, TicketCell, TicketRow,
+                                      TimePriorityOptions)
+from page_object.route_search import ScoreWeights, candidate_score, unique_routes
+
+DAY = datetime.date(2026, 10, 20)
+
+
+def at(hour: int, minute: int = 0) -> datetime.datetime:
+    return datetime.datetime.combine(DAY, datetime.time(hour, minute))
+
+
+def test_unique_routes_polls_same_station_codes_once():
+    routes = [RouteOption("수서", "울산"), RouteOption("수서", "울산(통도사)", 2.0), RouteOption("동탄", "울산")]
+    assert unique_routes(routes) == [RouteOption("수서", "울산(통도사)", 2.0), RouteOption("동탄", "울산")]
+
+
+def test_score_prefers_best_time_then_class_then_route():
+    class_options = ClassPriorityOptions(standard=HIGH, first_class=LOW)
+    time_options = TimePriorityOptions(min_datetime=at(6), max_datetime=at(12), best_datetime=at(9))
+    weights = ScoreWeights()
+
+    def score(hour: int, seat_class: str = "standard", route: RouteOption | None = None) -> float:
+        return candidate_score(TicketRow(at(hour), seat_class, TicketCell("예약하기"), route), class_options,
+                               time_options, weights)
+
+    assert score(9) > score(11)
+    assert score(9, "standard") > score(9, "first_class")
+    assert score(9, route=RouteOption("동탄", "부산", 2.0)) > score(9, route=RouteOption("수서", "부산"))
+
+
+def test_score_ignores_class_when_time_is_preferred():
+    class_options = ClassPriorityOptions(standard=HIGH, first_class=LOW)
+    time_options = TimePriorityOptions(min_datetime=at(6), max_datetime=at(12), prefer_time=True)
+    early_first_class = TicketRow(at(7), "first_class", TicketCell("예약하기"))
+    late_standard = TicketRow(at(8), "standard", TicketCell("예약하기"))
+    scores = [candidate_score(row, class_options, time_options, ScoreWeights(class_priority=10.0))
+              for row in (early_first_class, late_standard)]
+    assert scores[0] > scores[1]
+
+
+def test_score_follows_descending_time_order():
+    class_options = ClassPriorityOptions()
+    time_options = TimePriorityOptions(min_datetime=at(6), max_datetime=at(12), ascendig=False)
+    early, late = (TicketRow(at(hour), "standard", TicketCell("예약하기")) for hour in (7, 11))
+    assert (candidate_score(late, class_options, time_options, ScoreWeights())
+            > candidate_score(early, class_options, time_options, ScoreWeights()))
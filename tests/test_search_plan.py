@@ -0,0 +1,74 @@
+import datetime
+
+from page_object.custom_types import ClassPriorityOptions, Ticket, TicketCell, TimePriorityOptions
+from page_object.search_plan import SearchBlock, plan_searches
+
+NOW = datetime.datetime(2026, 10, 18, 9, 50)
+DAY = datetime.date(2026, 10, 20)
+TOMORROW = datetime.date.today() + datetime.timedelta(days=1)
+
+
+def at(date: datetime.date, hour: int, minute: int = 0) -> datetime.datetime:
+    return datetime.datetime.combine(date, datetime.time(hour, minute))
+
+
+def test_plan_covers_window_in_two_hour_blocks():
+    options = TimePriorityOptions(min_datetime=at(DAY, 7, 30), max_datetime=at(DAY, 12, 0))
+    assert plan_searches(options, NOW) == [SearchBlock(DAY, 6), SearchBlock(DAY, 8), SearchBlock(DAY, 10),
+                                           SearchBlock(DAY, 12)]
+
+
+def test_plan_without_max_runs_to_end_of_day():
+    blocks = plan_searches(TimePriorityOptions(min_datetime=at(DAY, 19)), NOW)
+    assert blocks == [SearchBlock(DAY, 18), SearchBlock(DAY, 20), SearchBlock(DAY, 22)]
+
+
+def test_plan_crosses_midnight():
+    options = TimePriorityOptions(min_datetime=at(DAY, 22), max_datetime=at(DAY + datetime.timedelta(days=1), 1))
+    assert plan_searches(options, NOW) == [SearchBlock(DAY, 22), SearchBlock(DAY + datetime.timedelta(days=1), 0)]
+
+
+def test_plan_drops_blocks_past_booking_cutoff():
+    options = TimePriorityOptions(min_datetime=at(NOW.date(), 6), max_datetime=at(NOW.date(), 13))
+    # 09:50 에서 20분 뒤(10:10)부터 예매할 수 있으므로 10시 블록부터 조회한다
+    assert plan_searches(options, NOW) == [SearchBlock(NOW.date(), 10), SearchBlock(NOW.date(), 12)]
+
+
+def test_search_block_form_fields():
+    assert SearchBlock(DAY, 8).form_fields == {"dptDt": "20261020", "dptTm": "080000"}
+
+
+def rows(*trains: tuple[str, str, str]) -> list[list[TicketCell]]:
+    table = []
+    for dep_time, first_class, standard in trains:
+        row = [TicketCell("") for _ in range(Ticket.STANDARD_CLS_IDX + 1)]
+        row[Ticket.DEP_IDX] = TicketCell(f"수서\n{dep_time}")
+        row[Ticket.ARR_IDX] = TicketCell("부산\n23:59")
+        row[Ticket.FIRST_CLS_IDX] = TicketCell(first_class)
+        row[Ticket.STANDARD_CLS_IDX] = TicketCell(standard)
+        table.append(row)
+    return table
+
+
+def test_merge_keeps_first_block_copy_of_overlapping_trains():
+    time_options = TimePriorityOptions(min_datetime=at(TOMORROW, 6))
+    class_options = ClassPriorityOptions()
+    first = Ticket(rows(("06:00", "매진", "예약하기"), ("07:30", "예약하기", "예약하기")), class_options, time_options)
+    # 다음 블록 조회도 앞 블록의 마지막 열차부터 보여 준다
+    second = Ticket(rows(("07:30", "예약하기", "매진"), ("08:10", "매진", "예약하기")), class_options, time_options)
+    merged = Ticket.merge([first, second])
+    assert [row.time.hour * 60 + row.time.minute for row in merged.standard] == [360, 450, 490]
+    assert [row.time.hour * 60 + row.time.minute for row in merged.first_class] == [450]
+    assert merged.standard[1].cell is first.standard[1].cell
+    assert merged.first_class[0].cell is first.first_class[0].cell
+    # 원래 Ticket 은 그대로 둔다
+    assert len(first.standard) == 2 and len(second.standard) == 1
+
+
+def test_merge_ranks_across_blocks():
+    time_options = TimePriorityOptions(min_datetime=at(TOMORROW, 6), best_datetime=at(TOMORROW, 9))
+    class_options = ClassPriorityOptions()
+    early = Ticket(rows(("06:00", "", "예약하기")), class_options, time_options)
+    late = Ticket(rows(("09:20", "", "예약하기")), class_options, time_options)
+    best = Ticket.merge([early, late]).sorted_by_priority()[0]
+    assert best.time == at(TOMORROW, 9, 20)
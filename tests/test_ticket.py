@@ -0,0 +1,73 @@
+import datetime
+
+from page_object.custom_types import (DISABLE, HIGH, LOW, ClassPriorityOptions, Ticket, TicketCell,
+                                      TimePriorityOptions)
+
+DAY = datetime.date.today() + datetime.timedelta(days=1)
+
+
+def at(hour: int, minute: int = 0) -> datetime.datetime:
+    return datetime.datetime.combine(DAY, datetime.time(hour, minute))
+
+
+def rows(*trains: tuple[str, str, str]) -> list[list[TicketCell]]:
+    # (출발 시각, 특실 칸, 일반실 칸)
+    table = []
+    for dep_time, first_class, standard in trains:
+        row = [TicketCell("") for _ in range(max(Ticket.DEP_IDX, Ticket.FIRST_CLS_IDX, Ticket.STANDARD_CLS_IDX) + 1)]
+        row[Ticket.DEP_IDX] = TicketCell(f"수서\n{dep_time}")
+        row[Ticket.FIRST_CLS_IDX] = TicketCell(first_class)
+        row[Ticket.STANDARD_CLS_IDX] = TicketCell(standard)
+        table.append(row)
+    return table
+
+
+def ranked(ticket: Ticket) -> list[tuple[str, str]]:
+    return [(f"{row.time:%H:%M}", row.seat_class) for row in ticket.sorted_by_priority()]
+
+
+def test_split_by_class_skips_unbookable_statuses():
+    ticket = Ticket(rows(("08:00", "매진", "예약하기"), ("09:00", "좌석부족", "입석+좌석"), ("10:00", "", "예약하기")),
+                    ClassPriorityOptions(standard=HIGH, first_class=LOW), TimePriorityOptions(min_datetime=at(6)))
+    assert [f"{row.time:%H:%M}" for row in ticket.standard] == ["08:00", "10:00"]
+    assert ticket.first_class == [] and ticket.standard_standing == []
+    assert ticket.bookable_count() == 2
+
+
+def test_standing_is_split_out_when_allowed():
+    options = ClassPriorityOptions(standard=HIGH, first_class=DISABLE, standard_standing=LOW, allow_standing=True)
+    ticket = Ticket(rows(("08:00", "예약하기", "입석+좌석"), ("09:00", "예약하기", "예약하기")), options,
+                    TimePriorityOptions(min_datetime=at(6)))
+    assert ranked(ticket) == [("09:00", "standard"), ("08:00", "standard_standing")]
+    assert ticket.first_class == []  # 특실을 끄면 특실 칸은 보지 않는다
+
+
+def test_time_filter_drops_trains_outside_window_and_past_cutoff():
+    trains = rows(("05:00", "", "예약하기"), ("07:00", "", "예약하기"), ("13:00", "", "예약하기"))
+    ticket = Ticket(trains, ClassPriorityOptions(), TimePriorityOptions(min_datetime=at(6), max_datetime=at(12)))
+    assert ranked(ticket) == [("07:00", "standard")]
+
+    soon = datetime.datetime.now() + datetime.timedelta(minutes=10)
+    ticket = Ticket(rows((f"{soon:%H:%M}", "", "예약하기")), ClassPriorityOptions(),
+                    TimePriorityOptions(min_datetime=soon.replace(second=0, microsecond=0)))
+    assert ticket.is_empty()  # 출발 20분 전이 지났다
+
+
+def test_class_priority_then_time_order():
+    trains = rows(("08:00", "예약하기", "예약하기"), ("07:00", "예약하기", "매진"), ("09:00", "매진", "예약하기"))
+    ticket = Ticket(trains, ClassPriorityOptions(standard=LOW, first_class=HIGH), TimePriorityOptions(at(6)))
+    assert ranked(ticket) == [("07:00", "first_class"), ("08:00", "first_class"),
+                              ("08:00", "standard"), ("09:00", "standard")]
+
+    ticket = Ticket(trains, ClassPriorityOptions(), TimePriorityOptions(at(6), ascendig=False))
+    assert ranked(ticket)[:2] == [("09:00", "standard"), ("08:00", "standard")]
+
+
+def test_best_time_and_prefer_time_ordering():
+    trains = rows(("07:00", "예약하기", "예약하기"), ("09:00", "", "예약하기"), ("11:00", "예약하기", ""))
+    ticket = Ticket(trains, ClassPriorityOptions(), TimePriorityOptions(at(6), best_datetime=at(10, 30)))
+    assert ranked(ticket) == [("09:00", "standard"), ("07:00", "standard"),
+                              ("11:00", "first_class"), ("07:00", "first_class")]
+
+    ticket = Ticket(trains, ClassPriorityOptions(), TimePriorityOptions(at(6), prefer_time=True))
+    assert [time for time, _ in ranked(ticket)] == ["07:00", "07:00", "09:00", "11:00"]
@@ -0,0 +1,122 @@
+import datetime
+
+from page_object import checkout
+from page_object.custom_types import TicketCell, TicketRow
+from page_object.pages import TimeTablePage
+
+
+class FakeAlert:
+    def __init__(self, driver: "FakeDriver", text: str):
+        self._driver = driver
+        self.text = text
+
+    def accept(self):
+        self._driver.alert_text = None
+
+
+class FakeSwitchTo:
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    @property
+    def alert(self) -> FakeAlert:
+        if self._driver.alert_text is None:
+            raise RuntimeError("no alert")
+        return FakeAlert(self._driver, self._driver.alert_text)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alert_text: str | None = None
+        self.switch_to = FakeSwitchTo(self)
+        self.backs = 0
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def back(self):
+        self.backs += 1
+
+
+class FakeLink:
+    # 누르면 alert_text 안내를 띄운다(None 이면 안내 없이 예약 페이지로 넘어간 경우)
+    def __init__(self, driver: FakeDriver, alert_text: str | None):
+        self._driver = driver
+        self._alert_text = alert_text
+        self.clicks = 0
+
+    def click(self):
+        self.clicks += 1
+        self._driver.alert_text = self._alert_text
+
+    def is_enabled(self) -> bool:
+        return True
+
+
+class FakeTicketingPage:
+    def __init__(self, reserved: bool):
+        self.reserved = reserved
+        self.validations = 0
+
+    def validate(self) -> bool:
+        self.validations += 1
+        return self.reserved
+
+
+def make_page(reserved: bool = False) -> tuple[TimeTablePage, FakeDriver, list[str]]:
+    driver = FakeDriver()
+    page = TimeTablePage(driver, fast_checkout=False)
+    page._ticking_page = FakeTicketingPage(reserved)
+    searches = []
+    page.research = lambda: searches.append("search") or 0.0
+    return page, driver, searches
+
+
+def rows(driver: FakeDriver, *alerts: str | None) -> list[TicketRow]:
+    departs_at = datetime.datetime(2026, 10, 20, 8, 0)
+    return [TicketRow(departs_at + datetime.timedelta(minutes=10 * idx), "standard",
+                      TicketCell("예약하기", FakeLink(driver, alert)))
+            for idx, alert in enumerate(alerts)]
+
+
+def test_sold_out_alerts_move_to_next_candidate_without_leaving_page():
+    page, driver, searches = make_page()
+    candidates = rows(driver, "잔여석없음", "매진되었습니다")
+    assert page._click_candidates(candidates, None) == checkout.SOLD_OUT
+    assert [row.cell.link.clicks for row in candidates] == [1, 1]
+    assert page._ticking_page.validations == 0 and searches == []
+
+
+def test_reservation_confirmed_on_ticketing_page():
+    page, driver, searches = make_page(reserved=True)
+    assert page._click_candidates(rows(driver, "잔여석없음", None), None) == checkout.RESERVED
+    assert searches == []
+
+
+def test_failed_validate_returns_to_time_table():
+    page, driver, searches = make_page(reserved=False)
+    candidates = rows(driver, "결제 전 확인해 주세요", None)
+    assert page._click_candidates(candidates, None) == checkout.UNKNOWN
+    assert page._ticking_page.validations == 1
+    assert searches == ["search"]
+    assert candidates[1].cell.link.clicks == 0
+
+
+def test_failed_validate_without_research_goes_back():
+    page, driver, _ = make_page(reserved=False)
+    page.research = None
+    page._click_candidates(rows(driver, None), None)
+    assert driver.backs == 1
+
+
+def test_failed_validate_leaves_return_to_http_hand_over():
+    page, driver, searches = make_page(reserved=False)
+    page._hands_over = True
+    page._click_candidates(rows(driver, None), None)
+    assert searches == [] and driver.backs == 0
+
+
+def test_rows_without_links_are_not_clicked():
+    page, driver, _ = make_page()
+    row = TicketRow(datetime.datetime(2026, 10, 20, 8, 0), "standard", TicketCell("예약하기"))
+    assert page._click_candidates([row], None) == checkout.NO_CANDIDATES
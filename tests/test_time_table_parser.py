@@ -0,0 +1,97 @@
+import datetime
+import json
+
+import pytest
+
+from benchmarks.fixtures import random_rows, render_time_table_page
+from page_object.custom_types import Ticket
+from page_object.page_profile import SRT_TIME_TABLE_V1, Column, PageProfile, ProfileMismatch
+from page_object.time_table_parser import TimeTableHtmlParser
+
+HEADERS = ("구분", "열차종류", "열차번호", "출발역", "도착역", "특실", "일반실", "예약대기")
+
+PAGE = """<html><body><table>
+<thead><tr><th>구분</th><th>열차종류</th><th>열차번호</th><th>출발역</th><th>도착역</th>
+<th>특실</th><th>일반실</th><th>예약대기</th></tr></thead>
+<tbody>
+<tr><td>1</td><td>SRT</td><td>301</td>
+<td><div>수서</div><em class="time">05:30</em></td><td><div>부산</div><em class="time">08:04</em></td>
+<td><a href="#"><span>매진</span></a></td><td><a href="#"><span>예약하기</span></a></td><td>-</td></tr>
+<tr><td colspan="8">조회 결과가 없습니다</td></tr>
+<tr><td>2</td><td>SRT</td><td>303</td>
+<td><div>수서</div><em class="time">06:00</em></td><td><div>부산</div><em class="time">08:30</em></td>
+<td></td><td><a href="#"><span>입석+좌석</span></a></td><td>-</td></tr>
+</tbody></table></body></html>"""
+
+
+def test_profile_accepts_matching_headers():
+    SRT_TIME_TABLE_V1.validate(HEADERS)
+    SRT_TIME_TABLE_V1.validate([f" {header} " for header in HEADERS])
+
+
+@pytest.mark.parametrize("headers", [
+    HEADERS[:5],  # 칸이 모자람
+    ("구분", "열차종류", "열차번호", "도착역", "출발역", "특실", "일반실"),  # 칸 순서가 바뀜
+])
+def test_profile_rejects_changed_headers(headers):
+    with pytest.raises(ProfileMismatch):
+        SRT_TIME_TABLE_V1.validate(headers)
+
+
+def test_profile_requires_every_field():
+    columns = dict(SRT_TIME_TABLE_V1.columns)
+    del columns["standard"]
+    with pytest.raises(ValueError, match="standard"):
+        PageProfile("test/1", "//tbody/tr", "//thead/tr/th", columns, "./div", "./em")
+
+
+def test_profile_round_trips_through_json(tmp_path):
+    path = str(tmp_path / "profile.json")
+    SRT_TIME_TABLE_V1.dump(path)
+    assert PageProfile.load(path) == SRT_TIME_TABLE_V1
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    data["format"] = 99
+    with pytest.raises(ValueError):
+        PageProfile.from_dict(data)
+
+
+@pytest.mark.parametrize("html", [PAGE, PAGE.encode("utf-8")])
+def test_parse_reads_rows_and_skips_notice_rows(html):
+    rows = TimeTableHtmlParser().parse(html)
+    assert [(row.train_no, row.departure, row.departs_at, row.destination, row.arrives_at) for row in rows] == [
+        (301, "수서", datetime.time(5, 30), "부산", datetime.time(8, 4)),
+        (303, "수서", datetime.time(6, 0), "부산", datetime.time(8, 30)),
+    ]
+    assert [(row.first_class, row.standard) for row in rows] == [("매진", "예약하기"), ("", "입석+좌석")]
+
+
+def test_parse_rejects_page_that_does_not_match_profile():
+    with pytest.raises(ProfileMismatch):
+        TimeTableHtmlParser().parse(PAGE.replace("<th>출발역</th>", "<th>출발</th>"))
+
+
+def test_parse_rejects_station_cell_without_time():
+    with pytest.raises(ProfileMismatch):
+        TimeTableHtmlParser().parse(PAGE.replace('<em class="time">05:30</em>', ""))
+
+
+def test_parse_follows_profile_columns():
+    columns = {**SRT_TIME_TABLE_V1.columns, "first_class": Column(6, "일반실"), "standard": Column(5, "특실")}
+    profile = PageProfile("swapped/1", SRT_TIME_TABLE_V1.rows, SRT_TIME_TABLE_V1.headers, columns,
+                          SRT_TIME_TABLE_V1.station, SRT_TIME_TABLE_V1.time)
+    rows = TimeTableHtmlParser(profile).parse(PAGE)
+    assert (rows[0].first_class, rows[0].standard) == ("예약하기", "매진")
+
+
+def test_cells_match_what_ticket_reads():
+    fixture_rows = random_rows(12, seed=3)
+    parser = TimeTableHtmlParser()
+    cells = parser.to_cells(parser.parse(render_time_table_page(fixture_rows)))
+    assert len(cells) == len(fixture_rows)
+    for row, fixture in zip(cells, fixture_rows):
+        assert row[Ticket.TRAIN_NO_IDX].text == str(fixture.train_no)
+        assert row[Ticket.DEP_IDX].text == f"{fixture.departure}\n{fixture.dep_time:%H:%M}"
+        assert row[Ticket.ARR_IDX].text == f"{fixture.destination}\n{fixture.arr_time:%H:%M}"
+        assert row[Ticket.FIRST_CLS_IDX].text == fixture.first_class
+        assert row[Ticket.STANDARD_CLS_IDX].text == fixture.standard